@@ -4,10 +4,12 @@ from typing import Any
 from typing import TYPE_CHECKING
 if TYPE_CHECKING:
     from src.data.Projects import Project
+from src.data.Ibans import get_iban
 from src.data.TaggedItems import TaggedItem, TaggedItems
 
 
 class BankAccount(TaggedItem):
+    __slots__ = ("iban", "name", "note")
 
     def __init__(self,
                  project: "Project",
@@ -39,7 +41,7 @@ class BankAccount(TaggedItem):
     ) -> "BankAccount":
         return cls(project=project,
                    identifier=identifier,
-                   iban=IBAN(json_dict["iban"]) if json_dict["iban"] is not None else None,
+                   iban=get_iban(json_dict["iban"]) if json_dict["iban"] is not None else None,
                    name=json_dict["name"],
                    note=json_dict["note"],
                    )
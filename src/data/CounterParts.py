@@ -1,12 +1,15 @@
 from schwifty.iban import IBAN
-from typing import Any, TYPE_CHECKING
+from typing import Any, Optional, TYPE_CHECKING
 
-from src.data.TaggedItems import TaggedItem, TaggedItems
+from src.data.Ibans import get_iban, normalize_iban
+from src.data.TaggedItems import ChangeEvent, ChangeKinds, TaggedItem, TaggedItems
 if TYPE_CHECKING:
     from src.data.Projects import Project
+    from src.data.settings.AppSettings import AppSettings
 
 
 class CounterPart(TaggedItem):
+    __slots__ = ("iban", "name", "note")
 
     def __init__(self,
                  project: "Project",
@@ -38,12 +41,56 @@ class CounterPart(TaggedItem):
     ) -> "CounterPart":
         return cls(project=project,
                    identifier=identifier,
-                   iban=IBAN(json_dict["iban"]) if json_dict["iban"] is not None else None,
+                   iban=get_iban(json_dict["iban"]) if json_dict["iban"] is not None else None,
                    name=json_dict["name"],
                    note=json_dict["note"],
                    )
 
 
 class CounterParts(TaggedItems[CounterPart]):
-    pass
+
+    def __init__(self,
+                 project: "Project",
+                 settings: "AppSettings",
+                 factory: type[CounterPart],
+                 ):
+        super().__init__(project=project, settings=settings, factory=factory)
+
+        # Identifier of the counterpart with each IBAN and the IBAN of every indexed counterpart, built when first
+        # needed and kept up to date from the change feed
+        self._iban_index = None  # type: Optional[dict[str, int]]
+        self._indexed_ibans = {}  # type: dict[int, str]
+        self.subscribe(self._update_iban_index)
+
+    def find_by_iban(self, iban: str) -> Optional[CounterPart]:
+        """Returns the counterpart with an IBAN, the first one if several counterparts have it"""
+        if self._iban_index is None:
+            self._iban_index = {}
+            self._indexed_ibans = {}
+            for counterpart in self.values():
+                self._index_iban(counterpart)
+        identifier = self._iban_index.get(normalize_iban(str(iban)))
+        return self[identifier] if identifier is not None else None
+
+    def _index_iban(self, counterpart: CounterPart) -> None:
+        if counterpart.iban is not None:
+            iban = str(counterpart.iban)
+            self._iban_index.setdefault(iban, counterpart.identifier)
+            self._indexed_ibans[counterpart.identifier] = iban
+
+    def _update_iban_index(self, event: ChangeEvent) -> None:
+        if self._iban_index is None or (event.kind == ChangeKinds.UPDATED and "iban" not in event.fields):
+            return
+        if event.kind == ChangeKinds.CLEARED:
+            self._iban_index = None
+            return
+
+        for identifier in event.identifiers:
+            iban = self._indexed_ibans.pop(identifier, None)
+            if iban is not None and self._iban_index.get(iban) == identifier:
+                # Another counterpart may have the same IBAN, rebuilt when needed
+                self._iban_index = None
+                return
+            if identifier in self:
+                self._index_iban(self[identifier])
 
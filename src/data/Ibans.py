@@ -0,0 +1,42 @@
+from functools import lru_cache
+from typing import Iterable, Optional
+
+from schwifty.iban import IBAN
+
+# Number of distinct IBANs kept parsed, the least recently used ones are parsed again when needed
+IBAN_CACHE_SIZE = 65536
+
+
+def normalize_iban(text: str) -> str:
+    """Returns the compact form of an IBAN, without whitespace and in upper case"""
+    return "".join(text.split()).upper()
+
+
+@lru_cache(maxsize=IBAN_CACHE_SIZE)
+def _parse_normalized(text: str) -> Optional[IBAN]:
+    try:
+        return IBAN(text)
+    except ValueError:
+        return None
+
+
+def parse_iban(text: str) -> Optional[IBAN]:
+    """
+    Returns the IBAN in text, or None if text is not a valid IBAN.
+    Every distinct IBAN is parsed and validated once and the same IBAN object is returned for it, for loading, importing
+    and editing alike.
+    """
+    return _parse_normalized(normalize_iban(text))
+
+
+def get_iban(text: str) -> IBAN:
+    """Like parse_iban, but raises a ValueError if text is not a valid IBAN"""
+    iban = parse_iban(text)
+    if iban is None:
+        raise ValueError(f"Invalid IBAN: {text}")
+    return iban
+
+
+def validate_ibans(texts: Iterable[str]) -> dict[str, Optional[IBAN]]:
+    """Returns the IBAN of every distinct text, None for invalid ones, e.g. for the IBAN column of a .csv file"""
+    return {text: parse_iban(text) for text in dict.fromkeys(texts)}
@@ -0,0 +1,120 @@
+import re
+from decimal import ROUND_HALF_UP, Decimal, InvalidOperation
+from functools import total_ordering
+from typing import Optional
+
+from src.data.Currencies import Currencies
+
+# Plain amounts such as "-12.345" or ".5", parsed without Decimal. Anything else Decimal accepts, e.g. "1e3", is
+# parsed with Decimal instead.
+_AMOUNT_PATTERN = re.compile(r"([+-]?)(\d*)(?:\.(\d*))?")
+
+# Amounts are stored as int64 cents, see TransactionStore
+_MIN_CENTS, _MAX_CENTS = -2 ** 63, 2 ** 63 - 1
+
+
+@total_ordering
+class Money:
+    """
+    Exact amount of money as an integer number of cents, the way amounts are stored and aggregated.
+    Amounts always have two decimals, regardless of the currency. Amounts with more decimals are rounded half up.
+
+    Money is converted from and to Decimal where amounts are shown, edited or written to json. Adding money in different
+    currencies raises a ValueError, money without currency can only be added to money without currency.
+    """
+
+    __slots__ = ("cents", "currency")
+
+    def __init__(self, cents: int, currency: Optional[Currencies] = None) -> None:
+        self.cents = cents
+        self.currency = currency
+
+    @classmethod
+    def from_decimal(cls, amount: Decimal, currency: Optional[Currencies] = None) -> "Money":
+        return cls(int(Decimal(amount).scaleb(2).to_integral_value(rounding=ROUND_HALF_UP)), currency)
+
+    @classmethod
+    def from_string(cls, text: str, currency: Optional[Currencies] = None) -> "Money":
+        """
+        Parses an amount such as "12.34", raises a ValueError if text is not a finite number or if the amount does
+        not fit in the int64 cents amounts are stored as. Plain amounts are converted with integer arithmetic only.
+        """
+        match = _AMOUNT_PATTERN.fullmatch(text)
+        if match is None or not (match[2] or match[3]):
+            try:
+                amount = Decimal(text)
+            except InvalidOperation:
+                raise ValueError(f"Invalid amount: {text!r}") from None
+            if not amount.is_finite():
+                raise ValueError(f"Invalid amount: {text!r}")
+            money = cls.from_decimal(amount, currency)
+        else:
+            sign, units, decimals = match[1], match[2], match[3] or ""
+            cents = int(units or "0") * 100 + int(decimals[:2].ljust(2, "0"))
+            if decimals[2:3] >= "5":
+                cents += 1  # half up, i.e. away from zero
+            money = cls(-cents if sign == "-" else cents, currency)
+
+        if not _MIN_CENTS <= money.cents <= _MAX_CENTS:
+            raise ValueError(f"Amount out of range: {text!r}")
+        return money
+
+    def to_decimal(self) -> Decimal:
+        return Decimal(self.cents).scaleb(-2)
+
+    def __str__(self) -> str:
+        sign = "-" if self.cents < 0 else ""
+        units, cents = divmod(abs(self.cents), 100)
+        return f"{sign}{units}.{cents:02d}"
+
+    def __repr__(self) -> str:
+        return f"{self.__class__.__name__}({self.cents}, {self.currency!r})"
+
+    def _check_currency(self, other: "Money") -> None:
+        if self.currency != other.currency:
+            raise ValueError(f"Cannot combine {self.currency} and {other.currency}")
+
+    def __add__(self, other: "Money") -> "Money":
+        if not isinstance(other, Money):
+            return NotImplemented
+        self._check_currency(other)
+        return Money(self.cents + other.cents, self.currency)
+
+    def __radd__(self, other: int) -> "Money":
+        # Allows sum() of money, which starts from 0
+        if other == 0:
+            return self
+        return NotImplemented
+
+    def __sub__(self, other: "Money") -> "Money":
+        if not isinstance(other, Money):
+            return NotImplemented
+        self._check_currency(other)
+        return Money(self.cents - other.cents, self.currency)
+
+    def __neg__(self) -> "Money":
+        return Money(-self.cents, self.currency)
+
+    def __mul__(self, factor: int) -> "Money":
+        if not isinstance(factor, int):
+            return NotImplemented
+        return Money(self.cents * factor, self.currency)
+
+    __rmul__ = __mul__
+
+    def __bool__(self) -> bool:
+        return self.cents != 0
+
+    def __eq__(self, other: object) -> bool:
+        if not isinstance(other, Money):
+            return NotImplemented
+        return self.cents == other.cents and self.currency == other.currency
+
+    def __lt__(self, other: "Money") -> bool:
+        if not isinstance(other, Money):
+            return NotImplemented
+        self._check_currency(other)
+        return self.cents < other.cents
+
+    def __hash__(self) -> int:
+        return hash((self.cents, self.currency))
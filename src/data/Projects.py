@@ -1,30 +1,96 @@
 import json
+import logging
+import multiprocessing
 import os
+import sqlite3
+from concurrent.futures import Future, ProcessPoolExecutor
+from functools import partial
 from os.path import isdir
-from typing import Any, ItemsView, KeysView, ValuesView
+from typing import Any, Callable, ItemsView, KeysView, Optional, ValuesView
 
-from PySide6.QtCore import QObject
+from PySide6.QtCore import QObject, QThreadPool, Signal
 
 from src.data.BankAccount import BankAccounts, BankAccount
 from src.data.CounterParts import CounterPart, CounterParts
+from src.data.TaggedItems import CollectionSnapshot
 from src.data.TransactionCategories import TransactionCategories, TransactionCategory
 from src.data.Transactions import Transactions, Transaction
 from src.data.TransactionsCSVReader import TransactionCSVReaders, TransactionsCSVReader
+from src.data.UndoLog import UndoLog
 from src.data.settings.AppSettings import AppSettings
+from src.data.settings.ComboBoxChoices import ProjectStorages
+from src.data.settings.GeneralSettings import GeneralSettingKeys
+from src.data.storage.Migrations import (
+    FORMAT_VERSION, FORMAT_VERSION_KEY, NEXT_IDENTIFIERS_KEY, MigratingEntries, migrating_loader
+)
+from src.data.storage.ParsedProject import ParsedProject, parse_project
+from src.data.storage.ProjectCache import ProjectCache
+from src.data.storage.ProjectJournal import COMPACTION_THRESHOLD, JournalOverlay, ProjectJournal
+from src.data.storage.ProjectJsonReader import ProjectJsonReader
+from src.data.storage.ShardedProjectStore import ShardedProjectStore
+from src.data.storage.SQLiteProjectStore import SQLiteProjectStore
+from src.data.storage.TransactionColumns import TransactionColumns
+from src.data.storage.TransactionTable import TransactionTable
+
+
+class ProjectSnapshot:
+    """
+    Read-only view of all collections of a project as they were when the snapshot was taken, see Project.snapshot.
+    Can be read on any thread while the project is being edited.
+    """
+
+    def __init__(self, collections: dict[str, CollectionSnapshot], next_identifiers: dict[str, int]) -> None:
+        """
+        :param collections: snapshots of the collections that were not excluded
+        :param next_identifiers: next identifier of every collection, including the excluded ones
+        """
+        self.collections = collections
+        self.next_identifiers = next_identifiers
+
+    def __getitem__(self, key: str) -> CollectionSnapshot:
+        return self.collections[key]
+
+    def __enter__(self) -> "ProjectSnapshot":
+        return self
+
+    def __exit__(self, *args) -> None:
+        self.release()
+
+    def json_dict(self, exclude: tuple[str, ...] = ()) -> dict[str, Any]:
+        """Returns the project like Project.json_dict at the time the snapshot was taken"""
+        json_dict = {FORMAT_VERSION_KEY: FORMAT_VERSION}  # type: dict[str, Any]
+
+        for key, snapshot in self.collections.items():
+            if len(snapshot) and key not in exclude:
+                json_dict[key] = snapshot.json_dict()
+        json_dict[NEXT_IDENTIFIERS_KEY] = dict(self.next_identifiers)
+        return json_dict
+
+    def release(self) -> None:
+        for snapshot in self.collections.values():
+            snapshot.release()
 
 
 class Project(QObject):
+
+    saved = Signal(object)  # emitted with the project when a background save finished
+    save_failed = Signal(object, str)  # emitted with the project and an error message when a background save failed
+
     def __init__(
         self,
         identifier: int,
         project_directory: str,
         settings: AppSettings,
         load_from_dir: bool = False,
+        progress_callback: Optional[Callable[[int, int], None]] = None,
+        parsed: Optional[ParsedProject] = None,
     ):
         """
         :param identifier: unique project identifier
         :param project_directory: path of project directory
         :param load_from_dir: boolean indicating whether to load project from specified directory
+        :param progress_callback: optional, called with the number of bytes read so far while loading the project
+        :param parsed: optional, contents of the project directory that were read beforehand, see Projects.parse_projects
         """
         super().__init__(None)
 
@@ -48,8 +114,25 @@ class Project(QObject):
             "transactions": self.transactions,
         }
 
+        # Where changes are saved: the journal next to project.json, the project.sqlite database or the per-year
+        # transaction files in project_dir. None as long as the project has not been loaded from or saved to its directory.
+        self._storage = None  # type: Optional[ProjectJournal | SQLiteProjectStore | ShardedProjectStore]
+        self._storage_format = None  # type: Optional[ProjectStorages]
+        self._previous_save_failed = False
+        # Set when the project was loaded from an older format, the next save writes it completely in the current one
+        self._needs_snapshot = False
+
+        # Single worker thread, so background saves never overlap and are written in order.
+        self._io_pool = QThreadPool(self)
+        self._io_pool.setMaxThreadCount(1)
+
         if load_from_dir:
-            self._load_project()
+            self._load_project(progress_callback=progress_callback, parsed=parsed)
+
+        # Changes are recorded once loaded, loading itself cannot be undone
+        self.undo_log = UndoLog(settings=self.settings)
+        for items in self._data_map.values():
+            items.undo_log = self.undo_log
 
     def _load_json(self, json_dict: dict[str, dict]) -> None:
         """Load project data from a specified json dictionary"""
@@ -61,32 +144,339 @@ class Project(QObject):
     def folder_name(self) -> str:
         return self.project_dir.split("/")[-1]
 
-    def _load_project(self):
+    @property
+    def is_dirty(self) -> bool:
+        """True when the project holds changes that have not been saved to its directory"""
+        if self._storage is None or self._storage.project_dir != self.project_dir:
+            return True
+        if self._previous_save_failed or self._needs_snapshot:
+            return True
+        return any(items.has_changes for items in self._data_map.values())
+
+    def _load_project(self,
+                      progress_callback: Optional[Callable[[int, int], None]] = None,
+                      parsed: Optional[ParsedProject] = None,
+                      ):
         """
         Loads project data.
         Load order should be hierarchical, with lowest levels being loaded first.
         For instance, sets can be part of variables and should be loaded after variables.
+
+        Items are built from the entries of project.json, with the changes from the journal applied on top of them.
+        project.json is read incrementally, building items one at a time while the file is read. When the project
+        cache is enabled, the loaded items are cached for the next time the project is opened, which then skips
+        reading project.json and the journal.
+
+        :param progress_callback: called with the number of bytes read and the total number of bytes to read
+        :param parsed: contents of project.json and the journal that were read beforehand, used instead of the files
         """
+        sqlite_store = SQLiteProjectStore(self.project_dir)
+        if sqlite_store.exists:
+            self._load_sqlite_store(sqlite_store)
+            return
 
-        # Load projects dict
         filename = f"{self.project_dir}/project.json"
         if not os.path.isfile(filename):
             return
-        with open(filename, "r") as read_file:
-            project_dict: dict[str, dict[int, Any]] = json.load(read_file)
 
-        self._load_json(json_dict=project_dict)
+        journal = ProjectJournal(self.project_dir)
+        use_cache = self.settings.general[GeneralSettingKeys.PROJECT_CACHE].value
+        stamp = ProjectCache.files_stamp(self.project_dir)  # before reading, changes made while reading invalidate it
+        if parsed is None and use_cache:
+            parsed = ProjectCache().get(self.project_dir)
+        if parsed is not None:
+            entries, overlay = parsed.entries, parsed.overlay
+        else:
+            entries = ProjectJsonReader(filename, progress_callback=progress_callback)
+            overlay = journal.read_overlay()  # changes saved after the snapshot was written
+        # Items of older files are upgraded before they are built. The journal is always written in the current format.
+        entries = MigratingEntries(entries)
+
+        keys = list(self._data_map.keys())
+        finished_keys = set()
+
+        def finish_collections(n_keys: int) -> None:
+            """Adds the items created after the snapshot to the first n_keys collections, once"""
+            for key in keys[:n_keys]:
+                if key not in finished_keys:
+                    self._data_map[key].load_from_json(overlay.remaining(key))
+                    finished_keys.add(key)
+
+        storage_format = ProjectStorages.JSON
+        if parsed is not None and parsed.storage_format is not None:
+            storage_format = parsed.storage_format
+        identifiers_by_year = {}  # type: dict[int, list[int]]
+        next_identifiers = {}  # type: dict[str, int]
+        transaction_table = {}  # type: dict[str, list]  # columns of the TransactionTable, read one at a time
+        for key, identifier, item_dict in entries:
+            if key == NEXT_IDENTIFIERS_KEY:
+                next_identifiers[identifier] = item_dict
+                continue
+            if key == ShardedProjectStore.shards_key:
+                identifiers_by_year[int(identifier)] = item_dict
+                continue
+            if key == TransactionColumns.project_json_key:
+                finish_collections(keys.index("transactions"))
+                self._load_transaction_columns(TransactionColumns.load(self.project_dir, item_dict).store_columns(),
+                                               overlay)
+                storage_format = ProjectStorages.JSON_NUMPY
+                continue
+            if key == TransactionTable.project_json_key:
+                transaction_table[identifier] = item_dict
+                continue
+            if key not in self._data_map:
+                continue
+
+            # Collections that come earlier in the load order are complete when a later collection starts
+            finish_collections(keys.index(key))
+
+            item_dict = overlay.apply(key, identifier, item_dict)
+            if item_dict is not None:
+                self._data_map[key].load_item(int(identifier), item_dict)
+        if transaction_table:
+            finish_collections(keys.index("transactions"))
+            self._load_transaction_columns(TransactionTable.store_columns(transaction_table), overlay)
+        finish_collections(len(keys))
+
+        self._storage = journal
+        sharded_store = ShardedProjectStore(self.project_dir, identifiers_by_year=identifiers_by_year)
+        if sharded_store.exists:
+            # Transactions are read per year, when they are first accessed
+            self.transactions.load_years_lazily(
+                identifiers_by_year,
+                loader=migrating_loader("transactions", sharded_store.fetch, version=entries.version),
+            )
+            self._storage = sharded_store
+            storage_format = ProjectStorages.JSON_SHARDED
+        self._storage_format = storage_format
+        self._needs_snapshot = entries.is_outdated
+        for key, items in self._data_map.items():
+            items.reserve_identifiers(max(next_identifiers.get(key, 0), overlay.next_identifier(key)))
+        for items in self._data_map.values():
+            items.clear_changes()
+
+        if use_cache and not (parsed is not None and parsed.is_cached) and not entries.is_outdated:
+            # Pickled and written on the worker thread, before any save of the project
+            self._io_pool.start(partial(ProjectCache().put, ParsedProject(
+                project_dir=self.project_dir,
+                entries=self._cache_entries(identifiers_by_year),
+                overlay=JournalOverlay(),
+                stamp=parsed.stamp if parsed is not None else stamp,
+                storage_format=storage_format,
+            )))
+
+    def _cache_entries(self, identifiers_by_year: dict[int, list[int]]) -> list[tuple[str, Optional[str], Any]]:
+        """
+        Returns the items of the just loaded project as entries of project.json, see ProjectCache.
+        Transactions are returned as a TransactionTable, or by year when they are stored per year.
+        Items are converted on the calling thread, so the entries can be written while the project is edited.
+        """
+        entries = [(FORMAT_VERSION_KEY, None, FORMAT_VERSION)]  # type: list[tuple[str, Optional[str], Any]]
+        for key, items in self._data_map.items():
+            if key != "transactions":
+                entries.extend((key, str(item.identifier), item.json_dict()) for item in items.values())
+        if identifiers_by_year:
+            entries.extend((ShardedProjectStore.shards_key, str(year), list(identifiers))
+                           for year, identifiers in identifiers_by_year.items())
+        elif self.transactions:
+            entries.extend((TransactionTable.project_json_key, name, values)
+                           for name, values in TransactionTable.table(self.transactions.columns()).items())
+        entries.extend((NEXT_IDENTIFIERS_KEY, key, items.next_identifier) for key, items in self._data_map.items())
+        return entries
+
+    def _load_transaction_columns(self, columns: dict[str, Any], overlay: JournalOverlay) -> None:
+        """
+        Adds the transactions of a columnar snapshot, with the changes from the journal applied on top of them.
+        :param columns: columns as loaded by Transactions.load_columns
+        """
+        self.transactions.load_columns(columns)
+
+        # Transactions changed by the journal are replaced in place or deleted
+        for identifier in [identifier for identifier in self.transactions.keys()
+                           if overlay.is_changed("transactions", str(identifier))]:
+            item_dict = overlay.apply("transactions", str(identifier), self.transactions[identifier].json_dict())
+            if item_dict is None:
+                del self.transactions[identifier]
+            else:
+                self.transactions[identifier] = Transaction.init_from_json(identifier=identifier,
+                                                                           json_dict=item_dict,
+                                                                           project=self,
+                                                                           )
+
+    def _load_sqlite_store(self, store: SQLiteProjectStore) -> None:
+        """Registers all stored items, items are only read from the database when they are first accessed"""
+        version = store.format_version
+        if version > FORMAT_VERSION:
+            raise ValueError(f"Project format version {version} is newer than the supported version "
+                             f"{FORMAT_VERSION}, please update the application")
+
+        for key, items in self._data_map.items():
+            items.load_lazily(identifiers=store.identifiers(key),
+                              loader=migrating_loader(key, partial(store.fetch, key), version=version))
+        for key, next_identifier in store.next_identifiers().items():
+            if key in self._data_map:
+                self._data_map[key].reserve_identifiers(next_identifier)
+        self._storage = store
+        self._storage_format = ProjectStorages.SQLITE
+        self._needs_snapshot = version < FORMAT_VERSION
 
     def save_project(self) -> None:
-        with open(f"{self.project_dir}/project.json", "w") as write_file:
+        """
+        Saves the project in the background, emits saved or save_failed when done.
+
+        What to write is determined on the calling thread, which gives a consistent view of the project, while the
+        serialization and writing itself happens on a worker thread. Complete snapshots are serialized from a
+        ProjectSnapshot, so the project can be edited meanwhile. Saves are written in the order they were requested.
+
+        Only the items that changed since the last save are written, either to the journal next to project.json or to
+        project.sqlite. A complete snapshot is written when the project directory does not hold this project yet, when
+        the journal has grown too large or when the previous save failed.
+        """
+        if self._storage is None or self._storage.project_dir != self.project_dir:
+            write = self._prepare_snapshot(
+                storage_format=self.settings.general[GeneralSettingKeys.PROJECT_STORAGE].value
+            )
+        elif self._needs_snapshot:
+            # Upgrades the project to the current format, in the storage format chosen for new projects
+            write = self._prepare_snapshot(
+                storage_format=self.settings.general[GeneralSettingKeys.PROJECT_STORAGE].value
+            )
+        elif self._previous_save_failed:
+            write = self._prepare_snapshot(storage_format=self._storage_format)
+        elif isinstance(self._storage, ProjectJournal) and self._storage.size > COMPACTION_THRESHOLD:
+            write = self._prepare_snapshot(storage_format=self._storage_format)  # compacts the journal
+        else:
+            changes = {key: items.take_changes() for key, items in self._data_map.items()}
+            write = partial(self._storage.write_changes, changes)
+
+        self._previous_save_failed = False
+        self._io_pool.start(partial(self._run_save, write))
+
+    def _run_save(self, write: Callable[[], None]) -> None:
+        """Runs on the worker thread"""
+        try:
+            write()
+        except (OSError, sqlite3.Error) as error:
+            logging.getLogger(__name__).exception(f"Failed to save project {self.project_dir}")
+            # Changes that were taken for this save are lost, make sure the next save writes everything
+            self._previous_save_failed = True
+            self.save_failed.emit(self, str(error))
+            return
+
+        self.saved.emit(self)
+
+    def _prepare_snapshot(self, storage_format: ProjectStorages) -> Callable[[], None]:
+        """
+        Takes a snapshot of the complete project and makes it the base of later saves.
+        Returns the function that writes the snapshot.
+        """
+        columns = None
+        table_columns = None
+        exclude = ()  # type: tuple[str, ...]
+        if storage_format == ProjectStorages.JSON_NUMPY:
+            # Transactions are written as binary columns instead of as part of project.json
+            columns = TransactionColumns.from_transactions(self.transactions)
+            exclude = ("transactions",)
+        elif storage_format == ProjectStorages.JSON:
+            # Transactions are written to project.json as a TransactionTable, straight from a copy of the columns
+            table_columns = self.transactions.columns() if self.transactions else None
+            exclude = ("transactions",)
+        # Serialized on the worker thread
+        snapshot = self.snapshot(exclude=exclude)
+        for items in self._data_map.values():
+            items.clear_changes()
+        self._needs_snapshot = False
+
+        storage_type = {
+            ProjectStorages.SQLITE: SQLiteProjectStore,
+            ProjectStorages.JSON_SHARDED: ShardedProjectStore,
+        }.get(storage_format, ProjectJournal)
+        if type(self._storage) is storage_type and self._storage.project_dir == self.project_dir:
+            storage = self._storage
+        else:
+            if isinstance(self._storage, SQLiteProjectStore):
+                self._storage.close()  # all items were loaded by snapshot()
+            storage = storage_type(self.project_dir)
+        self._storage = storage
+        self._storage_format = storage_format
+
+        if isinstance(storage, SQLiteProjectStore):
+            def write() -> None:
+                with snapshot:
+                    storage.write_snapshot(snapshot.json_dict())
+
+            return write
+
+        if isinstance(storage, ShardedProjectStore):
+            def write() -> None:
+                with snapshot:
+                    storage.write_snapshot(snapshot.json_dict())
+                ProjectJournal(self.project_dir).clear()
+                TransactionColumns.remove_unused(self.project_dir)
+
+            return write
+
+        def write() -> None:
+            with snapshot:
+                json_dict = snapshot.json_dict(exclude=exclude)
+            columns_directory = None
+            if columns is not None:
+                columns_directory = columns.save(self.project_dir)
+                json_dict[TransactionColumns.project_json_key] = columns_directory
+            self._write_snapshot(json_dict, transaction_columns=table_columns)
+            storage.clear()
+            TransactionColumns.remove_unused(self.project_dir, used_directory_name=columns_directory)
+            ShardedProjectStore.remove(self.project_dir)
+
+        return write
+
+    def _write_snapshot(self, json_dict: dict[str, dict], transaction_columns: Optional[dict[str, Any]] = None) -> None:
+        """
+        Writes project.json through a temporary file, so an interrupted write never corrupts the existing file.
+        :param transaction_columns: columns of the transactions, as returned by Transactions.columns, written as a
+            TransactionTable
+        """
+        filename = f"{self.project_dir}/project.json"
+        with open(f"{filename}.tmp", "w") as write_file:
+            if transaction_columns is None:
+                json.dump(json_dict, write_file, indent=4)
+            else:
+                # The table is the last member of the project object, written in chunks after the other collections
+                write_file.write(json.dumps(json_dict, indent=4).removesuffix("\n}"))
+                write_file.write(f',\n    "{TransactionTable.project_json_key}": ')
+                TransactionTable.write(write_file, transaction_columns)
+                write_file.write("\n}")
+            write_file.flush()
+            os.fsync(write_file.fileno())
+        os.replace(f"{filename}.tmp", filename)
+
+    def snapshot(self, exclude: tuple[str, ...] = ()) -> ProjectSnapshot:
+        """
+        Returns a read-only view of the project as it is now, for background work such as saves and reports.
+        Taking a snapshot copies no items, see TaggedItems.snapshot. Release the snapshot once it is no longer needed.
+        :param exclude: keys of collections that are left out of the snapshot, their next identifiers are kept
+        """
+        return ProjectSnapshot(
+            collections={key: items.snapshot() for key, items in self._data_map.items() if key not in exclude},
+            next_identifiers={key: items.next_identifier for key, items in self._data_map.items()},
+        )
+
+    def export_json(self, filename: str) -> None:
+        """Writes the complete project to a file as indented json, one object per item, e.g. to read or diff it"""
+        with open(filename, "w") as write_file:
             json.dump(self.json_dict(), write_file, indent=4)
 
-    def json_dict(self) -> dict[str, dict]:
-        json_dict = {}  # type: dict[str, dict[int, Any]]
+    def wait_for_background_tasks(self) -> None:
+        """Blocks until pending background saves and cache writes have finished."""
+        self._io_pool.waitForDone()
+
+    def json_dict(self, exclude: tuple[str, ...] = ()) -> dict[str, Any]:
+        json_dict = {FORMAT_VERSION_KEY: FORMAT_VERSION}  # type: dict[str, Any]
 
         for key, items in self._data_map.items():
-            if items:
+            if items and key not in exclude:
                 json_dict[key] = items.json_dict()
+        json_dict[NEXT_IDENTIFIERS_KEY] = {key: items.next_identifier for key, items in self._data_map.items()}
         return json_dict
 
 
@@ -122,7 +512,11 @@ class Projects:
         return self._projects_dict.pop(key)
 
     def create_new_project(
-        self, project_directory: str, load_from_dir: bool = False
+        self,
+        project_directory: str,
+        load_from_dir: bool = False,
+        progress_callback: Optional[Callable[[int, int], None]] = None,
+        parsed: Optional[ParsedProject] = None,
     ) -> Project:
 
         if not isdir(project_directory):
@@ -134,12 +528,30 @@ class Projects:
             project_directory=project_directory,
             load_from_dir=load_from_dir,
             settings=self._settings,
+            progress_callback=progress_callback,
+            parsed=parsed,
         )
 
         self._projects_dict[identifier] = project
 
         return project
 
+    def parse_projects(self, project_directories: list[str]) -> list[Future]:
+        """
+        Reads several project directories concurrently, each in a worker process.
+        Every future results in a ParsedProject, which is attached by passing it to create_new_project.
+        """
+        executor = ProcessPoolExecutor(
+            max_workers=max(1, min(len(project_directories), os.cpu_count() or 1)),
+            # Forking a process that runs Qt threads is unsafe, start fresh interpreters instead
+            mp_context=multiprocessing.get_context("spawn"),
+        )
+        use_cache = self._settings.general[GeneralSettingKeys.PROJECT_CACHE].value
+        futures = [executor.submit(parse_project, project_directory, use_cache=use_cache)
+                   for project_directory in project_directories]
+        executor.shutdown(wait=False)  # the worker processes exit once all directories have been read
+        return futures
+
     def _get_new_identifier(self) -> int:
         identifier = 0
         while identifier in self._projects_dict.keys():
@@ -1,24 +1,37 @@
-from typing import TYPE_CHECKING, Any, Generic, ItemsView, KeysView, TypeVar, ValuesView
+from typing import (
+    TYPE_CHECKING, Any, Callable, Generic, Iterable, Iterator, ItemsView, KeysView, Optional, TypeAlias, TypeVar,
+    ValuesView
+)
 
 
 if TYPE_CHECKING:
     from src.data.Projects import Project
     from src.data.settings.AppSettings import AppSettings
+    from src.data.UndoLog import UndoLog
 
-from collections import OrderedDict
+import threading
+from collections import OrderedDict, deque
+from contextlib import contextmanager
+from enum import StrEnum
+from itertools import islice
 
-from PySide6.QtCore import QObject
 
+class TaggedItem:
+    """
+    Used for project data that requires a unique identifier.
 
-class TaggedItem(QObject):
-    """Used for project data that requires a unique identifier."""
+    Items are plain objects with __slots__ rather than QObjects, as projects may hold hundreds of thousands of them.
+    Subclasses declare their own attributes in __slots__ as well. Views are notified of changes by the models of
+    the collections, not by the items themselves.
+    """
+
+    __slots__ = ("project", "identifier")
 
     def __init__(self, project: "Project", identifier: int) -> None:
         """
         :param project: project to which the tagged item belongs
         :param identifier: unique identifier (tag) of the item
         """
-        super().__init__(None)
         self.project = project
         self.identifier = identifier
 
@@ -43,6 +56,114 @@ class TaggedItem(QObject):
 
 TaggedItemType = TypeVar("TaggedItemType", bound=TaggedItem)
 
+class ChangeKinds(StrEnum):
+    INSERTED = "inserted"
+    UPDATED = "updated"
+    DELETED = "deleted"
+    CLEARED = "cleared"  # all items were removed
+
+
+class ChangeEvent:
+    """Change of one or more items of a collection, as published by TaggedItems"""
+
+    __slots__ = ("sequence", "kind", "identifiers", "fields")
+
+    def __init__(self, sequence: int, kind: ChangeKinds, identifiers: tuple[int, ...], fields: tuple[str, ...] = ()):
+        """
+        :param sequence: number of the change, increasing by one for every change of the collection
+        :param identifiers: identifiers of the changed items
+        :param fields: names of the updated attributes, for updates
+        """
+        self.sequence = sequence
+        self.kind = kind
+        self.identifiers = identifiers
+        self.fields = fields
+
+    def __repr__(self) -> str:
+        return f"{self.__class__.__name__}({self.sequence}, {self.kind}, {self.identifiers}, {self.fields})"
+
+
+# Number of recent changes kept by every collection, for consumers that poll with changes_since
+CHANGE_LOG_SIZE = 10000
+
+# Json dicts of the created or modified items, identifiers of the deleted items and the next identifier of a collection,
+# which is None if it did not change.
+CollectionChanges: TypeAlias = tuple[dict[int, dict[str, Any]], list[int], Optional[int]]
+
+
+class CollectionSnapshot:
+    """
+    Read-only view of a collection as it was when the snapshot was taken, see TaggedItems.snapshot.
+    Items are returned as json dicts, which may be shared with the collection and should not be modified.
+    Snapshots can be read on any thread.
+    """
+
+    __slots__ = ("_items", "_preserved", "_order", "_length", "next_identifier")
+
+    def __init__(self, items: "TaggedItems") -> None:
+        self._items = items
+        # Json dicts of the items changed since the snapshot was taken, as they were before, None for items that
+        # did not exist yet. Unchanged items are read from the collection.
+        self._preserved = {}  # type: dict[int, Optional[dict[str, Any]]]
+        self._order = None  # type: Optional[list[int]]  # identifiers in order, kept once items are removed
+        self._length = len(items)
+        self.next_identifier = items.next_identifier
+
+    def __len__(self) -> int:
+        return self._length
+
+    def __contains__(self, identifier: int) -> bool:
+        with self._items._lock:
+            if identifier in self._preserved:
+                return self._preserved[identifier] is not None
+            return identifier < self.next_identifier and identifier in self._items._data
+
+    def __getitem__(self, identifier: int) -> dict[str, Any]:
+        with self._items._lock:
+            if identifier in self._preserved:
+                json_dict = self._preserved[identifier]
+            elif identifier < self.next_identifier and identifier in self._items._data:
+                json_dict = self._items._item_json_dict(identifier)
+            else:
+                json_dict = None
+        if json_dict is None:
+            raise KeyError(identifier)
+        return json_dict
+
+    def __enter__(self) -> "CollectionSnapshot":
+        return self
+
+    def __exit__(self, *args) -> None:
+        self.release()
+
+    def keys(self) -> list[int]:
+        with self._items._lock:
+            if self._order is not None:
+                return list(self._order)
+            return self._current_keys()
+
+    def json_dict(self) -> dict[int, dict[str, Any]]:
+        """Returns the json dicts of all items, like TaggedItems.json_dict at the time the snapshot was taken"""
+        return {identifier: self[identifier] for identifier in self.keys()}
+
+    def release(self) -> None:
+        """Stops keeping the state of changed items for the snapshot, it should not be read anymore"""
+        self._items._release(self)
+
+    def _current_keys(self) -> list[int]:
+        # As long as no item was removed, the items of the snapshot come first, in order, followed by newer ones
+        return [identifier for identifier in self._items._data.keys()
+                if identifier < self.next_identifier and self._preserved.get(identifier, True) is not None]
+
+    def _preserve(self, identifiers: Iterable[int], removing: bool) -> None:
+        """Keeps the current state of items that are about to change, called by the collection"""
+        if removing and self._order is None:
+            self._order = self._current_keys()
+        data = self._items._data
+        for identifier in identifiers:
+            if identifier < self.next_identifier and identifier not in self._preserved:
+                self._preserved[identifier] = self._items._item_json_dict(identifier) if identifier in data else None
+
 
 class TaggedItems(Generic[TaggedItemType]):
     """Used for project data collections that require unique identifiers for each item"""
@@ -64,14 +185,59 @@ class TaggedItems(Generic[TaggedItemType]):
 
         self._data: OrderedDict[int, TaggedItemType] = OrderedDict()
 
+        # Identifier of the next new item, higher than that of any item the collection ever held.
+        # Identifiers are not reused, so that deleted items are never confused with new ones.
+        self._next_identifier = 0
+        self._saved_next_identifier = 0  # as of the last time changes were taken or cleared
+
+        # Changes since the last save, used to journal only what was modified.
+        self._upserted_ids: set[int] = set()  # created or modified items
+        self._deleted_ids: set[int] = set()
+
+        # Items that are known by identifier but only built when first accessed, see load_lazily.
+        # Their entry in self._data is None until then.
+        self._loader = None  # type: Optional[Callable[[list[int]], dict[int, dict[str, Any]]]]
+        self._n_unloaded = 0
+
+        # Json dicts of the items and of the complete collection, reused until an item changes.
+        # Items are only serialized again after they were modified, not on every save.
+        self._item_json_cache = {}  # type: dict[int, dict[str, Any]]
+        self._json_dict_cache = None  # type: Optional[dict[int, dict[str, Any]]]
+
+        # Feed of the changes made through this class, for consumers that update incrementally, see subscribe.
+        self._sequence = 0
+        self._change_log = deque(maxlen=CHANGE_LOG_SIZE)  # type: deque[ChangeEvent]
+        self._subscribers = []  # type: list[Callable[[ChangeEvent], None]]
+
+        # Records the changes made through this class so that they can be undone, set once the project is loaded
+        self.undo_log = None  # type: Optional[UndoLog]
+
+        # Snapshots in use, which may be read on other threads. Changes are made while holding the lock as long as
+        # there are snapshots, after keeping the current state of the items they change, see _changing.
+        self._snapshots = []  # type: list[CollectionSnapshot]
+        self._lock = threading.RLock()
+
     def __getitem__(self, key: int) -> TaggedItemType:
-        return self._data[key]
+        item = self._data[key]
+        if item is None:
+            self._materialize([key])
+            item = self._data[key]
+        return item
 
     def __setitem__(self, key: int, value: TaggedItemType) -> None:
-        self._data[key] = value
+        """Stores an item as is, for loading. Like __delitem__ and pop, this publishes, records and journals nothing."""
+        with self._changing((key,)):
+            self._data[key] = value
+            self._next_identifier = max(self._next_identifier, key + 1)
+            self._invalidate_json(key)
 
     def __delitem__(self, key: int) -> None:
-        del self._data[key]
+        """Removes an item without publishing, recording or journaling the change, see delete_item"""
+        with self._changing((key,), removing=True):
+            if self._data[key] is None:
+                self._n_unloaded -= 1
+            del self._data[key]
+            self._invalidate_json(key)
 
     def __contains__(self, key: int) -> bool:
         return key in self._data
@@ -92,38 +258,66 @@ class TaggedItems(Generic[TaggedItemType]):
         return self._data.keys()
 
     def items(self) -> ItemsView[int, TaggedItemType]:
+        self._materialize_all()
         return self._data.items()
 
     def values(self) -> ValuesView[TaggedItemType]:
+        self._materialize_all()
         return self._data.values()
 
     def pop(self, key: int) -> TaggedItemType:
-        item = self._data.pop(key)
+        """Removes and returns an item without publishing, recording or journaling the change, see delete_item"""
+        item = self[key]
+        with self._changing((key,), removing=True):
+            del self._data[key]
+            self._invalidate_json(key)
         return item
 
     def clear(self) -> None:
-        self._data.clear()
+        with self._changing(self._data.keys(), removing=True):
+            self._data.clear()
+            self._n_unloaded = 0
+            self._item_json_cache.clear()
+            self._json_dict_cache = None
+        self._publish(ChangeKinds.CLEARED, ())
 
     def get_new_identifier(self) -> int:
-        identifier = 0
-        while identifier in self._data.keys():
-            identifier += 1
-        return identifier
+        return self._next_identifier
 
-    def json_dict(self) -> dict[int, dict[str, Any]]:
-        json_dict = {}  # type: dict[int, dict[str, Any]]
+    @property
+    def next_identifier(self) -> int:
+        return self._next_identifier
 
-        for identifier, item in self._data.items():
-            json_dict[identifier] = item.json_dict()
+    def reserve_identifiers(self, next_identifier: int) -> None:
+        """Makes sure new items get an identifier of at least next_identifier, e.g. as stored with a saved project"""
+        self._next_identifier = max(self._next_identifier, next_identifier)
 
+    def json_dict(self) -> dict[int, dict[str, Any]]:
+        """
+        Returns the json dicts of all items. Unchanged items reuse the json dict of the previous call.
+        The returned dicts are shared with later calls and should not be modified.
+        """
+        if self._json_dict_cache is None:
+            self._materialize_all()
+            self._json_dict_cache = {identifier: self._item_json_dict(identifier) for identifier in self._data}
+        return self._json_dict_cache
+
+    def _item_json_dict(self, identifier: int) -> dict[str, Any]:
+        json_dict = self._item_json_cache.get(identifier)
+        if json_dict is None:
+            json_dict = self._item_json_cache[identifier] = self._data[identifier].json_dict()
         return json_dict
 
+    def _invalidate_json(self, identifier: int) -> None:
+        self._item_json_cache.pop(identifier, None)
+        self._json_dict_cache = None
+
     def create_new_item(
         self,
         identifier: int = None,
         json_dict: dict[str, Any] = None,
     ) -> "TaggedItemType":
-        if identifier:
+        if identifier is not None:
             assert identifier not in self._data.keys()
         else:
             identifier = self.get_new_identifier()
@@ -139,25 +333,227 @@ class TaggedItems(Generic[TaggedItemType]):
                 identifier=identifier, project=self._project
             )
 
-        self._data[identifier] = item
+        self[identifier] = item
+        self._mark_upserted(identifier)
+        self._publish(ChangeKinds.INSERTED, (identifier,))
+        if self._recording:
+            self.undo_log.record_insert(self, (identifier,))
         return item
 
+    def bulk_create(self, json_dicts: Iterable[dict[str, Any]]) -> list[TaggedItemType]:
+        """Creates an item for every json dict, with consecutive new identifiers"""
+        init_from_json = self._factory.init_from_json
+        first_identifier = self._next_identifier
+        new_items = [
+            init_from_json(identifier=identifier, json_dict=json_dict, project=self._project)
+            for identifier, json_dict in enumerate(json_dicts, start=first_identifier)
+        ]
+        identifiers = range(first_identifier, first_identifier + len(new_items))
+
+        with self._changing():
+            self._data.update(zip(identifiers, new_items))
+            self._next_identifier = first_identifier + len(new_items)
+            self._upserted_ids.update(identifiers)
+            self._json_dict_cache = None
+        self._publish(ChangeKinds.INSERTED, tuple(identifiers))
+        if self._recording:
+            self.undo_log.record_insert(self, tuple(identifiers))
+        return new_items
+
     def copy_item(self, item: "TaggedItemType") -> "TaggedItemType":
         identifier = self.get_new_identifier()
         new_item = item.copy(new_identifier=identifier)
 
-        self._data[identifier] = new_item
+        self[identifier] = new_item
+        self._mark_upserted(identifier)
+        self._publish(ChangeKinds.INSERTED, (identifier,))
+        if self._recording:
+            self.undo_log.record_insert(self, (identifier,))
         return new_item
 
+    def update_item(self, item: TaggedItemType, **fields: Any) -> None:
+        """
+        Sets one or more attributes of an item and records the item as modified.
+        Edits should go through this method so that they end up in the project journal.
+        """
+        if self._recording:
+            for name, value in fields.items():
+                self.undo_log.record_update(self, (item.identifier,), name, (getattr(item, name),), value)
+        with self._changing((item.identifier,)):
+            for name, value in fields.items():
+                setattr(item, name, value)
+            self._mark_upserted(item.identifier)
+        self._publish(ChangeKinds.UPDATED, (item.identifier,), tuple(fields))
+
     def delete_item(self, item: TaggedItemType):
-        _ = self._data.pop(item.identifier)
+        if self._recording:
+            self.undo_log.record_delete(self, item.identifier, self._item_json_dict(item.identifier))
+        with self._changing((item.identifier,), removing=True):
+            _ = self._data.pop(item.identifier)
+            self._invalidate_json(item.identifier)
+        self._upserted_ids.discard(item.identifier)
+        self._deleted_ids.add(item.identifier)
+        self._publish(ChangeKinds.DELETED, (item.identifier,))
+
+    def copy_items(self, items: Iterable[TaggedItemType]) -> list[TaggedItemType]:
+        """Copies the items at once, the copies get consecutive new identifiers"""
+        return self.bulk_create([self._item_json_dict(item.identifier) for item in items])
+
+    def delete_items(self, items: Iterable[TaggedItemType]) -> None:
+        """Deletes the items at once, as a single change"""
+        identifiers = tuple(item.identifier for item in items)
+        if self._recording:
+            with self.undo_log.group():
+                for identifier in identifiers:
+                    self.undo_log.record_delete(self, identifier, self._item_json_dict(identifier))
+        with self._changing(identifiers, removing=True):
+            for identifier in identifiers:
+                _ = self._data.pop(identifier)
+                self._invalidate_json(identifier)
+        self._upserted_ids.difference_update(identifiers)
+        self._deleted_ids.update(identifiers)
+        if identifiers:
+            self._publish(ChangeKinds.DELETED, identifiers)
+
+    def snapshot(self) -> CollectionSnapshot:
+        """
+        Returns a read-only view of the items as they are now, e.g. for saves or reports on a worker thread.
+        Taking a snapshot copies nothing, only items that are changed while the snapshot is in use are copied, as json
+        dicts. Items that are not loaded yet are loaded first. Release the snapshot once it is no longer needed.
+        """
+        self._materialize_all()
+        snapshot = CollectionSnapshot(self)
+        with self._lock:
+            self._snapshots.append(snapshot)
+        return snapshot
+
+    def _release(self, snapshot: CollectionSnapshot) -> None:
+        with self._lock:
+            if snapshot in self._snapshots:
+                self._snapshots.remove(snapshot)
+
+    @contextmanager
+    def _changing(self, identifiers: Iterable[int] = (), removing: bool = False) -> Iterator[None]:
+        """
+        Wraps every change of the collection, so that snapshots keep seeing the items as they were.
+        :param identifiers: identifiers of the items that are changed, created or removed
+        :param removing: True when items are removed, which changes the order of the remaining items
+        """
+        if not self._snapshots:
+            yield
+            return
+        with self._lock:
+            for snapshot in self._snapshots:
+                snapshot._preserve(identifiers, removing)
+            yield
+
+    @property
+    def _recording(self) -> bool:
+        return self.undo_log is not None and self.undo_log.is_recording
+
+    def _mark_upserted(self, identifier: int) -> None:
+        # An identifier can be both deleted and upserted when it is reused for a new item.
+        # Deletes are saved before upserts, so that the new item ends up last, as it does in self._data.
+        self._upserted_ids.add(identifier)
+        self._invalidate_json(identifier)
+
+    @property
+    def sequence(self) -> int:
+        """Sequence number of the last change, 0 if there was none"""
+        return self._sequence
+
+    def subscribe(self, callback: Callable[[ChangeEvent], None]) -> None:
+        """Calls callback with every change made from now on, right after it was made"""
+        self._subscribers.append(callback)
+
+    def unsubscribe(self, callback: Callable[[ChangeEvent], None]) -> None:
+        self._subscribers.remove(callback)
+
+    def changes_since(self, sequence: int) -> Optional[list[ChangeEvent]]:
+        """
+        Returns the changes made after the change with the given sequence number, in order.
+        Returns None when some of them are no longer kept, the consumer should then start over from the current items.
+        """
+        n_changes = self._sequence - sequence
+        if n_changes > len(self._change_log):
+            return None
+        return list(islice(self._change_log, len(self._change_log) - max(n_changes, 0), None))
+
+    def _publish(self, kind: ChangeKinds, identifiers: tuple[int, ...], fields: tuple[str, ...] = ()) -> None:
+        self._sequence += 1
+        event = ChangeEvent(sequence=self._sequence, kind=kind, identifiers=identifiers, fields=fields)
+        self._change_log.append(event)
+        for callback in self._subscribers:
+            callback(event)
+
+    @property
+    def has_changes(self) -> bool:
+        return bool(self._upserted_ids or self._deleted_ids)
+
+    def take_changes(self) -> CollectionChanges:
+        """
+        Returns the items created or modified since the last call (as json dicts) and the identifiers of
+        deleted items, and starts tracking changes anew.
+        """
+        upserts = {identifier: self._item_json_dict(identifier) for identifier in self._upserted_ids}
+        deletes = sorted(self._deleted_ids)
+        next_identifier = self._next_identifier if self._next_identifier != self._saved_next_identifier else None
+        self.clear_changes()
+        return upserts, deletes, next_identifier
+
+    def clear_changes(self) -> None:
+        self._upserted_ids.clear()
+        self._deleted_ids.clear()
+        self._saved_next_identifier = self._next_identifier
+
+    def load_lazily(self,
+                    identifiers: list[int],
+                    loader: Callable[[list[int]], dict[int, dict[str, Any]]],
+                    ) -> None:
+        """
+        Registers items without building them. An item is only built from its json dict when it is first accessed.
+        :param identifiers: identifiers of the items, in order
+        :param loader: returns the json dicts of (at least) the requested identifiers
+        """
+        self._loader = loader
+        for identifier in identifiers:
+            self._data[identifier] = None
+        self._n_unloaded += len(identifiers)
+        if identifiers:
+            self.reserve_identifiers(max(identifiers) + 1)
+
+    def _materialize(self, identifiers: list[int]) -> None:
+        json_dicts = self._loader(identifiers)
+        # Loaders may return more items than requested, e.g. all items stored in the same file. Those are built as
+        # well, unless they were deleted or replaced in the meantime.
+        for identifier, json_dict in json_dicts.items():
+            if identifier in self._data and self._data[identifier] is None:
+                self._data[identifier] = self._factory.init_from_json(
+                    identifier=identifier,
+                    json_dict=json_dict,
+                    project=self._project,
+                )
+                self._n_unloaded -= 1
+
+    def _materialize_all(self, batch_size: int = 500) -> None:
+        if not self._n_unloaded:
+            return
+
+        unloaded = [identifier for identifier, item in self._data.items() if item is None]
+        for start in range(0, len(unloaded), batch_size):
+            self._materialize(unloaded[start:start + batch_size])
+
+    def load_item(self, identifier: int, json_dict: dict[str, Any]) -> None:
+        """Adds an item read from storage. Loading is not a change, it is not published, recorded or journaled."""
+        self[identifier] = self._factory.init_from_json(identifier=identifier,
+                                                        json_dict=json_dict,
+                                                        project=self._project,
+                                                        )
 
     def load_from_json(self, json_dict: dict[int, dict[str, Any]]) -> None:
+        """Adds items read from storage, see load_item"""
         for identifier, item_dict in json_dict.items():
-            self.create_new_item(
-                identifier=int(identifier),
-                json_dict=json_dict[identifier],
-            )
+            self.load_item(int(identifier), item_dict)
 
 
 TaggedItemsType = TypeVar("TaggedItemsType", bound=TaggedItems)
\ No newline at end of file
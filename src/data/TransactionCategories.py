@@ -6,6 +6,7 @@ if TYPE_CHECKING:
 
 
 class TransactionCategory(TaggedItem):
+    __slots__ = ("name", "note")
 
     def __init__(self,
                  project: "Project",
@@ -0,0 +1,383 @@
+import datetime
+from bisect import bisect_left, bisect_right
+from collections.abc import KeysView, MutableMapping
+from decimal import Decimal
+from typing import TYPE_CHECKING, Any, Iterable, Iterator, Optional, Sequence
+
+import numpy as np
+
+from src.data.Money import Money
+
+if TYPE_CHECKING:
+    from src.data.Projects import Project
+    from src.data.Transactions import Transaction
+
+NULL_REFERENCE = -1  # stored in the account, category and counterpart columns when there is no reference
+DELETED = -1  # stored in the identifier column of the rows of deleted transactions
+
+
+def encode_date(date: datetime.date) -> int:
+    return date.toordinal()
+
+
+def encode_amount(amount: Decimal | Money) -> int:
+    """Converts an amount to cents"""
+    if isinstance(amount, Money):
+        return amount.cents
+    return Money.from_decimal(amount).cents
+
+
+def encode_reference(item) -> int:
+    return item.identifier if item is not None else NULL_REFERENCE
+
+
+class TransactionStore(MutableMapping):
+    """
+    Columnar storage of the transactions of a project, mapping identifiers to transactions.
+
+    Every transaction is a row in a set of numpy arrays:
+    - identifier: int64, DELETED for rows of deleted transactions
+    - date: int32, proleptic Gregorian ordinal (datetime.date.toordinal)
+    - amount: int64, in cents
+    - account, category, counterpart: int32 identifiers, NULL_REFERENCE when not set
+    - note: int32 index in a table of interned strings
+    - loaded: False for transactions that are known by identifier but not read yet, see TaggedItems.load_lazily
+
+    Transactions are not kept as objects: indexing the store creates a Transaction view on a row, which reads and
+    writes the arrays. Rows are kept in the order of the identifiers, deleting a transaction leaves an unused row
+    behind until there are enough of them to compact the arrays. The arrays grow geometrically.
+
+    Secondary indexes on the date and on the references allow find() to select transactions without a full scan.
+    They are built from the columns when first needed and kept up to date by every change made through the store,
+    adding transactions in bulk drops them until they are needed again.
+    """
+
+    column_dtypes = {
+        "identifier": np.int64,
+        "date": np.int32,
+        "amount": np.int64,
+        "account": np.int32,
+        "category": np.int32,
+        "counterpart": np.int32,
+        "note": np.int32,
+        "loaded": np.bool_,
+    }
+    # Project collections holding the items referenced by the reference columns
+    reference_collections = {
+        "account": "bank_accounts",
+        "category": "transaction_categories",
+        "counterpart": "counterparts",
+    }
+    min_capacity = 1024
+
+    def __init__(self, project: "Project", factory: type["Transaction"]) -> None:
+        """
+        :param project: project to which the transactions belong, used to resolve references
+        :param factory: transaction class of which the views are created
+        """
+        self._project = project
+        self._factory = factory
+
+        self._columns = {name: np.empty(self.min_capacity, dtype=dtype) for name, dtype in self.column_dtypes.items()}
+        self._size = 0  # number of used rows, including those of deleted transactions
+        self._n_deleted = 0
+        # Row of every transaction. Rows are appended for new identifiers, so this is in row order as well.
+        self._rows = {}  # type: dict[int, int]
+
+        self._notes = [""]  # type: list[str]
+        self._note_indices = {"": 0}  # type: dict[str, int]
+
+        # Dates and identifiers of the loaded transactions, sorted by date, and for every reference column the
+        # identifiers of the loaded transactions per referenced identifier. None until first used.
+        self._date_index = None  # type: Optional[tuple[list[int], list[int]]]
+        self._reference_indexes = {}  # type: dict[str, dict[int, set[int]]]
+
+    def __getitem__(self, identifier: int) -> Optional["Transaction"]:
+        """Returns a view on a transaction, or None if it was not loaded yet"""
+        row = self._rows[identifier]
+        if not self._columns["loaded"][row]:
+            return None
+        return self._factory.view(project=self._project, identifier=identifier, store=self)
+
+    def __setitem__(self, identifier: int, transaction: Optional["Transaction"]) -> None:
+        """
+        Stores the values of a transaction, which becomes a view on its row if it was not part of a store yet.
+        Storing None registers a transaction that is not loaded yet.
+        """
+        if transaction is None:
+            row = self._row_for(identifier)
+            self._unindex(identifier, row)
+            self._columns["loaded"][row] = False
+            return
+
+        # Values are encoded before writing any of them, transaction may be a view on the row that is written
+        values = {
+            "date": encode_date(transaction.date),
+            "amount": encode_amount(transaction.amount),
+            "account": encode_reference(transaction.account),
+            "category": encode_reference(transaction.category),
+            "counterpart": encode_reference(transaction.counterpart),
+            "note": self._intern(transaction.note),
+        }
+        row = self._row_for(identifier)
+        self._unindex(identifier, row)
+        for name, value in values.items():
+            self._columns[name][row] = value
+        self._columns["loaded"][row] = True
+        self._index(identifier, row)
+
+        if transaction.is_detached:
+            transaction.attach(self)
+
+    def __delitem__(self, identifier: int) -> None:
+        row = self._rows.pop(identifier)
+        self._unindex(identifier, row)
+        self._columns["identifier"][row] = DELETED
+        self._columns["loaded"][row] = False
+        self._n_deleted += 1
+        if self._n_deleted > self.min_capacity and self._n_deleted > self._size // 2:
+            self._compact()
+
+    def __contains__(self, identifier: object) -> bool:
+        return identifier in self._rows
+
+    def __iter__(self) -> Iterator[int]:
+        return iter(self._rows)
+
+    def __len__(self) -> int:
+        return len(self._rows)
+
+    def __repr__(self) -> str:
+        return f"{self.__class__.__name__}({len(self)} transactions)"
+
+    def keys(self) -> KeysView[int]:
+        return self._rows.keys()
+
+    def clear(self) -> None:
+        self._size = 0
+        self._n_deleted = 0
+        self._rows.clear()
+        self._notes = [""]
+        self._note_indices = {"": 0}
+        self._drop_indexes()
+
+    def is_loaded(self, identifier: int) -> bool:
+        return bool(self._columns["loaded"][self._rows[identifier]])
+
+    def field(self, identifier: int, name: str) -> Any:
+        """Returns a single decoded value of a transaction"""
+        value = int(self._columns[name][self._rows[identifier]])
+        if name == "date":
+            return datetime.date.fromordinal(value)
+        elif name == "amount":
+            return Decimal(value).scaleb(-2)
+        elif name == "note":
+            return self._notes[value]
+        elif name in self.reference_collections:
+            if value == NULL_REFERENCE:
+                return None
+            items = getattr(self._project, self.reference_collections[name])
+            return items[value] if value in items else None  # references to deleted items are dropped
+        raise KeyError(name)
+
+    def set_field(self, identifier: int, name: str, value: Any) -> None:
+        """Encodes and stores a single value of a transaction"""
+        if name == "date":
+            encoded = encode_date(value)
+        elif name == "amount":
+            encoded = encode_amount(value)
+        elif name == "note":
+            encoded = self._intern(value)
+        elif name in self.reference_collections:
+            encoded = encode_reference(value)
+        else:
+            raise KeyError(name)
+
+        row = self._rows[identifier]
+        self._unindex_value(name, identifier, row)
+        self._columns[name][row] = encoded
+        self._index_value(name, identifier, row)
+
+    def extend(self, identifiers: Sequence[int], columns: dict[str, Sequence]) -> None:
+        """
+        Appends loaded transactions at once.
+        :param identifiers: new identifiers, none of them may be stored already
+        :param columns: encoded values for every column but identifier and loaded, except for notes: these are strings
+        """
+        n_new = len(identifiers)
+        start = self._size
+        self._reserve(n_new)
+        new_rows = slice(start, start + n_new)
+
+        self._columns["identifier"][new_rows] = identifiers
+        for name in ("date", "amount", "account", "category", "counterpart"):
+            self._columns[name][new_rows] = columns[name]
+        self._columns["note"][new_rows] = [self._intern(note) for note in columns["note"]]
+        self._columns["loaded"][new_rows] = True
+
+        self._size += n_new
+        n_rows = len(self._rows)
+        self._rows.update(zip(identifiers, range(start, start + n_new)))
+        assert len(self._rows) == n_rows + n_new, "identifiers are stored already"
+        self._drop_indexes()  # rebuilding them from the columns is faster than adding many transactions one by one
+
+    def columns(self) -> dict[str, np.ndarray]:
+        """
+        Returns copies of the columns of the stored transactions, in order. Notes are returned as a list of strings.
+        All transactions must be loaded.
+        """
+        used = self._columns["identifier"][:self._size] != DELETED
+        assert self._columns["loaded"][:self._size][used].all(), "not all transactions are loaded"
+
+        columns = {name: self._columns[name][:self._size][used] for name in self.column_dtypes if name != "loaded"}
+        notes = self._notes
+        columns["note"] = [notes[index] for index in columns["note"].tolist()]
+        return columns
+
+    def find(self,
+             start: Optional[datetime.date] = None,
+             end: Optional[datetime.date] = None,
+             **references: int,
+             ) -> list[int]:
+        """
+        Returns the identifiers of the loaded transactions that match all criteria, in order.
+        :param start: first date of the transactions, if given
+        :param end: last date of the transactions (inclusive), if given
+        :param references: identifier per reference column (account, category, counterpart) that should match,
+            NULL_REFERENCE selects the transactions without reference
+        """
+        candidates = None  # type: Optional[set[int]]
+        # intersect starting from the smallest set of matches
+        for name, referenced in sorted(references.items(),
+                                       key=lambda item: len(self._reference_index(item[0]).get(item[1], ()))):
+            matches = self._reference_index(name).get(referenced, set())
+            candidates = matches if candidates is None else candidates & matches
+
+        if start is not None or end is not None:
+            ordinals, identifiers = self._sorted_dates()
+            first = bisect_left(ordinals, start.toordinal()) if start is not None else 0
+            last = bisect_right(ordinals, end.toordinal()) if end is not None else len(ordinals)
+            selected = identifiers[first:last]
+            if candidates is not None:
+                selected = [identifier for identifier in selected if identifier in candidates]
+        elif candidates is not None:
+            selected = candidates
+        else:
+            return self._columns["identifier"][:self._size][self._columns["loaded"][:self._size]].tolist()
+        return sorted(selected, key=self._rows.__getitem__)
+
+    def total_amount(self, identifiers: Optional[Iterable[int]] = None) -> int:
+        """Returns the sum of the amounts of the given transactions in cents, of all loaded transactions if None"""
+        amounts = self._columns["amount"][:self._size]
+        if identifiers is None:
+            return int(amounts[self._columns["loaded"][:self._size]].sum())
+        rows = np.fromiter((self._rows[identifier] for identifier in identifiers), dtype=np.int64)
+        return int(amounts[rows].sum())
+
+    def unloaded_identifiers(self) -> list[int]:
+        identifiers = self._columns["identifier"][:self._size]
+        unloaded = ~self._columns["loaded"][:self._size] & (identifiers != DELETED)
+        return identifiers[unloaded].tolist()
+
+    def _sorted_dates(self) -> tuple[list[int], list[int]]:
+        if self._date_index is None:
+            loaded = self._columns["loaded"][:self._size]
+            dates = self._columns["date"][:self._size][loaded]
+            order = np.argsort(dates, kind="stable")
+            self._date_index = dates[order].tolist(), self._columns["identifier"][:self._size][loaded][order].tolist()
+        return self._date_index
+
+    def _reference_index(self, name: str) -> dict[int, set[int]]:
+        index = self._reference_indexes.get(name)
+        if index is None:
+            loaded = self._columns["loaded"][:self._size]
+            references = self._columns[name][:self._size][loaded]
+            order = np.argsort(references, kind="stable")
+            referenced, starts = np.unique(references[order], return_index=True)
+            groups = np.split(self._columns["identifier"][:self._size][loaded][order], starts[1:])
+            index = self._reference_indexes[name] = {
+                value: set(group.tolist()) for value, group in zip(referenced.tolist(), groups)
+            }
+        return index
+
+    def _index(self, identifier: int, row: int) -> None:
+        """Adds a loaded transaction to the indexes that were built"""
+        for name in ("date", *self.reference_collections):
+            self._index_value(name, identifier, row)
+
+    def _unindex(self, identifier: int, row: int) -> None:
+        """Removes a transaction from the indexes that were built, if it was loaded"""
+        if self._columns["loaded"][row]:
+            for name in ("date", *self.reference_collections):
+                self._unindex_value(name, identifier, row)
+
+    def _index_value(self, name: str, identifier: int, row: int) -> None:
+        value = int(self._columns[name][row])
+        if name == "date" and self._date_index is not None:
+            ordinals, identifiers = self._date_index
+            position = bisect_right(ordinals, value)
+            ordinals.insert(position, value)
+            identifiers.insert(position, identifier)
+        elif name in self._reference_indexes:
+            self._reference_indexes[name].setdefault(value, set()).add(identifier)
+
+    def _unindex_value(self, name: str, identifier: int, row: int) -> None:
+        value = int(self._columns[name][row])
+        if name == "date" and self._date_index is not None:
+            ordinals, identifiers = self._date_index
+            position = identifiers.index(identifier, bisect_left(ordinals, value), bisect_right(ordinals, value))
+            del ordinals[position]
+            del identifiers[position]
+        elif name in self._reference_indexes:
+            index = self._reference_indexes[name]
+            index[value].discard(identifier)
+            if not index[value]:
+                del index[value]
+
+    def _drop_indexes(self) -> None:
+        self._date_index = None
+        self._reference_indexes.clear()
+
+    def _row_for(self, identifier: int) -> int:
+        """Returns the row of a transaction, appending a row for new identifiers"""
+        row = self._rows.get(identifier)
+        if row is None:
+            self._reserve(1)
+            row = self._rows[identifier] = self._size
+            self._columns["identifier"][row] = identifier
+            self._columns["loaded"][row] = False
+            self._size += 1
+        return row
+
+    def _reserve(self, n_rows: int) -> None:
+        """Makes sure n_rows more rows fit in the arrays, growing them geometrically"""
+        capacity = len(self._columns["identifier"])
+        if self._size + n_rows <= capacity:
+            return
+
+        capacity = max(2 * capacity, self._size + n_rows)
+        for name, column in self._columns.items():
+            grown = np.empty(capacity, dtype=column.dtype)
+            grown[:self._size] = column[:self._size]
+            self._columns[name] = grown
+
+    def _compact(self) -> None:
+        """Drops the rows of deleted transactions"""
+        used = self._columns["identifier"][:self._size] != DELETED
+        capacity = max(self.min_capacity, 2 * int(used.sum()))
+        for name, column in self._columns.items():
+            compacted = np.empty(capacity, dtype=column.dtype)
+            kept = column[:self._size][used]
+            compacted[:len(kept)] = kept
+            self._columns[name] = compacted
+
+        self._size = len(self._rows)
+        self._n_deleted = 0
+        self._rows = dict(zip(self._columns["identifier"][:self._size].tolist(), range(self._size)))
+
+    def _intern(self, note: str) -> int:
+        index = self._note_indices.get(note)
+        if index is None:
+            index = self._note_indices[note] = len(self._notes)
+            self._notes.append(note)
+        return index
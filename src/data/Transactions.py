@@ -1,18 +1,52 @@
 import datetime
 from decimal import Decimal
 from enum import StrEnum, IntEnum
-from typing import TYPE_CHECKING, TypeAlias, Any
+from typing import TYPE_CHECKING, TypeAlias, Any, Callable, Iterable, Optional
 
 from src.data.BankAccount import BankAccount
 from src.data.CounterParts import CounterPart
 from src.data.Currencies import Currencies
+from src.data.Money import Money
 if TYPE_CHECKING:
     from src.data.Projects import Project
-from src.data.TaggedItems import TaggedItems, TaggedItem
+    from src.data.settings.AppSettings import AppSettings
+from src.data.settings.GeneralSettings import GeneralSettingKeys
+from src.data.TaggedItems import ChangeKinds, TaggedItems, TaggedItem
 from src.data.TransactionCategories import TransactionCategory
+from src.data.TransactionStore import NULL_REFERENCE, TransactionStore, encode_amount
+
+
+def _stored_field(name: str) -> property:
+    """Attribute of a transaction, held by the transaction itself until it is stored in a TransactionStore"""
+    def get_field(transaction: "Transaction") -> Any:
+        if transaction._store is None:
+            return transaction._values[name]
+        return transaction._store.field(transaction.identifier, name)
+
+    def set_field(transaction: "Transaction", value: Any) -> None:
+        if transaction._store is None:
+            transaction._values[name] = value
+        else:
+            transaction._store.set_field(transaction.identifier, name, value)
+
+    return property(get_field, set_field)
 
 
 class Transaction(TaggedItem):
+    """
+    Transactions of a project are stored as rows of its TransactionStore, Transaction objects are views on these rows
+    that are created on demand. A new transaction holds its own values until it is added to the project.
+    Amounts are stored in cents, amounts with more decimals are rounded.
+    """
+
+    __slots__ = ("_store", "_values")
+
+    date = _stored_field("date")
+    counterpart = _stored_field("counterpart")
+    amount = _stored_field("amount")
+    account = _stored_field("account")
+    category = _stored_field("category")
+    note = _stored_field("note")
 
     def __init__(self,
                  project: "Project",
@@ -43,12 +77,44 @@ class Transaction(TaggedItem):
             account = list(project.bank_accounts.values())[0]
 
         #
-        self.date = date
-        self.counterpart = counterpart
-        self.amount = amount
-        self.account = account
-        self.category = category
-        self.note = note
+        self._store = None  # type: Optional[TransactionStore]
+        self._values = {
+            "date": date,
+            "counterpart": counterpart,
+            "amount": amount,
+            "account": account,
+            "category": category,
+            "note": note,
+        }  # type: Optional[dict[str, Any]]
+
+    @classmethod
+    def view(cls, project: "Project", identifier: int, store: TransactionStore) -> "Transaction":
+        """Returns a view on a stored transaction"""
+        transaction = cls.__new__(cls)
+        transaction.project = project
+        transaction.identifier = identifier
+        transaction._store = store
+        transaction._values = None
+        return transaction
+
+    @property
+    def is_detached(self) -> bool:
+        """True when the transaction holds its own values, i.e. it is not part of a store"""
+        return self._store is None
+
+    def attach(self, store: TransactionStore) -> None:
+        """Turns the transaction into a view on its row in store, to be called once its values are stored"""
+        self._store = store
+        self._values = None
+
+    def __eq__(self, other: object) -> bool:
+        # Views are created on demand, views on the same row are equal
+        if self._store is None or not isinstance(other, Transaction):
+            return self is other
+        return self._store is other._store and self.identifier == other.identifier
+
+    def __hash__(self) -> int:
+        return hash(self.identifier)
 
     def json_dict(self) -> dict[str, Any]:
         return {
@@ -83,6 +149,193 @@ class Transaction(TaggedItem):
 
 
 class Transactions(TaggedItems[Transaction]):
-    pass
+    """
+    Transactions are kept in a columnar TransactionStore instead of as objects.
+    Filters and aggregates over many transactions should use the columns of the store rather than iterate over
+    Transaction views.
+    """
+
+    # Attribute of a transaction that refers to items of each type
+    reference_names = {
+        BankAccount: "account",
+        TransactionCategory: "category",
+        CounterPart: "counterpart",
+    }
+
+    def __init__(self,
+                 project: "Project",
+                 settings: "AppSettings",
+                 factory: type[Transaction],
+                 ):
+        super().__init__(project=project, settings=settings, factory=factory)
+        self._data = TransactionStore(project=project, factory=factory)  # type: TransactionStore
+
+        # Identifiers of lazily loaded transactions per year, see load_years_lazily
+        self._unloaded_years = {}  # type: dict[int, list[int]]
+
+    def load_years_lazily(self,
+                          identifiers_by_year: dict[int, list[int]],
+                          loader: Callable[[list[int]], dict[int, dict[str, Any]]],
+                          ) -> None:
+        """
+        Registers transactions without building them, like load_lazily, grouped by the year they are dated in.
+        Allows between() to only load the years in the requested date range.
+        """
+        for year in sorted(identifiers_by_year):
+            self.load_lazily(identifiers=identifiers_by_year[year], loader=loader)
+            self._unloaded_years[year] = identifiers_by_year[year]
+
+    def between(self, start: datetime.date, end: datetime.date) -> list[Transaction]:
+        """Returns the transactions dated from start up to and including end, in order"""
+        return self.find(start=start, end=end)
+
+    def find(self,
+             start: Optional[datetime.date] = None,
+             end: Optional[datetime.date] = None,
+             account: Optional[BankAccount] = None,
+             category: Optional[TransactionCategory] = None,
+             counterpart: Optional[CounterPart] = None,
+             ) -> list[Transaction]:
+        """
+        Returns the transactions matching all given criteria, in order, e.g. the transactions of an account in a month.
+        Uses the indexes of the store rather than checking every transaction.
+        :param start: first date of the transactions, if given
+        :param end: last date of the transactions (inclusive), if given
+        """
+        self._load_for_dates(start, end)
+        references = {name: item.identifier for name, item in (("account", account),
+                                                                ("category", category),
+                                                                ("counterpart", counterpart),
+                                                                ) if item is not None}
+        return [self._data[identifier] for identifier in self._data.find(start=start, end=end, **references)]
+
+    def total(self,
+              start: Optional[datetime.date] = None,
+              end: Optional[datetime.date] = None,
+              account: Optional[BankAccount] = None,
+              category: Optional[TransactionCategory] = None,
+              counterpart: Optional[CounterPart] = None,
+              ) -> Money:
+        """
+        Returns the sum of the amounts of the transactions matching all given criteria, see find.
+        Sums the amount column of the store, without creating Transaction views or Decimals.
+        """
+        self._load_for_dates(start, end)
+        references = {name: item.identifier for name, item in (("account", account),
+                                                                ("category", category),
+                                                                ("counterpart", counterpart),
+                                                                ) if item is not None}
+        identifiers = None  # all transactions
+        if start is not None or end is not None or references:
+            identifiers = self._data.find(start=start, end=end, **references)
+        return Money(self._data.total_amount(identifiers), self.currency)
+
+    def balance(self, account: BankAccount, date: Optional[datetime.date] = None) -> Money:
+        """Returns the balance of an account at the end of date, or after all transactions if date is None"""
+        return self.total(end=date, account=account)
+
+    @property
+    def currency(self) -> Currencies:
+        return Currencies(self._settings.general[GeneralSettingKeys.CURRENCY].value)
+
+    def _load_for_dates(self, start: Optional[datetime.date], end: Optional[datetime.date]) -> None:
+        """Loads the transactions that may be dated from start up to and including end"""
+        n_unloaded_by_year = sum(len(identifiers) for identifiers in self._unloaded_years.values())
+        if start is None or end is None or self._n_unloaded > n_unloaded_by_year:
+            self._materialize_all()  # not all unloaded transactions are known by year
+            return
+
+        for year in range(start.year, end.year + 1):
+            unloaded = [identifier for identifier in self._unloaded_years.pop(year, [])
+                        if identifier in self._data and not self._data.is_loaded(identifier)]
+            if unloaded:
+                self._materialize(unloaded)
+
+    def replace_references(self, item: TaggedItem, replacement: Optional[TaggedItem] = None) -> list[int]:
+        """
+        Makes the transactions that refer to item refer to replacement instead, or to nothing if replacement is None.
+        E.g. before deleting item, or to merge item into replacement. Only the referencing transactions are visited.
+        :return: identifiers of the changed transactions, in order
+        """
+        name = self.reference_names.get(type(item))
+        if name is None:
+            return []
+
+        self._materialize_all()  # only loaded transactions are indexed
+        identifiers = self._data.find(**{name: item.identifier})
+        if identifiers and self._recording:
+            self.undo_log.record_update(self, tuple(identifiers), name, (item,) * len(identifiers), replacement)
+        with self._changing(identifiers):
+            for identifier in identifiers:
+                self._data.set_field(identifier, name, replacement)
+                self._mark_upserted(identifier)
+        if identifiers:
+            self._publish(ChangeKinds.UPDATED, tuple(identifiers), (name,))
+        return identifiers
+
+    def field(self, identifier: int, name: str) -> Any:
+        """Returns a single attribute of a transaction, read from the store without creating a Transaction view"""
+        if not self._data.is_loaded(identifier):
+            self._materialize([identifier])
+        return self._data.field(identifier, name)
+
+    def columns(self) -> dict[str, Any]:
+        """Returns the columns of all transactions, see TransactionStore.columns"""
+        self._materialize_all()
+        return self._data.columns()
+
+    def load_columns(self, columns: dict[str, Any]) -> None:
+        """
+        Adds transactions from columns as returned by columns(), without creating Transaction objects.
+        References to accounts, categories and counterparts are resolved when they are read.
+        Like load_item, loading is not a change and is not published.
+        """
+        identifiers = columns["identifier"].tolist()
+        with self._changing(identifiers):
+            self._data.extend(identifiers, columns)
+            self._json_dict_cache = None
+        if identifiers:
+            self.reserve_identifiers(max(identifiers) + 1)
+
+    def bulk_create(self, json_dicts: Iterable[dict[str, Any]]) -> list[Transaction]:
+        """Creates a transaction for every json dict, with consecutive new identifiers, directly in the store"""
+        json_dicts = list(json_dicts)
+        first_identifier = self._next_identifier
+        identifiers = range(first_identifier, first_identifier + len(json_dicts))
+
+        def references(key: str, default: int = NULL_REFERENCE) -> list[int]:
+            return [json_dict[key] if json_dict[key] is not None else default for json_dict in json_dicts]
+
+        # Like the Transaction constructor, transactions without account are assigned the first account
+        default_account = next(iter(self._project.bank_accounts.keys()), NULL_REFERENCE)
+        columns = {
+            "date": [datetime.date.fromisoformat(json_dict["date"]).toordinal() for json_dict in json_dicts],
+            "amount": [Money.from_string(json_dict["amount"]).cents for json_dict in json_dicts],
+            "account": references("account", default=default_account),
+            "category": references("category"),
+            "counterpart": references("counterpart"),
+            "note": [json_dict["note"] for json_dict in json_dicts],
+        }
+        with self._changing():
+            self._data.extend(identifiers, columns)
+            self._next_identifier = first_identifier + len(json_dicts)
+            self._upserted_ids.update(identifiers)
+            self._json_dict_cache = None
+        self._publish(ChangeKinds.INSERTED, tuple(identifiers))
+        if self._recording:
+            self.undo_log.record_insert(self, tuple(identifiers))
+        return [self._data[identifier] for identifier in identifiers]
+
+    def _materialize_all(self, batch_size: int = 500) -> None:
+        if not self._n_unloaded:
+            return
+
+        unloaded = self._data.unloaded_identifiers()
+        for start in range(0, len(unloaded), batch_size):
+            self._materialize(unloaded[start:start + batch_size])
+
+    def clear(self) -> None:
+        super().clear()
+        self._unloaded_years.clear()
 
 
@@ -15,6 +15,7 @@ class TransactionCSVColumns(StrEnum):
 
 
 class TransactionsCSVReader(TaggedItem):
+    __slots__ = ("name", "column_map")
 
     def __init__(self, project: "Project",
                  identifier: int,
@@ -0,0 +1,281 @@
+import sys
+from contextlib import contextmanager
+from typing import TYPE_CHECKING, Any, Callable, Iterator, Optional
+
+from src.data.settings.GeneralSettings import GeneralSettingKeys
+
+if TYPE_CHECKING:
+    from src.data.settings.AppSettings import AppSettings
+    from src.data.TaggedItems import TaggedItems
+
+
+class _Update:
+    """One attribute of one or more items was set to the same new value"""
+
+    __slots__ = ("items", "identifiers", "field", "old_values", "new_value")
+
+    def __init__(self,
+                 items: "TaggedItems",
+                 identifiers: tuple[int, ...],
+                 field: str,
+                 old_values: tuple[Any, ...],
+                 new_value: Any,
+                 ) -> None:
+        self.items = items
+        self.identifiers = identifiers
+        self.field = field
+        self.old_values = old_values  # per identifier
+        self.new_value = new_value
+
+    def undo(self) -> None:
+        for identifier, old_value in zip(self.identifiers, self.old_values):
+            self.items.update_item(self.items[identifier], **{self.field: old_value})
+
+    def redo(self) -> None:
+        for identifier in self.identifiers:
+            self.items.update_item(self.items[identifier], **{self.field: self.new_value})
+
+    def size(self) -> int:
+        distinct_old_values = {id(value): value for value in self.old_values}.values()
+        return (200 + 16 * len(self.identifiers) + sys.getsizeof(self.new_value)
+                + sum(sys.getsizeof(value) for value in distinct_old_values))
+
+
+class _Insert:
+    """Items were created. Their json dicts are only kept once the creation is undone, to be able to redo it."""
+
+    __slots__ = ("items", "identifiers", "json_dicts")
+
+    def __init__(self, items: "TaggedItems", identifiers: tuple[int, ...]) -> None:
+        self.items = items
+        self.identifiers = identifiers
+        self.json_dicts = None  # type: Optional[list[dict[str, Any]]]
+
+    def undo(self) -> None:
+        self.json_dicts = [self.items[identifier].json_dict() for identifier in self.identifiers]
+        for identifier in reversed(self.identifiers):
+            self.items.delete_item(self.items[identifier])
+
+    def redo(self) -> None:
+        for identifier, json_dict in zip(self.identifiers, self.json_dicts):
+            self.items.create_new_item(identifier=identifier, json_dict=json_dict)
+        self.json_dicts = None
+
+    def size(self) -> int:
+        size = 200 + 8 * len(self.identifiers)
+        if self.json_dicts is not None:
+            size += sum(_json_size(json_dict) for json_dict in self.json_dicts)
+        return size
+
+
+class _Delete:
+    """An item was deleted"""
+
+    __slots__ = ("items", "identifier", "json_dict")
+
+    def __init__(self, items: "TaggedItems", identifier: int, json_dict: dict[str, Any]) -> None:
+        self.items = items
+        self.identifier = identifier
+        self.json_dict = json_dict
+
+    def undo(self) -> None:
+        self.items.create_new_item(identifier=self.identifier, json_dict=self.json_dict)
+
+    def redo(self) -> None:
+        self.items.delete_item(self.items[self.identifier])
+
+    def size(self) -> int:
+        return 200 + _json_size(self.json_dict)
+
+
+def _json_size(json_dict: dict[str, Any]) -> int:
+    return sys.getsizeof(json_dict) + sum(sys.getsizeof(value) for value in json_dict.values())
+
+
+class UndoEntry:
+    """Changes that are undone and redone together"""
+
+    __slots__ = ("changes", "size")
+
+    def __init__(self) -> None:
+        self.changes = []  # type: list[_Update | _Insert | _Delete]
+        self.size = 0  # estimated memory usage in bytes
+
+    def update_size(self) -> None:
+        self.size = 100 + sum(change.size() for change in self.changes)
+
+    def affected_items(self) -> dict["TaggedItems", Optional[set[int]]]:
+        """
+        Returns the collections changed by the entry, with the identifiers of the updated items.
+        None instead of identifiers means that items were created or deleted.
+        """
+        affected = {}  # type: dict[TaggedItems, Optional[set[int]]]
+        for change in self.changes:
+            if isinstance(change, _Update) and affected.get(change.items, set()) is not None:
+                affected.setdefault(change.items, set()).update(change.identifiers)
+            else:
+                affected[change.items] = None
+        return affected
+
+
+class UndoLog:
+    """
+    Changes made to the collections of a project, which can be undone and redone.
+
+    Collections record their changes as field-level deltas: the old and new value of a single attribute rather than
+    a copy of the complete item. Only deleted items are kept as json dicts. Changes recorded within group() are
+    undone as a single entry, as are bulk changes such as TaggedItems.bulk_create or Transactions.replace_references.
+    Consecutive edits of the same attribute of the same item are merged into one entry.
+
+    Once the estimated memory usage of all entries exceeds the limit from the settings, the oldest entries are dropped.
+    """
+
+    def __init__(self, settings: "AppSettings") -> None:
+        self._settings = settings
+
+        self._undo_entries = []  # type: list[UndoEntry]
+        self._redo_entries = []  # type: list[UndoEntry]
+        self._size = 0  # estimated memory usage of all entries, in bytes
+
+        self._group = None  # type: Optional[UndoEntry]
+        self._group_depth = 0
+        self._applying = False  # set while undoing or redoing, the collections' changes are not recorded then
+        self._can_merge = False  # False once the last entry was undone or redone
+
+        # Called after a change was recorded or the log was cleared, i.e. whenever can_undo or can_redo may have
+        # changed other than by undo() and redo() themselves
+        self.state_changed_callback = None  # type: Optional[Callable[[], None]]
+
+    @property
+    def is_recording(self) -> bool:
+        return not self._applying
+
+    @property
+    def can_undo(self) -> bool:
+        return bool(self._undo_entries)
+
+    @property
+    def can_redo(self) -> bool:
+        return bool(self._redo_entries)
+
+    @property
+    def size(self) -> int:
+        """Estimated memory usage of the entries in bytes"""
+        return self._size
+
+    @contextmanager
+    def group(self) -> Iterator[None]:
+        """Changes made within the context are undone as a single entry, groups can be nested"""
+        if self._group_depth == 0:
+            self._group = UndoEntry()
+        self._group_depth += 1
+        try:
+            yield
+        finally:
+            self._group_depth -= 1
+            if self._group_depth == 0:
+                entry, self._group = self._group, None
+                if entry.changes:
+                    self._push(entry)
+
+    def record_update(self,
+                      items: "TaggedItems",
+                      identifiers: tuple[int, ...],
+                      field: str,
+                      old_values: tuple[Any, ...],
+                      new_value: Any,
+                      ) -> None:
+        self._record(_Update(items, identifiers, field, old_values, new_value))
+
+    def record_insert(self, items: "TaggedItems", identifiers: tuple[int, ...]) -> None:
+        self._record(_Insert(items, identifiers))
+
+    def record_delete(self, items: "TaggedItems", identifier: int, json_dict: dict[str, Any]) -> None:
+        self._record(_Delete(items, identifier, json_dict))
+
+    def undo(self) -> dict["TaggedItems", Optional[set[int]]]:
+        """Undoes the last entry and returns the affected items, see UndoEntry.affected_items"""
+        entry = self._undo_entries.pop()
+        self._apply(entry, undo=True)
+        self._redo_entries.append(entry)
+        return entry.affected_items()
+
+    def redo(self) -> dict["TaggedItems", Optional[set[int]]]:
+        """Redoes the last undone entry and returns the affected items, see UndoEntry.affected_items"""
+        entry = self._redo_entries.pop()
+        self._apply(entry, undo=False)
+        self._undo_entries.append(entry)
+        return entry.affected_items()
+
+    def clear(self) -> None:
+        self._undo_entries.clear()
+        self._redo_entries.clear()
+        self._size = 0
+        self._can_merge = False
+        self._notify_state_changed()
+
+    def _apply(self, entry: UndoEntry, undo: bool) -> None:
+        self._applying = True
+        try:
+            if undo:
+                for change in reversed(entry.changes):
+                    change.undo()
+            else:
+                for change in entry.changes:
+                    change.redo()
+        finally:
+            self._applying = False
+
+        # Undoing a creation keeps the json dicts of the created items
+        self._size -= entry.size
+        entry.update_size()
+        self._size += entry.size
+        self._can_merge = False
+
+    def _record(self, change: _Update | _Insert | _Delete) -> None:
+        if self._group is not None:
+            self._group.changes.append(change)
+            return
+
+        entry = UndoEntry()
+        entry.changes.append(change)
+        self._push(entry)
+
+    def _push(self, entry: UndoEntry) -> None:
+        for redo_entry in self._redo_entries:
+            self._size -= redo_entry.size
+        self._redo_entries.clear()
+
+        if not (self._can_merge and self._merge(entry)):
+            entry.update_size()
+            self._undo_entries.append(entry)
+            self._size += entry.size
+            self._can_merge = True
+
+            memory_limit = self._settings.general[GeneralSettingKeys.UNDO_MEMORY_LIMIT].value * 1024 * 1024
+            while self._size > memory_limit and len(self._undo_entries) > 1:
+                self._size -= self._undo_entries.pop(0).size
+        self._notify_state_changed()
+
+    def _notify_state_changed(self) -> None:
+        if self.state_changed_callback is not None:
+            self.state_changed_callback()
+
+    def _merge(self, entry: UndoEntry) -> bool:
+        """Merges an edit of a single attribute into the previous entry if that edited the same attribute"""
+        last_entry = self._undo_entries[-1] if self._undo_entries else None
+        if last_entry is None or len(entry.changes) != 1 or len(last_entry.changes) != 1:
+            return False
+
+        change, last_change = entry.changes[0], last_entry.changes[0]
+        if not (isinstance(change, _Update) and isinstance(last_change, _Update)):
+            return False
+        if (change.items is not last_change.items or change.field != last_change.field
+                or change.identifiers != last_change.identifiers or len(change.identifiers) != 1):
+            return False
+
+        last_change.new_value = change.new_value
+        self._size -= last_entry.size
+        last_entry.update_size()
+        self._size += last_entry.size
+        return True
@@ -46,3 +46,18 @@ class DateFormats(StrEnum):
 date_formats = {
     date_format: date_format for date_format in DateFormats
 }
+
+
+class ProjectStorages(StrEnum):
+    JSON = "json"  # project.json snapshot plus journal of changes
+    SQLITE = "sqlite"  # project.sqlite database
+    JSON_NUMPY = "json_numpy"  # project.json snapshot with transactions stored as binary columns, plus journal
+    JSON_SHARDED = "json_sharded"  # project.json with transactions in one file per year, loaded when accessed
+
+
+project_storages = {
+    ProjectStorages.JSON: "JSON (project.json)",
+    ProjectStorages.SQLITE: "SQLite (project.sqlite)",
+    ProjectStorages.JSON_NUMPY: "JSON with binary transaction columns (NumPy)",
+    ProjectStorages.JSON_SHARDED: "JSON with transactions per year (lazy loading)",
+}
@@ -13,12 +13,18 @@ from src.data.settings.ComboBoxChoices import (
     DebugLevels,
     application_styles,
     debug_levels, currencies, date_formats, DateFormats,
+    ProjectStorages,
+    project_storages,
 )
 
 
 class GeneralSubGroups(StrEnum):
     DEBUG = "debug"
     STYLE = "style"
+    STORAGE = "storage"
+    AUTOSAVE = "autosave"
+    UNDO = "undo"
+    TABLES = "tables"
 
 
 class GeneralSettings(SettingsGroup):
@@ -29,6 +35,10 @@ class GeneralSettings(SettingsGroup):
         self._setting_subgroups = {
             GeneralSubGroups.DEBUG: DebugSettings(self._app_settings),
             GeneralSubGroups.STYLE: StyleSettings(self._app_settings),
+            GeneralSubGroups.STORAGE: StorageSettings(self._app_settings),
+            GeneralSubGroups.AUTOSAVE: AutosaveSettings(self._app_settings),
+            GeneralSubGroups.UNDO: UndoSettings(self._app_settings),
+            GeneralSubGroups.TABLES: TableSettings(self._app_settings),
         }
 
 
@@ -78,8 +88,109 @@ class StyleSettings(SettingsSubGroup):
         self._settings = {setting.key: setting for setting in settings}
 
 
+class StorageSettings(SettingsSubGroup):
+    group_key = SettingGroups.GENERAL
+    subgroup_key = GeneralSubGroups.STORAGE
+    text = "Storage"
+
+    def _init_settings(self) -> None:
+        settings = [
+            ComboBoxSetting(
+                key=GeneralSettingKeys.PROJECT_STORAGE,
+                text="Storage format of new projects",
+                choices=project_storages,
+                default=ProjectStorages.JSON,
+            ),
+            BoolSetting(
+                key=GeneralSettingKeys.PROJECT_CACHE,
+                text="Cache opened projects for faster reopening",
+                default=True,
+            ),
+        ]
+        self._settings = {setting.key: setting for setting in settings}
+
+
+class AutosaveSettings(SettingsSubGroup):
+    group_key = SettingGroups.GENERAL
+    subgroup_key = GeneralSubGroups.AUTOSAVE
+    text = "Autosave"
+
+    def _init_settings(self) -> None:
+        settings = [
+            BoolSetting(
+                key=GeneralSettingKeys.AUTOSAVE_ENABLED,
+                text="Save changes automatically",
+                default=True,
+            ),
+            IntSetting(
+                key=GeneralSettingKeys.AUTOSAVE_DELAY,
+                text="Save after no changes for (seconds)",
+                _min=1,
+                _max=600,
+                default=3,
+            ),
+            IntSetting(
+                key=GeneralSettingKeys.AUTOSAVE_MIN_INTERVAL,
+                text="Save a project at most once every (seconds)",
+                _min=1,
+                _max=3600,
+                default=30,
+            ),
+        ]
+        self._settings = {setting.key: setting for setting in settings}
+
+
+class UndoSettings(SettingsSubGroup):
+    group_key = SettingGroups.GENERAL
+    subgroup_key = GeneralSubGroups.UNDO
+    text = "Undo"
+
+    def _init_settings(self) -> None:
+        settings = [
+            IntSetting(
+                key=GeneralSettingKeys.UNDO_MEMORY_LIMIT,
+                text="Memory for undoing changes, per project (MB)",
+                _min=1,
+                _max=1024,
+                default=32,
+            ),
+        ]
+        self._settings = {setting.key: setting for setting in settings}
+
+
+class TableSettings(SettingsSubGroup):
+    group_key = SettingGroups.GENERAL
+    subgroup_key = GeneralSubGroups.TABLES
+    text = "Tables"
+
+    def _init_settings(self) -> None:
+        settings = [
+            IntSetting(
+                key=GeneralSettingKeys.TABLE_BATCH_SIZE,
+                text="Rows added to a table at once while scrolling",
+                _min=100,
+                _max=100000,
+                default=1000,
+            ),
+            BoolSetting(
+                key=GeneralSettingKeys.TABLE_NEWEST_FIRST,
+                text="Show the most recently added items first",
+                default=False,
+            ),
+        ]
+        self._settings = {setting.key: setting for setting in settings}
+
+
 class GeneralSettingKeys(StrEnum):
     DEBUG_LEVEL = "debug_level"
     APPLICATION_STYLE = "application_style"
     CURRENCY="currency"
     DATE_FORMAT = "date_format"
+    PROJECT_STORAGE = "project_storage"
+    PROJECT_CACHE = "project_cache"
+    AUTOSAVE_ENABLED = "autosave_enabled"
+    AUTOSAVE_DELAY = "autosave_delay"
+    AUTOSAVE_MIN_INTERVAL = "autosave_min_interval"
+    UNDO_MEMORY_LIMIT = "undo_memory_limit"
+    TABLE_BATCH_SIZE = "table_batch_size"
+    TABLE_NEWEST_FIRST = "table_newest_first"
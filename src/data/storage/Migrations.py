@@ -0,0 +1,146 @@
+import itertools
+from functools import partial
+from typing import Any, Callable, Iterable, Iterator, Optional, TypeAlias
+
+# Version of the project format written by this version of the application.
+# Files without a version were written before the format was versioned, they are version 0.
+FORMAT_VERSION = 2
+FORMAT_VERSION_KEY = "format_version"  # first key of project.json
+NEXT_IDENTIFIERS_KEY = "next_identifiers"  # key of project.json holding the next identifier of every collection
+
+# Items of a collection as a dict of lists, one list per field, all lists holding one value per item.
+# Migrations transform complete columns at once instead of patching items one by one.
+ItemColumns: TypeAlias = dict[str, list[Any]]
+
+
+class _Missing:
+    """Value of fields that an item does not have"""
+
+    def __repr__(self) -> str:
+        return "MISSING"
+
+
+MISSING = _Missing()
+
+
+def _fill_missing(columns: ItemColumns, n_items: int, defaults: dict[str, Any]) -> None:
+    """Adds fields that older files may lack, with their default value"""
+    for field, default in defaults.items():
+        column = columns.setdefault(field, [MISSING] * n_items)
+        columns[field] = [default if value is MISSING else value for value in column]
+
+
+# MIGRATIONS[i] upgrades collections from version i to version i + 1, per collection key.
+# A transform is called with the columns of a collection and the number of items in it.
+MIGRATIONS = [
+    {
+        "transaction_categories": partial(_fill_missing, defaults={"note": ""}),
+        "bank_accounts": partial(_fill_missing, defaults={"iban": None, "note": ""}),
+        "counterparts": partial(_fill_missing, defaults={"iban": None, "note": ""}),
+        "transactions": partial(_fill_missing, defaults={"counterpart": None, "category": None, "note": ""}),
+    },
+    # Version 2 writes the transactions of project.json as a TransactionTable, items themselves did not change
+    {},
+]  # type: list[dict[str, Callable[[ItemColumns, int], None]]]
+
+assert len(MIGRATIONS) == FORMAT_VERSION
+
+
+def to_columns(items: dict[Any, dict[str, Any]]) -> ItemColumns:
+    """Converts item json dicts to a dict of lists, with MISSING for the fields an item does not have"""
+    fields = {}  # type: dict[str, None]  # ordered set of the fields of all items
+    for item_dict in items.values():
+        fields.update(dict.fromkeys(item_dict))
+    return {field: [item_dict.get(field, MISSING) for item_dict in items.values()] for field in fields}
+
+
+def from_columns(identifiers: list[Any], columns: ItemColumns) -> dict[Any, dict[str, Any]]:
+    """Converts a dict of lists back to item json dicts"""
+    fields = list(columns)
+    return {
+        identifier: {field: value for field, value in zip(fields, values) if value is not MISSING}
+        for identifier, values in zip(identifiers, zip(*columns.values()))
+    }
+
+
+def migrate_collection(collection_key: str,
+                       items: dict[Any, dict[str, Any]],
+                       version: int,
+                       ) -> dict[Any, dict[str, Any]]:
+    """Upgrades the item json dicts of a collection from version to FORMAT_VERSION"""
+    transforms = [migration[collection_key] for migration in MIGRATIONS[version:] if collection_key in migration]
+    if not transforms or not items:
+        return items
+
+    columns = to_columns(items)
+    for transform in transforms:
+        transform(columns, len(items))
+    return from_columns(list(items), columns)
+
+
+def migrating_loader(collection_key: str,
+                     loader: Callable[[list[int]], dict[int, dict[str, Any]]],
+                     version: int,
+                     ) -> Callable[[list[int]], dict[int, dict[str, Any]]]:
+    """Wraps a loader of lazily loaded items (see TaggedItems.load_lazily), so that it returns upgraded items"""
+    if version >= FORMAT_VERSION:
+        return loader
+    return lambda identifiers: migrate_collection(collection_key, loader(identifiers), version)
+
+
+class MigratingEntries:
+    """
+    Upgrades the entries of project.json, as yielded by ProjectJsonReader, to FORMAT_VERSION.
+
+    The version is read from the first entry. Entries of the current version are passed on one by one. Older entries
+    are gathered per collection, so that every collection can be migrated in bulk before any item is built.
+    """
+
+    def __init__(self, entries: Iterable[tuple[str, Optional[str], Any]]) -> None:
+        self._entries = entries
+        self.version = None  # type: Optional[int]  # version of the file, known once iterating has started
+
+    @property
+    def is_outdated(self) -> bool:
+        return self.version is not None and self.version < FORMAT_VERSION
+
+    def __iter__(self) -> Iterator[tuple[str, Optional[str], Any]]:
+        entries = iter(self._entries)
+        first_entry = next(entries, None)
+        if first_entry is None:
+            self.version = FORMAT_VERSION
+            return
+
+        if first_entry[0] == FORMAT_VERSION_KEY:
+            self.version = first_entry[2]
+        else:
+            self.version = 0
+            entries = itertools.chain([first_entry], entries)
+
+        if self.version > FORMAT_VERSION:
+            raise ValueError(f"Project format version {self.version} is newer than the supported version "
+                             f"{FORMAT_VERSION}, please update the application")
+        if self.version == FORMAT_VERSION:
+            yield from entries
+            return
+
+        # Entries of a collection are consecutive
+        collection_key, items = None, {}  # type: Optional[str], dict[str, Any]
+        for key, identifier, value in entries:
+            if key != collection_key:
+                yield from self._migrated(collection_key, items)
+                collection_key, items = key, {}
+            if identifier is None:
+                yield key, identifier, value
+                collection_key = None
+            else:
+                items[identifier] = value
+        yield from self._migrated(collection_key, items)
+
+    def _migrated(self,
+                  collection_key: Optional[str],
+                  items: dict[str, Any],
+                  ) -> Iterator[tuple[str, Optional[str], Any]]:
+        for identifier, item_dict in migrate_collection(collection_key, items, self.version).items():
+            yield collection_key, identifier, item_dict
+
@@ -0,0 +1,59 @@
+import os
+from typing import Any, Callable, Optional
+
+from src.data.storage.ProjectCache import FilesStamp, ProjectCache
+from src.data.storage.ProjectJournal import JournalOverlay, ProjectJournal
+from src.data.storage.ProjectJsonReader import ProjectJsonReader
+
+
+class ParsedProject:
+    """
+    Contents of a project directory, read into plain python objects and ready to be attached to a Project.
+    Holds no Qt objects, so that projects can be read in worker processes.
+    """
+
+    def __init__(self,
+                 project_dir: str,
+                 entries: list[tuple[str, Optional[str], Any]],
+                 overlay: JournalOverlay,
+                 stamp: FilesStamp,
+                 storage_format: Optional[str] = None,
+                 ) -> None:
+        """
+        :param entries: contents of project.json, as yielded by ProjectJsonReader
+        :param overlay: changes journaled after project.json was written
+        :param stamp: size and modification time of the files that were read, see ProjectCache
+        :param storage_format: storage format of the project directory, None to derive it from the entries
+        """
+        self.project_dir = project_dir
+        self.entries = entries
+        self.overlay = overlay
+        self.stamp = stamp
+        self.storage_format = storage_format
+        self.is_cached = False  # True for projects read from the ProjectCache
+
+
+def parse_project(project_dir: str,
+                  progress_callback: Optional[Callable[[int, int], None]] = None,
+                  use_cache: bool = False,
+                  ) -> ParsedProject:
+    """
+    Reads project.json and the journal of a project directory, may run in a worker process.
+    :param use_cache: return the cached project if the files did not change. Projects are cached once they are loaded,
+        see Project._load_project.
+    """
+    cache = ProjectCache() if use_cache else None
+    if cache is not None:
+        parsed = cache.get(project_dir)
+        if parsed is not None:
+            return parsed
+
+    stamp = ProjectCache.files_stamp(project_dir)  # before reading, changes made while reading invalidate the entry
+    filename = os.path.join(project_dir, "project.json")
+    entries = list(ProjectJsonReader(filename, progress_callback=progress_callback)) if os.path.isfile(filename) else []
+    parsed = ParsedProject(project_dir=project_dir,
+                           entries=entries,
+                           overlay=ProjectJournal(project_dir).read_overlay(),
+                           stamp=stamp,
+                           )
+    return parsed
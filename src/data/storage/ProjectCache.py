@@ -0,0 +1,94 @@
+import hashlib
+import logging
+import os
+import pickle
+from typing import TYPE_CHECKING, Optional
+
+from src.data.storage.ProjectJournal import ProjectJournal
+from src.paths import CACHE_DIR
+
+if TYPE_CHECKING:
+    from src.data.storage.ParsedProject import ParsedProject
+
+MAX_CACHE_ENTRIES = 16
+
+# Size and modification time of the files a parsed project is read from, None for files that don't exist
+FilesStamp = tuple[Optional[tuple[int, int]], ...]
+
+
+class ProjectCache:
+    """
+    Cache of parsed project directories, one pickle file per project directory.
+
+    Reopening a project whose project.json and journal did not change since it was cached skips decoding the json.
+    Entries are written from the items of a loaded project, with the journal already applied.
+    An entry is only used as long as the size and modification time of both files match those of the cached entry.
+    At most max_entries entries are kept, the least recently used ones are removed.
+    """
+
+    def __init__(self, cache_dir: Optional[str] = None, max_entries: int = MAX_CACHE_ENTRIES) -> None:
+        """:param cache_dir: directory of the cache entries, CACHE_DIR if None"""
+        self.cache_dir = str(cache_dir if cache_dir is not None else CACHE_DIR)
+        self.max_entries = max_entries
+
+    @staticmethod
+    def files_stamp(project_dir: str) -> FilesStamp:
+        stamp = []
+        for filename in ("project.json", ProjectJournal.filename):
+            try:
+                stat = os.stat(os.path.join(project_dir, filename))
+            except FileNotFoundError:
+                stamp.append(None)
+            else:
+                stamp.append((stat.st_size, stat.st_mtime_ns))
+        return tuple(stamp)
+
+    def _entry_path(self, project_dir: str) -> str:
+        key = hashlib.sha1(os.path.abspath(project_dir).encode("utf-8")).hexdigest()
+        return os.path.join(self.cache_dir, f"{key}.pickle")
+
+    def get(self, project_dir: str) -> Optional["ParsedProject"]:
+        """Returns the cached project, or None if it is not cached or the project files changed since"""
+        path = self._entry_path(project_dir)
+        try:
+            with open(path, "rb") as read_file:
+                parsed = pickle.load(read_file)  # type: ParsedProject
+        except FileNotFoundError:
+            return None
+        except (OSError, pickle.UnpicklingError, EOFError, AttributeError, ImportError) as error:
+            # Written by another version of the application or incomplete, read the project files instead
+            logging.getLogger(__name__).warning(f"Ignoring unreadable cache entry {path}: {error}")
+            return None
+
+        if parsed.project_dir != project_dir or parsed.stamp != self.files_stamp(project_dir):
+            return None
+        parsed.is_cached = True
+
+        os.utime(path)  # most recently used
+        return parsed
+
+    def put(self, parsed: "ParsedProject") -> None:
+        """Caches a parsed project and evicts the least recently used entries"""
+        path = self._entry_path(parsed.project_dir)
+        try:
+            os.makedirs(self.cache_dir, exist_ok=True)
+            with open(f"{path}.tmp", "wb") as write_file:
+                pickle.dump(parsed, write_file, protocol=pickle.HIGHEST_PROTOCOL)
+            os.replace(f"{path}.tmp", path)
+        except OSError as error:
+            logging.getLogger(__name__).warning(f"Failed to cache project {parsed.project_dir}: {error}")
+            return
+        self._evict()
+
+    def _evict(self) -> None:
+        entries = []
+        for entry in os.scandir(self.cache_dir):
+            if entry.name.endswith(".pickle"):
+                entries.append((entry.stat().st_mtime_ns, entry.path))
+        entries.sort(reverse=True)
+
+        for _, path in entries[self.max_entries:]:
+            try:
+                os.remove(path)
+            except FileNotFoundError:
+                pass  # evicted by another process
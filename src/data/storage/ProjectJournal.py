@@ -0,0 +1,156 @@
+import json
+import logging
+import os
+from enum import StrEnum
+from typing import Any, Optional
+
+from src.data.TaggedItems import CollectionChanges
+
+# Once the journal grows beyond this size (in bytes), it is compacted into a fresh project.json snapshot.
+COMPACTION_THRESHOLD = 4 * 1024 * 1024
+
+
+class JournalOperations(StrEnum):
+    UPSERT = "upsert"  # item was created or modified, the entry holds the complete item
+    DELETE = "delete"
+    NEXT_IDENTIFIER = "next_identifier"  # the entry's identifier is the next identifier of the collection
+
+
+class ProjectJournal:
+    """
+    Append-only log of the changes made to a project since its last project.json snapshot.
+
+    Every line of the journal is a json object describing a single created, modified or deleted tagged item.
+    Entries always hold complete items, which makes replaying them idempotent: replaying a journal on top of a
+    snapshot that already contains (part of) its changes yields the same result. This is what makes it safe to
+    compact the journal by writing a new snapshot first and removing the journal afterwards.
+    """
+
+    filename = "project.journal"
+
+    def __init__(self, project_dir: str) -> None:
+        self.project_dir = project_dir
+
+    @property
+    def path(self) -> str:
+        return os.path.join(self.project_dir, self.filename)
+
+    @property
+    def size(self) -> int:
+        """Size of the active journal in bytes"""
+        return os.path.getsize(self.path) if os.path.isfile(self.path) else 0
+
+    def write_changes(self, changes: dict[str, CollectionChanges]) -> None:
+        """Appends the changed items of every collection to the journal"""
+        lines = []
+        for collection_key, (upserts, deletes, next_identifier) in changes.items():
+            for identifier in deletes:
+                lines.append(json.dumps({"collection": collection_key,
+                                         "operation": JournalOperations.DELETE,
+                                         "identifier": identifier,
+                                         }))
+            for identifier, item_dict in upserts.items():
+                lines.append(json.dumps({"collection": collection_key,
+                                         "operation": JournalOperations.UPSERT,
+                                         "identifier": identifier,
+                                         "item": item_dict,
+                                         }))
+            if next_identifier is not None:
+                lines.append(json.dumps({"collection": collection_key,
+                                         "operation": JournalOperations.NEXT_IDENTIFIER,
+                                         "identifier": next_identifier,
+                                         }))
+        if not lines:
+            return
+
+        with open(self.path, "a") as write_file:
+            write_file.write("\n".join(lines) + "\n")
+            write_file.flush()
+            os.fsync(write_file.fileno())
+
+    def read_overlay(self) -> "JournalOverlay":
+        """Reads all journaled changes, to be applied to the items of project.json while they are loaded"""
+        overlay = JournalOverlay()
+        for entry in self._read_entries(self.path):
+            overlay.add_entry(entry)
+        return overlay
+
+    @staticmethod
+    def _read_entries(path: str) -> list[dict[str, Any]]:
+        if not os.path.isfile(path):
+            return []
+
+        entries = []
+        with open(path, "r") as read_file:
+            for line_number, line in enumerate(read_file):
+                if not line.strip():
+                    continue
+                try:
+                    entries.append(json.loads(line))
+                except json.JSONDecodeError:
+                    # Only the last line can be incomplete, e.g. when the application crashed while appending.
+                    logging.getLogger(__name__).warning(
+                        f"Ignoring incomplete journal entry at line {line_number} of {path}"
+                    )
+                    break
+        return entries
+
+    def clear(self) -> None:
+        """Removes the journal, to be called once a snapshot holding all journaled changes has been written."""
+        if os.path.isfile(self.path):
+            os.remove(self.path)
+
+
+class JournalOverlay:
+    """
+    Net result of the journaled changes, per collection.
+    Allows applying the journal to the items of project.json one item at a time, as they are read.
+    """
+
+    def __init__(self) -> None:
+        # Latest json dict of every upserted item, in the order in which they should end up after the snapshot items
+        self._upserts = {}  # type: dict[str, dict[str, dict[str, Any]]]
+        # Items deleted at some point, their snapshot version is discarded
+        self._deleted = {}  # type: dict[str, set[str]]
+        self._next_identifiers = {}  # type: dict[str, int]
+
+    def add_entry(self, entry: dict[str, Any]) -> None:
+        if entry["operation"] == JournalOperations.NEXT_IDENTIFIER:
+            self._next_identifiers[entry["collection"]] = entry["identifier"]
+            return
+
+        upserts = self._upserts.setdefault(entry["collection"], {})
+        deleted = self._deleted.setdefault(entry["collection"], set())
+        identifier = str(entry["identifier"])  # json object keys are strings in project.json
+
+        if entry["operation"] == JournalOperations.UPSERT:
+            upserts[identifier] = entry["item"]
+        elif entry["operation"] == JournalOperations.DELETE:
+            upserts.pop(identifier, None)
+            deleted.add(identifier)
+
+    def apply(self, collection_key: str, identifier: str, item_dict: dict[str, Any]) -> Optional[dict[str, Any]]:
+        """
+        Returns the up-to-date json dict of an item read from project.json, or None if it should be skipped:
+        either it was deleted or it was deleted and created anew, in which case it is part of remaining().
+        """
+        if identifier in self._deleted.get(collection_key, ()):
+            return None
+
+        upserts = self._upserts.get(collection_key, {})
+        if identifier in upserts:
+            return upserts.pop(identifier)  # modified in place
+        return item_dict
+
+    def is_changed(self, collection_key: str, identifier: str) -> bool:
+        """Returns True if the journal modified or deleted an item of the snapshot"""
+        return (identifier in self._deleted.get(collection_key, ())
+                or identifier in self._upserts.get(collection_key, {}))
+
+    def next_identifier(self, collection_key: str) -> int:
+        """Returns the next identifier of a collection as of the last journaled change, 0 if there was none"""
+        return self._next_identifiers.get(collection_key, 0)
+
+    def remaining(self, collection_key: str) -> dict[str, dict[str, Any]]:
+        """Returns the items that were not applied to a snapshot item, i.e. the items created after the snapshot"""
+        return self._upserts.pop(collection_key, {})
@@ -0,0 +1,129 @@
+import codecs
+import json
+import os
+from json.decoder import WHITESPACE
+from typing import Any, Callable, Iterator, Optional
+
+
+class ProjectJsonReader:
+    """
+    Reads a project.json file incrementally, one item at a time.
+
+    project.json holds one json object per collection, mapping identifiers to item json dicts. Rather than decoding the
+    complete file at once, the reader decodes the items one by one from a buffer that is refilled in chunks.
+    This keeps memory usage limited to the items that were built so far.
+
+    Iterating yields (collection key, identifier, item json dict) tuples.
+    Top-level values that are not objects are yielded as (key, None, value).
+    """
+
+    def __init__(self,
+                 filename: str,
+                 progress_callback: Optional[Callable[[int, int], None]] = None,
+                 chunk_size: int = 1024 * 1024,
+                 ) -> None:
+        """
+        :param progress_callback: called with the number of bytes read and the file size after every chunk
+        :param chunk_size: number of bytes read at once
+        """
+        self._filename = filename
+        self._progress_callback = progress_callback
+        self._chunk_size = chunk_size
+
+        self._decoder = json.JSONDecoder()
+        self._file = None
+        self._utf8_decoder = None
+        self._file_size = 0
+        self._bytes_read = 0
+        self._buffer = ""
+        self._pos = 0
+        self._eof = False
+
+    def __iter__(self) -> Iterator[tuple[str, Optional[str], Any]]:
+        self._file_size = os.path.getsize(self._filename)
+        self._utf8_decoder = codecs.getincrementaldecoder("utf-8")()
+
+        with open(self._filename, "rb") as self._file:
+            self._expect("{")
+            if self._peek() == "}":
+                return
+
+            while True:
+                key = self._decode_value()
+                self._expect(":")
+
+                if self._peek() == "{":
+                    self._pos += 1
+                    yield from self._iter_object_items(key)
+                else:
+                    yield key, None, self._decode_value()
+
+                if self._next_delimiter() == "}":
+                    return
+
+    def _iter_object_items(self, key: str) -> Iterator[tuple[str, Optional[str], Any]]:
+        if self._peek() == "}":
+            self._pos += 1
+            return
+
+        while True:
+            identifier = self._decode_value()
+            self._expect(":")
+            yield key, identifier, self._decode_value()
+
+            if self._next_delimiter() == "}":
+                return
+
+    def _fill(self) -> bool:
+        """Reads the next chunk into the buffer, dropping what was already decoded. Returns False at the end of file."""
+        if self._eof:
+            return False
+
+        chunk = self._file.read(self._chunk_size)
+        self._bytes_read += len(chunk)
+        self._eof = not chunk
+        self._buffer = self._buffer[self._pos:] + self._utf8_decoder.decode(chunk, final=self._eof)
+        self._pos = 0
+
+        if self._progress_callback is not None:
+            self._progress_callback(self._bytes_read, self._file_size)
+        return not self._eof
+
+    def _peek(self) -> str:
+        """Returns the next non-whitespace character without consuming it"""
+        while True:
+            self._pos = WHITESPACE.match(self._buffer, self._pos).end()
+            if self._pos < len(self._buffer):
+                return self._buffer[self._pos]
+            if not self._fill():
+                raise json.JSONDecodeError("Unexpected end of file", self._buffer, self._pos)
+
+    def _expect(self, char: str) -> None:
+        if self._peek() != char:
+            raise json.JSONDecodeError(f"Expecting '{char}'", self._buffer, self._pos)
+        self._pos += 1
+
+    def _next_delimiter(self) -> str:
+        """Consumes the ',' or '}' following a value and returns it"""
+        char = self._peek()
+        if char not in ",}":
+            raise json.JSONDecodeError("Expecting ',' or '}'", self._buffer, self._pos)
+        self._pos += 1
+        return char
+
+    def _decode_value(self) -> Any:
+        self._peek()
+        while True:
+            try:
+                value, end = self._decoder.raw_decode(self._buffer, self._pos)
+            except json.JSONDecodeError:
+                # The value may continue in the next chunk
+                if not self._fill():
+                    raise
+                continue
+
+            if end == len(self._buffer) and self._fill():
+                continue  # a number at the end of the buffer may have been cut off, decode again with more data
+
+            self._pos = end
+            return value
@@ -0,0 +1,128 @@
+import json
+import os
+import sqlite3
+from contextlib import closing
+from typing import Any, Optional
+
+from src.data.TaggedItems import CollectionChanges
+from src.data.storage.Migrations import FORMAT_VERSION, FORMAT_VERSION_KEY, NEXT_IDENTIFIERS_KEY
+
+
+class SQLiteProjectStore:
+    """
+    Stores a project in a single SQLite database (project.sqlite) instead of project.json.
+
+    Every tagged item is a row holding its json dict, keyed by the collection it belongs to and its identifier.
+    Saving a project only writes the rows of items that changed, and items are read one batch at a time when they are
+    first accessed, so that large projects don't have to be loaded into memory completely.
+
+    Writes may run on a worker thread, they use their own short-lived connection.
+    """
+
+    filename = "project.sqlite"
+
+    def __init__(self, project_dir: str) -> None:
+        self.project_dir = project_dir
+        self._connection = None  # type: Optional[sqlite3.Connection]
+
+    @property
+    def path(self) -> str:
+        return os.path.join(self.project_dir, self.filename)
+
+    @property
+    def exists(self) -> bool:
+        return os.path.isfile(self.path)
+
+    @property
+    def connection(self) -> sqlite3.Connection:
+        """Connection used to read items, on the thread that owns the project"""
+        if self._connection is None:
+            self._connection = self._connect()
+        return self._connection
+
+    def _connect(self) -> sqlite3.Connection:
+        connection = sqlite3.connect(self.path)
+        # Write-ahead logging lets items be read while a save is being written
+        connection.execute("PRAGMA journal_mode=WAL")
+        connection.execute(
+            "CREATE TABLE IF NOT EXISTS items ("
+            "collection TEXT NOT NULL, "
+            "identifier INTEGER NOT NULL, "
+            "data TEXT NOT NULL, "
+            "PRIMARY KEY (collection, identifier))"
+        )
+        connection.execute(
+            "CREATE TABLE IF NOT EXISTS next_identifiers ("
+            "collection TEXT PRIMARY KEY, "
+            "identifier INTEGER NOT NULL)"
+        )
+        return connection
+
+    def close(self) -> None:
+        if self._connection is not None:
+            self._connection.close()
+            self._connection = None
+
+    @property
+    def format_version(self) -> int:
+        """Format version of the stored items, databases written before the format was versioned are version 0"""
+        (version,) = self.connection.execute("PRAGMA user_version").fetchone()
+        return version
+
+    def identifiers(self, collection_key: str) -> list[int]:
+        """Returns the identifiers of all items in a collection, in the order in which they were inserted."""
+        cursor = self.connection.execute(
+            "SELECT identifier FROM items WHERE collection = ? ORDER BY rowid", (collection_key,)
+        )
+        return [identifier for (identifier,) in cursor]
+
+    def next_identifiers(self) -> dict[str, int]:
+        """Returns the next identifier of every collection"""
+        return dict(self.connection.execute("SELECT collection, identifier FROM next_identifiers"))
+
+    def fetch(self, collection_key: str, identifiers: list[int]) -> dict[int, dict[str, Any]]:
+        """Returns the json dicts of the requested items of a collection"""
+        placeholders = ", ".join("?" * len(identifiers))
+        cursor = self.connection.execute(
+            f"SELECT identifier, data FROM items WHERE collection = ? AND identifier IN ({placeholders})",
+            (collection_key, *identifiers),
+        )
+        return {identifier: json.loads(data) for identifier, data in cursor}
+
+    def write_snapshot(self, project_dict: dict[str, Any]) -> None:
+        """Replaces the stored project by the complete project in project_dict"""
+        project_dict = dict(project_dict)
+        version = int(project_dict.pop(FORMAT_VERSION_KEY, FORMAT_VERSION))
+        next_identifiers = project_dict.pop(NEXT_IDENTIFIERS_KEY, {})
+        with closing(self._connect()) as connection, connection:
+            connection.execute(f"PRAGMA user_version = {version}")
+            connection.execute("DELETE FROM items")
+            connection.execute("DELETE FROM next_identifiers")
+            connection.executemany("INSERT INTO next_identifiers (collection, identifier) VALUES (?, ?)",
+                                   next_identifiers.items())
+            for collection_key, items in project_dict.items():
+                connection.executemany(
+                    "INSERT INTO items (collection, identifier, data) VALUES (?, ?, ?)",
+                    ((collection_key, identifier, json.dumps(item_dict)) for identifier, item_dict in items.items()),
+                )
+
+    def write_changes(self, changes: dict[str, CollectionChanges]) -> None:
+        """Writes the changed items of every collection in a single database transaction"""
+        with closing(self._connect()) as connection, connection:
+            for collection_key, (upserts, deletes, next_identifier) in changes.items():
+                connection.executemany(
+                    "DELETE FROM items WHERE collection = ? AND identifier = ?",
+                    ((collection_key, identifier) for identifier in deletes),
+                )
+                # An upsert keeps the rowid of existing items, so the item order is preserved.
+                connection.executemany(
+                    "INSERT INTO items (collection, identifier, data) VALUES (?, ?, ?) "
+                    "ON CONFLICT (collection, identifier) DO UPDATE SET data = excluded.data",
+                    ((collection_key, identifier, json.dumps(item_dict)) for identifier, item_dict in upserts.items()),
+                )
+                if next_identifier is not None:
+                    connection.execute(
+                        "INSERT INTO next_identifiers (collection, identifier) VALUES (?, ?) "
+                        "ON CONFLICT (collection) DO UPDATE SET identifier = excluded.identifier",
+                        (collection_key, next_identifier),
+                    )
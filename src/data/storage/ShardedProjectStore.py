@@ -0,0 +1,164 @@
+import datetime
+import json
+import os
+import shutil
+from typing import Any
+
+from src.data.TaggedItems import CollectionChanges
+from src.data.storage.Migrations import FORMAT_VERSION_KEY, NEXT_IDENTIFIERS_KEY
+
+
+class ShardedProjectStore:
+    """
+    Stores a project in project.json, with its transactions split into one file per year.
+
+    project.json holds the other collections and, for every year, the identifiers of the transactions of that year.
+    Opening a project only reads project.json, the transactions of a year are read when one of them is first accessed.
+    Saving rewrites project.json and the files of the years in which transactions changed, so opening a project and
+    editing recent transactions costs the same no matter how many years of history the project holds.
+
+    Writes may run on a worker thread. They only rely on what is on disk, not on the state used for reading.
+    """
+
+    shards_key = "transaction_shards"  # key in project.json mapping years to transaction identifiers
+    directory_name = "transactions"
+
+    def __init__(self, project_dir: str, identifiers_by_year: dict[int, list[int]] = None) -> None:
+        """
+        :param identifiers_by_year: identifiers of the stored transactions per year, as read from project.json
+        """
+        self.project_dir = project_dir
+
+        # Year of every stored transaction, used to read the right file when transactions are first accessed
+        self._years = {}  # type: dict[int, int]
+        for year, identifiers in (identifiers_by_year or {}).items():
+            self._years.update(dict.fromkeys(identifiers, year))
+
+    @property
+    def directory(self) -> str:
+        return os.path.join(self.project_dir, self.directory_name)
+
+    @property
+    def exists(self) -> bool:
+        return os.path.isdir(self.directory)
+
+    def _project_path(self) -> str:
+        return os.path.join(self.project_dir, "project.json")
+
+    def _shard_path(self, year: int) -> str:
+        return os.path.join(self.directory, f"{year}.json")
+
+    @staticmethod
+    def transaction_year(item_dict: dict[str, Any]) -> int:
+        return datetime.date.fromisoformat(item_dict["date"]).year
+
+    def fetch(self, identifiers: list[int]) -> dict[int, dict[str, Any]]:
+        """Returns the json dicts of all transactions stored in the same years as the requested transactions"""
+        json_dicts = {}  # type: dict[int, dict[str, Any]]
+        for year in sorted({self._years[identifier] for identifier in identifiers}):
+            json_dicts.update(self._read_shard(year))
+        return json_dicts
+
+    def _read_shard(self, year: int) -> dict[int, dict[str, Any]]:
+        with open(self._shard_path(year), "r") as read_file:
+            return {int(identifier): item_dict for identifier, item_dict in json.load(read_file).items()}
+
+    @staticmethod
+    def _write_json(path: str, json_dict: dict) -> None:
+        """Writes through a temporary file, so an interrupted write never corrupts the existing file"""
+        with open(f"{path}.tmp", "w") as write_file:
+            json.dump(json_dict, write_file, indent=4)
+            write_file.flush()
+            os.fsync(write_file.fileno())
+        os.replace(f"{path}.tmp", path)
+
+    def write_snapshot(self, project_dict: dict[str, dict[int, dict[str, Any]]]) -> None:
+        """Replaces the stored project by the complete project in project_dict"""
+        project_dict = dict(project_dict)
+        shards = {}  # type: dict[int, dict[int, dict[str, Any]]]
+        for identifier, item_dict in project_dict.pop("transactions", {}).items():
+            shards.setdefault(self.transaction_year(item_dict), {})[identifier] = item_dict
+
+        os.makedirs(self.directory, exist_ok=True)
+        for year, items in shards.items():
+            self._write_json(self._shard_path(year), items)
+        for name in os.listdir(self.directory):
+            year = name.removesuffix(".json")
+            if year.isdigit() and int(year) not in shards:
+                os.remove(os.path.join(self.directory, name))
+
+        # Transaction files are written first, project.json never refers to a year that was not written yet
+        project_dict[self.shards_key] = {str(year): list(shards[year]) for year in sorted(shards)}
+        self._write_json(self._project_path(), project_dict)
+
+    def write_changes(self, changes: dict[str, CollectionChanges]) -> None:
+        """Rewrites project.json and the files of the years in which transactions were changed"""
+        with open(self._project_path(), "r") as read_file:
+            stored_dict = json.load(read_file)
+        shard_index = {int(year): identifiers for year, identifiers in stored_dict.pop(self.shards_key, {}).items()}
+
+        # Keep the format version first and the collections in load order, regardless of which were empty so far
+        project_dict = {}  # type: dict[str, Any]
+        if FORMAT_VERSION_KEY in stored_dict:
+            project_dict[FORMAT_VERSION_KEY] = stored_dict.pop(FORMAT_VERSION_KEY)
+        project_dict.update({key: stored_dict.pop(key, {}) for key in changes if key != "transactions"})
+        project_dict.update(stored_dict)
+
+        next_identifiers = project_dict.setdefault(NEXT_IDENTIFIERS_KEY, {})
+        for key, (upserts, deletes, next_identifier) in changes.items():
+            if next_identifier is not None:
+                next_identifiers[key] = next_identifier
+            if key == "transactions":
+                self._write_transaction_changes(shard_index, upserts, deletes)
+                continue
+
+            items = project_dict[key]
+            for identifier in deletes:
+                items.pop(str(identifier), None)
+            for identifier, item_dict in upserts.items():
+                items[str(identifier)] = item_dict
+
+        project_dict[self.shards_key] = {str(year): shard_index[year] for year in sorted(shard_index)}
+        self._write_json(self._project_path(), project_dict)
+
+    def _write_transaction_changes(self,
+                                   shard_index: dict[int, list[int]],
+                                   upserts: dict[int, dict[str, Any]],
+                                   deletes: list[int],
+                                   ) -> None:
+        """Applies the changes to the transaction files and updates shard_index accordingly"""
+        years = {identifier: year for year, identifiers in shard_index.items() for identifier in identifiers}
+        shards = {}  # type: dict[int, dict[int, dict[str, Any]]]
+
+        def get_shard(shard_year: int) -> dict[int, dict[str, Any]]:
+            if shard_year not in shards:
+                shards[shard_year] = self._read_shard(shard_year) if shard_year in shard_index else {}
+            return shards[shard_year]
+
+        for identifier in deletes:
+            year = years.pop(identifier, None)
+            if year is not None:
+                del get_shard(year)[identifier]
+
+        for identifier, item_dict in upserts.items():
+            year = self.transaction_year(item_dict)
+            previous_year = years.get(identifier)
+            if previous_year is not None and previous_year != year:
+                del get_shard(previous_year)[identifier]
+            get_shard(year)[identifier] = item_dict
+            years[identifier] = year
+
+        os.makedirs(self.directory, exist_ok=True)
+        for year, items in shards.items():
+            if items:
+                self._write_json(self._shard_path(year), items)
+                shard_index[year] = list(items)
+            else:
+                if os.path.isfile(self._shard_path(year)):
+                    os.remove(self._shard_path(year))
+                shard_index.pop(year, None)
+
+    @classmethod
+    def remove(cls, project_dir: str) -> None:
+        """Removes the transaction files, for when the project is saved in another format"""
+        shutil.rmtree(os.path.join(project_dir, cls.directory_name), ignore_errors=True)
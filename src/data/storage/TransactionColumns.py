@@ -0,0 +1,106 @@
+import os
+import shutil
+from typing import TYPE_CHECKING
+
+import numpy as np
+
+if TYPE_CHECKING:
+    from src.data.Transactions import Transactions
+
+
+class TransactionColumns:
+    """
+    Columnar snapshot of a project's transactions, stored next to project.json as one .npy file per column.
+
+    - identifier: int64
+    - date: int32, proleptic Gregorian ordinal (datetime.date.toordinal)
+    - amount: int64, in cents
+    - account, category, counterpart: int32 identifiers, NULL_REFERENCE of TransactionStore when not set
+    - notes: all notes as a single utf-8 encoded uint8 blob, note_offsets (int64) holds the start and end of every note
+
+    Loading memory-maps the files instead of parsing and converting millions of json strings.
+    Every snapshot is written to a new directory, which project.json refers to. That way project.json always refers
+    to a complete set of columns, even when writing a new snapshot is interrupted.
+    """
+
+    directory_prefix = "transactions-"
+    project_json_key = "transaction_columns"  # key in project.json holding the name of the current directory
+    column_dtypes = {
+        "identifier": np.int64,
+        "date": np.int32,
+        "amount": np.int64,
+        "account": np.int32,
+        "category": np.int32,
+        "counterpart": np.int32,
+        "note_offsets": np.int64,
+        "notes": np.uint8,
+    }
+
+    def __init__(self, columns: dict[str, np.ndarray]) -> None:
+        self.columns = columns
+
+    def __len__(self) -> int:
+        return len(self.columns["identifier"])
+
+    @classmethod
+    def from_transactions(cls, transactions: "Transactions") -> "TransactionColumns":
+        """Takes a snapshot of the current transactions"""
+        columns = transactions.columns()  # the columns of the store use the same types, except for notes
+        notes = [note.encode("utf-8") for note in columns.pop("note")]
+
+        note_offsets = np.zeros(len(notes) + 1, dtype=np.int64)
+        np.cumsum([len(note) for note in notes], out=note_offsets[1:])
+
+        columns["note_offsets"] = note_offsets
+        columns["notes"] = np.frombuffer(b"".join(notes), dtype=np.uint8)
+        return cls({name: columns[name].astype(dtype, copy=False) for name, dtype in cls.column_dtypes.items()})
+
+    @classmethod
+    def load(cls, project_dir: str, directory_name: str) -> "TransactionColumns":
+        """Memory-maps the columns stored in a directory of project_dir"""
+        directory = os.path.join(project_dir, directory_name)
+        columns = {}
+        for name in cls.column_dtypes:
+            columns[name] = np.load(os.path.join(directory, f"{name}.npy"), mmap_mode="r")
+        return cls(columns)
+
+    def save(self, project_dir: str) -> str:
+        """Writes the columns to a new directory in project_dir and returns the name of that directory"""
+        generation = max(self._existing_generations(project_dir), default=0) + 1
+        directory_name = f"{self.directory_prefix}{generation}"
+        directory = os.path.join(project_dir, directory_name)
+
+        os.makedirs(directory)
+        for name, column in self.columns.items():
+            with open(os.path.join(directory, f"{name}.npy"), "wb") as write_file:
+                np.save(write_file, column)
+                write_file.flush()
+                os.fsync(write_file.fileno())
+        return directory_name
+
+    @classmethod
+    def remove_unused(cls, project_dir: str, used_directory_name: str = None) -> None:
+        """Removes the column directories of older snapshots"""
+        for generation in cls._existing_generations(project_dir):
+            directory_name = f"{cls.directory_prefix}{generation}"
+            if directory_name != used_directory_name:
+                shutil.rmtree(os.path.join(project_dir, directory_name), ignore_errors=True)
+
+    @classmethod
+    def _existing_generations(cls, project_dir: str) -> list[int]:
+        generations = []
+        for name in os.listdir(project_dir):
+            suffix = name.removeprefix(cls.directory_prefix)
+            if name.startswith(cls.directory_prefix) and suffix.isdigit():
+                generations.append(int(suffix))
+        return generations
+
+    def store_columns(self) -> dict[str, np.ndarray]:
+        """Returns the columns in the layout of TransactionStore.columns, to be loaded with Transactions.load_columns"""
+        notes = self.columns["notes"].tobytes()
+        note_offsets = self.columns["note_offsets"].tolist()
+
+        columns = {name: np.asarray(self.columns[name])
+                   for name in ("identifier", "date", "amount", "account", "category", "counterpart")}
+        columns["note"] = [notes[start:end].decode("utf-8") for start, end in zip(note_offsets, note_offsets[1:])]
+        return columns
@@ -0,0 +1,81 @@
+import datetime
+import json
+from typing import Any, Callable, TextIO
+
+import numpy as np
+
+from src.data.TransactionStore import NULL_REFERENCE
+
+# Ordinal of the epoch of numpy datetime64 values, which count days from 1970-01-01
+_EPOCH_ORDINAL = datetime.date(1970, 1, 1).toordinal()
+
+
+class TransactionTable:
+    """
+    Transactions in project.json as a single object of columns, rather than as one object per transaction:
+
+    - identifier: identifiers
+    - date: ISO dates ("2024-01-31")
+    - amount: integer amounts in cents
+    - account, category, counterpart: referenced identifiers, null when not set
+    - note: strings
+
+    The table is written from the columns of the TransactionStore, one chunk of values at a time, without building the
+    json dicts of the transactions. Reading it back yields columns for Transactions.load_columns.
+    """
+
+    project_json_key = "transaction_table"  # key in project.json holding the table
+    chunk_size = 65536  # number of values converted and written at once
+
+    @classmethod
+    def _converters(cls) -> dict[str, Callable[[Any], list[Any]]]:
+        """Functions that convert (a chunk of) every column to json values, in the order of the table"""
+        return {
+            "identifier": lambda values: values.tolist(),
+            "date": cls._dates,
+            "amount": lambda values: values.tolist(),
+            "account": cls._references,
+            "category": cls._references,
+            "counterpart": cls._references,
+            "note": lambda values: values,
+        }
+
+    @classmethod
+    def table(cls, columns: dict[str, Any]) -> dict[str, list[Any]]:
+        """Returns the table as it is read from project.json, from columns as returned by Transactions.columns"""
+        return {name: convert(columns[name]) for name, convert in cls._converters().items()}
+
+    @classmethod
+    def write(cls, write_file: TextIO, columns: dict[str, Any]) -> None:
+        """Writes the table as json, from columns as returned by Transactions.columns"""
+        write_file.write("{")
+        for i, (name, convert) in enumerate(cls._converters().items()):
+            write_file.write(f'{", " if i else ""}"{name}": [')
+            column = columns[name]
+            for start in range(0, len(column), cls.chunk_size):
+                values = convert(column[start:start + cls.chunk_size])
+                write_file.write((", " if start else "") + json.dumps(values)[1:-1])
+            write_file.write("]")
+        write_file.write("}")
+
+    @staticmethod
+    def _dates(values: np.ndarray) -> list[str]:
+        return (values.astype(np.int64) - _EPOCH_ORDINAL).astype("datetime64[D]").astype(str).tolist()
+
+    @staticmethod
+    def _references(values: np.ndarray) -> list[Any]:
+        return [None if value == NULL_REFERENCE else value for value in values.tolist()]
+
+    @staticmethod
+    def store_columns(table: dict[str, list[Any]]) -> dict[str, Any]:
+        """Returns the columns of a table read from project.json, to be loaded with Transactions.load_columns"""
+        columns = {
+            "identifier": np.asarray(table["identifier"], dtype=np.int64),
+            "date": np.asarray(table["date"], dtype="datetime64[D]").astype(np.int64) + _EPOCH_ORDINAL,
+            "amount": np.asarray(table["amount"], dtype=np.int64),
+            "note": table["note"],
+        }  # type: dict[str, Any]
+        for name in ("account", "category", "counterpart"):
+            columns[name] = np.asarray([NULL_REFERENCE if value is None else value for value in table[name]],
+                                       dtype=np.int32)
+        return columns
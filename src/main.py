@@ -30,6 +30,10 @@ class MainBackend(QObject):
         self._settings = settings
         self._init_models()
 
+        # Don't quit before background saves have been written
+        if self._application is not None:
+            self._application.aboutToQuit.connect(self._wait_for_background_tasks)
+
         # Init main window
         self._main_window = MainWindow(projects_model=self._projects_model, settings=self._settings)
         self._main_window.show()
@@ -44,6 +48,12 @@ class MainBackend(QObject):
         self._projects_model = ProjectsModel(projects=self.projects, settings=self._settings, parent=self)
 
 
+    def _wait_for_background_tasks(self) -> None:
+        self._projects_model.autosave.flush()
+        for project in self.projects.values():
+            project.wait_for_background_tasks()
+
+
 def main() -> None:
     # Initialize logger
     setup_logging()
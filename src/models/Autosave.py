@@ -0,0 +1,95 @@
+import time
+from functools import partial
+from typing import TYPE_CHECKING, Any, Optional
+
+from PySide6.QtCore import QAbstractItemModel, QObject, QTimer
+
+from src.data.settings.AppSettings import AppSettings
+from src.data.settings.GeneralSettings import GeneralSettingKeys
+
+if TYPE_CHECKING:
+    from src.data.Projects import Project
+    from src.models.Projects import ProjectsModel
+
+
+class AutosaveScheduler(QObject):
+    """
+    Saves projects automatically after they were edited.
+
+    Every change signal of the watched models (re)starts a countdown for the current project, so a burst of edits
+    results in a single background save once no changes were made for the autosave delay. Saves of a project are at
+    least the minimum interval apart, and a project that keeps being edited is still saved once the minimum interval
+    has passed since its first unsaved change.
+    """
+
+    def __init__(self, projects_model: "ProjectsModel", settings: AppSettings, parent: Optional[QObject]) -> None:
+        super().__init__(parent)
+
+        self._projects_model = projects_model
+        self._settings = settings
+
+        # Per project identifier
+        self._timers = {}  # type: dict[int, QTimer]
+        self._pending = {}  # type: dict[int, Project]  # projects with a scheduled save
+        self._first_change = {}  # type: dict[int, float]  # time of the first change since the last save
+        self._last_save = {}  # type: dict[int, float]
+
+    def watch(self, model: QAbstractItemModel) -> None:
+        """Schedules a save of the current project whenever the model reports a change"""
+        model.dataChanged.connect(self._schedule_current_project)
+        model.rowsInserted.connect(self._schedule_current_project)
+        model.rowsRemoved.connect(self._schedule_current_project)
+
+    def _schedule_current_project(self, *_: Any) -> None:
+        self.schedule(self._projects_model.current_project)
+
+    def schedule(self, project: Optional["Project"]) -> None:
+        # Views also emit dataChanged for e.g. selection changes, which don't need a save
+        if project is None or not project.is_dirty:
+            return
+        if not self._settings.general[GeneralSettingKeys.AUTOSAVE_ENABLED].value:
+            return
+
+        delay = self._settings.general[GeneralSettingKeys.AUTOSAVE_DELAY].value
+        min_interval = self._settings.general[GeneralSettingKeys.AUTOSAVE_MIN_INTERVAL].value
+
+        now = time.monotonic()
+        first_change = self._first_change.setdefault(project.identifier, now)
+        save_at = min(now + delay, first_change + min_interval)
+        if project.identifier in self._last_save:
+            save_at = max(save_at, self._last_save[project.identifier] + min_interval)
+
+        timer = self._timers.get(project.identifier)
+        if timer is None:
+            timer = self._timers[project.identifier] = QTimer(self)
+            timer.setSingleShot(True)
+            timer.timeout.connect(partial(self._save, project.identifier))
+        self._pending[project.identifier] = project
+        timer.start(max(0, round(1000 * (save_at - now))))
+
+    @property
+    def has_pending_saves(self) -> bool:
+        return bool(self._pending)
+
+    def _save(self, identifier: int) -> None:
+        project = self._pending.pop(identifier, None)
+        self._first_change.pop(identifier, None)
+        if project is not None and project.is_dirty:
+            project.save_project()
+            self._last_save[identifier] = time.monotonic()
+
+    def cancel(self, project: "Project") -> None:
+        """Drops the scheduled save of a project, e.g. when it is closed"""
+        timer = self._timers.pop(project.identifier, None)
+        if timer is not None:
+            timer.stop()
+            timer.deleteLater()
+        self._pending.pop(project.identifier, None)
+        self._first_change.pop(project.identifier, None)
+        self._last_save.pop(project.identifier, None)
+
+    def flush(self) -> None:
+        """Starts the scheduled saves right away, e.g. before quitting"""
+        for identifier in list(self._pending):
+            self._timers[identifier].stop()
+            self._save(identifier)
@@ -15,7 +15,7 @@ from src.data.Transactions import Transactions, Transaction
 from PySide6.QtCore import QAbstractListModel, Qt, QModelIndex, QAbstractTableModel
 from enum import IntEnum
 from src.data.BankAccount import BankAccount
-from schwifty.iban import IBAN
+from src.data.Ibans import parse_iban
 
 
 class BankAccountsOverviewListModel(TaggedItemsListModel):
@@ -54,7 +54,7 @@ class BankAccountsOverviewListModel(TaggedItemsListModel):
         item: BankAccount = self.get_item(index)
 
         if role == Qt.ItemDataRole.EditRole:
-            item.name = value
+            self._data.update_item(item, name=value)
             self.dataChanged.emit(index, index, Qt.ItemDataRole.DisplayRole)
             return True
 
@@ -145,16 +145,16 @@ class BankAccountDataModel(QAbstractTableModel):
         if role == Qt.ItemDataRole.EditRole:
             if row == self.rows.IBAN:
 
-                new_iban = IBAN(value, allow_invalid=True)
-                if not new_iban.is_valid:
+                new_iban = parse_iban(value)
+                if new_iban is None:
                     logging.getLogger(__name__).warning(f"Passed an invalid IBAN: {value}")
                     return False
 
-                self._current_account.iban = new_iban
+                self._current_account.project.bank_accounts.update_item(self._current_account, iban=new_iban)
                 self.dataChanged.emit(index, index, Qt.ItemDataRole.DisplayRole)
                 return True
             elif row == self.rows.NOTE:
-                self._current_account.note = value
+                self._current_account.project.bank_accounts.update_item(self._current_account, note=value)
                 self.dataChanged.emit(index, index, Qt.ItemDataRole.DisplayRole)
                 return True
 
@@ -1,24 +1,37 @@
-from typing import TYPE_CHECKING, Any, Optional
+from concurrent.futures import Future
+from concurrent.futures.process import BrokenProcessPool
+from functools import partial
+from typing import TYPE_CHECKING, Any, Callable, Optional
 
 from PySide6.QtCore import QAbstractListModel, QItemSelection, QModelIndex, Qt, Signal
 from PySide6.QtGui import QFont
 import os
 
 from src.data.settings.AppSettings import AppSettings
+from src.models.Autosave import AutosaveScheduler
 from src.models.BankAccounts import BankAccountsOverviewListModel
 from src.models.CounterParts import CounterPartsOverviewListModel
+from src.models.RowIndex import RowIndex
 from src.models.TransactionCSVReaders import TransactionCSVReadersOverviewModel
 from src.models.TransactionCategories import TransactionCategoriesOverviewModel
 from src.models.Transactions import TransactionsOverviewTableModel
 
 if TYPE_CHECKING:
     from src.data.Projects import Project, Projects
+    from src.data.TaggedItems import TaggedItems
+    from src.data.storage.ParsedProject import ParsedProject
 
 
 class ProjectsModel(QAbstractListModel):
     """Handles navigation between opened projects"""
 
     current_project_changed = Signal(object)
+    load_progress_changed = Signal(int)  # percentage of the project file(s) read while opening a project
+    project_saved = Signal(object)  # emitted with the project when a background save finished
+    project_save_failed = Signal(object, str)  # emitted with the project and an error message when a save failed
+    project_open_failed = Signal(str, str)  # emitted with the project directory and an error message
+    undo_state_changed = Signal()  # emitted when changes of the current project were recorded, undone or redone
+    _project_parsed = Signal(str, object)  # project directory and future, emitted by the thread of the process pool
 
     def __init__(self, projects: "Projects", settings: AppSettings, parent):
         super().__init__(parent)
@@ -27,14 +40,12 @@ class ProjectsModel(QAbstractListModel):
 
         # Data
         self._projects = projects
-        self._row_to_id_mapper = {}  # type: dict[int, int]
-        row = 0
-        for project in self._projects.values():
-            self._row_to_id_mapper[row] = project.identifier
+        self._rows = RowIndex(self._projects.keys())
 
         self._current_row = 0 if self._projects else -1  # type: int
 
         self._create_models()
+        self._project_parsed.connect(self._attach_parsed_project)
 
     def _create_models(self):
         self.bank_accounts_model = BankAccountsOverviewListModel(projects_model=self,
@@ -58,6 +69,48 @@ class ProjectsModel(QAbstractListModel):
                                                                  parent=self,
                                                                  )
 
+        self.autosave = AutosaveScheduler(projects_model=self, settings=self._settings, parent=self)
+        for model in (self.bank_accounts_model,
+                      self.counterparts_model,
+                      self.transaction_csv_readers_model,
+                      self.transaction_categories_model,
+                      self.transactions_model,
+                      ):
+            self.autosave.watch(model)
+
+    @property
+    def can_undo(self) -> bool:
+        return self.current_project is not None and self.current_project.undo_log.can_undo
+
+    @property
+    def can_redo(self) -> bool:
+        return self.current_project is not None and self.current_project.undo_log.can_redo
+
+    def undo(self) -> None:
+        """Undoes the last change to the current project"""
+        if self.can_undo:
+            self._refresh_models(self.current_project.undo_log.undo())
+
+    def redo(self) -> None:
+        """Redoes the last undone change to the current project"""
+        if self.can_redo:
+            self._refresh_models(self.current_project.undo_log.redo())
+
+    def _refresh_models(self, affected_items: dict["TaggedItems", Optional[set[int]]]) -> None:
+        """Notifies the views once per changed collection, rather than once per changed item"""
+        project = self.current_project
+        models = {
+            project.bank_accounts: self.bank_accounts_model,
+            project.counterparts: self.counterparts_model,
+            project.transaction_csv_readers: self.transaction_csv_readers_model,
+            project.transaction_categories: self.transaction_categories_model,
+            project.transactions: self.transactions_model,
+        }
+        for items, identifiers in affected_items.items():
+            models[items].refresh(identifiers)
+        self.autosave.schedule(project)
+        self.undo_state_changed.emit()
+
     def rowCount(self, parent=QModelIndex()) -> int:
         return self._projects.n_projects
 
@@ -86,7 +139,7 @@ class ProjectsModel(QAbstractListModel):
         project = self._get_project(index)
 
         if role == Qt.ItemDataRole.EditRole:
-            project.project_directory = value
+            project.project_dir = value
             self.dataChanged.emit(
                 index, index, [Qt.ItemDataRole.DisplayRole, Qt.ItemDataRole.EditRole]
             )
@@ -122,7 +175,8 @@ class ProjectsModel(QAbstractListModel):
         self.beginInsertRows(QModelIndex(), self.rowCount(), self.rowCount())
         row = self.rowCount()
         project = self._projects.create_new_project(project_directory=project_directory)
-        self._row_to_id_mapper[row] = project.identifier
+        self._connect_project(project)
+        self._rows.append(project.identifier)
         self.endInsertRows()
 
         # set selection to new project
@@ -135,15 +189,44 @@ class ProjectsModel(QAbstractListModel):
         self.change_selection(selected=selected, deselected=deselected)
 
     def open_project(self, project_directory: str) -> None:
-        # add project to list
-        self.beginInsertRows(
-            QModelIndex(), self.rowCount(QModelIndex()), self.rowCount(QModelIndex())
-        )
+        self._insert_project(project_directory=project_directory, progress_callback=self._report_load_progress)
+
+    def open_projects(self, project_directories: list[str]) -> None:
+        """Opens several projects, which are read in parallel. Every project is added as soon as it has been read."""
+        for project_directory, future in zip(project_directories, self._projects.parse_projects(project_directories)):
+            future.add_done_callback(partial(self._project_parsed.emit, project_directory))
+
+    def _attach_parsed_project(self, project_directory: str, future: Future) -> None:
+        try:
+            parsed = future.result()
+        except (OSError, ValueError, KeyError, BrokenProcessPool) as error:
+            self.project_open_failed.emit(project_directory, str(error))
+            return
+        self._insert_project(project_directory=project_directory, parsed=parsed)
+
+    def _insert_project(
+        self,
+        project_directory: str,
+        progress_callback: Optional[Callable[[int, int], None]] = None,
+        parsed: Optional["ParsedProject"] = None,
+    ) -> None:
+        # Load the project before adding its row, so that a project that can't be loaded leaves the list untouched
         row = self.rowCount()
-        project = self._projects.create_new_project(
-            project_directory=project_directory, load_from_dir=True
-        )
-        self._row_to_id_mapper[row] = project.identifier
+        try:
+            project = self._projects.create_new_project(
+                project_directory=project_directory,
+                load_from_dir=True,
+                progress_callback=progress_callback,
+                parsed=parsed,
+            )
+        except (OSError, ValueError, KeyError) as error:
+            self.project_open_failed.emit(project_directory, str(error))
+            return
+
+        # add project to list
+        self.beginInsertRows(QModelIndex(), row, row)
+        self._connect_project(project)
+        self._rows.append(project.identifier)
         self.endInsertRows()
 
         # set selection to new project
@@ -155,7 +238,22 @@ class ProjectsModel(QAbstractListModel):
 
         self.change_selection(selected=selected, deselected=deselected)
 
+    def _connect_project(self, project: "Project") -> None:
+        project.saved.connect(self.project_saved)
+        project.save_failed.connect(self.project_save_failed)
+        project.undo_log.state_changed_callback = partial(self._undo_log_changed, project)
+
+    def _undo_log_changed(self, project: "Project") -> None:
+        """Called by the undo log of a project for every recorded change, whichever model or item it was made through"""
+        if project is self.current_project:
+            self.undo_state_changed.emit()
+
+    def _report_load_progress(self, bytes_read: int, total_bytes: int) -> None:
+        percentage = 100 * bytes_read // total_bytes if total_bytes else 100
+        self.load_progress_changed.emit(percentage)
+
     def save_current_project(self) -> None:
+        """Saves the current project in the background, see project_saved and project_save_failed"""
         current_project = self.current_project
         if current_project:
             current_project.save_project()
@@ -179,25 +277,21 @@ class ProjectsModel(QAbstractListModel):
         )
 
     def save_all_projects(self) -> None:
+        """Saves the projects that have unsaved changes"""
         for project in self._projects.values():
-            project.save_project()
+            if project.is_dirty:
+                project.save_project()
 
     def close_current_project(self) -> None:
         if not self.has_project_opened:
             return
 
-        self.beginRemoveRows(QModelIndex(), self.rowCount(), self.rowCount())
-        _ = self._projects.pop(self.current_project.identifier)
-        _ = self._row_to_id_mapper.pop(self._current_row)
-        self.endRemoveRows()
+        self.autosave.cancel(self.current_project)  # closing discards unsaved changes
 
-        # update row mapper
-        new_row_to_id_mapper = {}  # type: dict[int, int]
-        row = 0
-        for item in self._projects.values():
-            new_row_to_id_mapper[row] = item.identifier
-            row += 1
-        self._row_to_id_mapper = new_row_to_id_mapper
+        self.beginRemoveRows(QModelIndex(), self._current_row, self._current_row)
+        project = self._projects.pop(self.current_project.identifier)
+        self._rows.remove(project.identifier)
+        self.endRemoveRows()
 
         # set selection to new project
         deselected = QItemSelection(QModelIndex(), QModelIndex())
@@ -226,11 +320,9 @@ class ProjectsModel(QAbstractListModel):
         if not index.isValid():
             return None
 
-        return self._projects[self._row_to_id_mapper[index.row()]]
+        return self._projects[self._rows.identifier(index.row())]
 
     def _get_row(self, project: "Project") -> int:
-        for row, identifier in self._row_to_id_mapper.items():
-            if identifier == project.identifier:
-                return row
-
-        raise ValueError(f"{project.identifier}, {self._row_to_id_mapper.items()}")
+        if project.identifier not in self._rows:
+            raise ValueError(f"{project.identifier}, {list(self._rows)}")
+        return self._rows.row(project.identifier)
@@ -0,0 +1,109 @@
+from typing import Iterable, Iterator, Optional
+
+
+class RowIndex:
+    """
+    Rows of the items shown by a model, mapping rows to identifiers and identifiers to rows in O(log n).
+
+    Every appended identifier gets the next slot, every prepended identifier the free slot before the first one,
+    slots never move. A Fenwick tree over the slots counts the slots that are in use, so the row of an identifier is
+    the number of used slots before its slot, and the identifier in a row is found by descending the tree. Removing an
+    identifier frees its slot without renumbering the other rows. The slots are compacted once more than half of them
+    are free, and rebuilt with as many free slots in front as there are rows when no free slot is left for prepending.
+    """
+
+    def __init__(self, identifiers: Iterable[int] = ()) -> None:
+        self._build(list(identifiers))
+
+    def _build(self, identifiers: list[int], n_front: int = 0) -> None:
+        """:param n_front: number of free slots before the identifiers, for prepending"""
+        # Identifier in every slot, also for freed slots, None for the free slots in front
+        self._identifiers = [None] * n_front + identifiers  # type: list[Optional[int]]
+        self._n_front = n_front
+        self._slots = {
+            identifier: slot for slot, identifier in enumerate(identifiers, start=n_front)
+        }  # type: dict[int, int]
+        # 1-based Fenwick tree of the number of used slots, built in O(n)
+        self._tree = [0] + [0] * n_front + [1] * len(identifiers)
+        for i in range(1, len(self._tree)):
+            parent = i + (i & -i)
+            if parent < len(self._tree):
+                self._tree[parent] += self._tree[i]
+
+    def __len__(self) -> int:
+        return len(self._slots)
+
+    def __contains__(self, identifier: int) -> bool:
+        return identifier in self._slots
+
+    def __iter__(self) -> Iterator[int]:
+        """Iterates over the identifiers in row order"""
+        slots = self._slots
+        return (identifier for slot, identifier in enumerate(self._identifiers) if slots.get(identifier) == slot)
+
+    def append(self, identifier: int) -> int:
+        """Adds an identifier after the last row and returns its row"""
+        assert identifier not in self._slots, identifier
+        slot = len(self._identifiers)
+        self._identifiers.append(identifier)
+        self._slots[identifier] = slot
+
+        # The new node covers the slots (i - lowbit(i), i], of which all but the new one are already counted
+        i = slot + 1
+        self._tree.append(1 + self._prefix(i - 1) - self._prefix(i - (i & -i)))
+        return len(self._slots) - 1
+
+    def prepend(self, identifier: int) -> None:
+        """Adds an identifier before the first row, the other rows move down by one"""
+        assert identifier not in self._slots, identifier
+        if not self._n_front:
+            self._build(list(self), n_front=max(len(self._slots), 64))
+        self._n_front -= 1
+        slot = self._n_front
+        self._identifiers[slot] = identifier
+        self._slots[identifier] = slot
+
+        i = slot + 1
+        while i < len(self._tree):
+            self._tree[i] += 1
+            i += i & -i
+
+    def remove(self, identifier: int) -> int:
+        """Removes an identifier and returns the row it had, the rows after it move up by one"""
+        row = self.row(identifier)
+        i = self._slots.pop(identifier) + 1
+        while i < len(self._tree):
+            self._tree[i] -= 1
+            i += i & -i
+
+        n_slots = len(self._identifiers) - self._n_front
+        if n_slots > 64 and len(self._slots) < n_slots // 2:
+            self._build(list(self), n_front=self._n_front)
+        return row
+
+    def row(self, identifier: int) -> int:
+        """Returns the row of an identifier, raises a KeyError if it has none"""
+        return self._prefix(self._slots[identifier])
+
+    def identifier(self, row: int) -> int:
+        """Returns the identifier in a row, raises an IndexError if there is no such row"""
+        if not 0 <= row < len(self._slots):
+            raise IndexError(row)
+
+        # Descends to the last node with fewer than row + 1 used slots before it, the next slot holds the identifier
+        i, remaining = 0, row + 1
+        step = 1 << (len(self._tree) - 1).bit_length()
+        while step:
+            if i + step < len(self._tree) and self._tree[i + step] < remaining:
+                i += step
+                remaining -= self._tree[i]
+            step >>= 1
+        return self._identifiers[i]
+
+    def _prefix(self, n_slots: int) -> int:
+        """Returns the number of used slots among the first n_slots"""
+        count = 0
+        while n_slots > 0:
+            count += self._tree[n_slots]
+            n_slots -= n_slots & -n_slots
+        return count
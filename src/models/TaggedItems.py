@@ -4,9 +4,10 @@ parametric variable can assume
 """
 
 from enum import IntEnum
-from typing import Any, Optional, TYPE_CHECKING
+from typing import Any, Iterable, Optional, TYPE_CHECKING
 
 from src.data.settings.AppSettings import AppSettings
+from src.data.settings.GeneralSettings import GeneralSettingKeys
 
 if TYPE_CHECKING:
     from src.data.Projects import Project
@@ -23,6 +24,18 @@ from PySide6.QtCore import (
 from PySide6.QtGui import QFont
 
 from src.data.TaggedItems import TaggedItemType, TaggedItemsType, TaggedItems
+from src.models.RowIndex import RowIndex
+
+
+def _row_ranges(rows: list[int]) -> list[tuple[int, int]]:
+    """Returns the first and last row of every range of consecutive rows, from sorted rows"""
+    ranges = []  # type: list[tuple[int, int]]
+    for row in rows:
+        if ranges and ranges[-1][1] == row - 1:
+            ranges[-1] = (ranges[-1][0], row)
+        else:
+            ranges.append((row, row))
+    return ranges
 
 
 class TaggedItemsListModel(QAbstractListModel):
@@ -51,14 +64,10 @@ class TaggedItemsListModel(QAbstractListModel):
         self.beginResetModel()
         if project:
             self._data = self._get_project_data(project)
-            self._row_to_id_map = {}  # type: dict[int, int]
-            row = 0
-            for item in self._data.values():
-                self._row_to_id_map[row] = item.identifier
-                row += 1
+            self._rows = RowIndex(self._data.keys())  # keys only, items of lazily loaded projects stay unloaded
         else:
             self._data = None  # Use None to reset the view
-            self._row_to_id_map = {}  # type: dict[int, int]
+            self._rows = RowIndex()
         self.endResetModel()
 
     def _get_project_data(self, project: "Project") -> TaggedItemsType:
@@ -100,7 +109,7 @@ class TaggedItemsListModel(QAbstractListModel):
         new_item = self._data.create_new_item(
             identifier=identifier, json_dict=json_dict
         )
-        self._row_to_id_map[row] = new_item.identifier
+        self._rows.append(new_item.identifier)
         self.endInsertRows()
 
         # set selection to new item
@@ -116,22 +125,57 @@ class TaggedItemsListModel(QAbstractListModel):
 
         return new_item
 
-    def delete_item(self, delete_index: QModelIndex) -> None:
-        assert delete_index.isValid(), f"{delete_index}"
-        delete_row = delete_index.row()
-        delete_item = self.get_item(delete_index)
+    def create_new_items(self, json_dicts: list[dict[str, Any]]) -> list[TaggedItemType]:
+        """Creates an item for every json dict, added as one range of rows, and selects the first of them"""
+        if not json_dicts:
+            return []
 
-        self.beginRemoveRows(QModelIndex(), delete_row, delete_row)
-        self._data.delete_item(delete_item)
-        _ = self._row_to_id_map.pop(delete_row)
-        self.endRemoveRows()
+        first_row = self.rowCount()
+        self.beginInsertRows(QModelIndex(), first_row, first_row + len(json_dicts) - 1)
+        new_items = self._data.bulk_create(json_dicts)
+        for new_item in new_items:
+            self._rows.append(new_item.identifier)
+        self.endInsertRows()
 
-        new_row_to_id_mapper = {}  # type: dict[int, int]
-        row = 0
-        for item in self._data.values():
-            new_row_to_id_mapper[row] = item.identifier
-            row += 1
-        self._row_to_id_map = new_row_to_id_mapper
+        deselected_index = self.index(self._current_row, 0)  # invalid if nothing is selected
+        deselected = QItemSelection(deselected_index, deselected_index)
+        selected_index = self.createIndex(first_row, 0)
+        selected = QItemSelection(selected_index, selected_index)
+        self.change_selection(selected=selected, deselected=deselected)
+
+        return new_items
+
+    def delete_item(self, delete_index: QModelIndex, replacement: Optional[TaggedItemType] = None) -> None:
+        """
+        Deletes an item. Transactions that refer to it are made to refer to replacement, or to nothing if None.
+        """
+        assert delete_index.isValid(), f"{delete_index}"
+        self.delete_items([delete_index], replacement=replacement)
+
+    def delete_items(self, delete_indexes: Iterable[QModelIndex], replacement: Optional[TaggedItemType] = None) -> None:
+        """
+        Deletes the items at the indexes, e.g. of the selected rows, with one removal per range of consecutive rows.
+        Transactions that refer to them are made to refer to replacement, or to nothing if None.
+        """
+        rows = sorted({index.row() for index in delete_indexes if index.isValid()})
+        if not rows:
+            return
+        delete_items = [self._data[self._rows.identifier(row)] for row in rows]
+
+        with self._data.undo_log.group():  # the cascades are undone together with the deletion
+            for delete_item in delete_items:
+                self._projects_model.transactions_model.replace_references(delete_item, replacement)
+
+            # Remove the last range first, so that the rows of the other ranges stay valid
+            end = len(delete_items)
+            for first_row, last_row in reversed(_row_ranges(rows)):
+                start = end - (last_row - first_row + 1)
+                self.beginRemoveRows(QModelIndex(), first_row, last_row)
+                self._data.delete_items(delete_items[start:end])
+                for delete_item in delete_items[start:end]:
+                    self._rows.remove(delete_item.identifier)
+                self.endRemoveRows()
+                end = start
 
         # set selection to new project
         deselected = QItemSelection(QModelIndex(), QModelIndex())
@@ -144,31 +188,53 @@ class TaggedItemsListModel(QAbstractListModel):
 
         self.change_selection(selected=selected, deselected=deselected)
 
+    def merge_items(self, source_index: QModelIndex, target_index: QModelIndex) -> None:
+        """Merges the item at source_index into the item at target_index: references are moved, the source deleted"""
+        assert source_index.isValid() and target_index.isValid(), f"{source_index}, {target_index}"
+        assert source_index.row() != target_index.row(), "an item cannot be merged into itself"
+        self.delete_item(source_index, replacement=self.get_item(target_index))
+
     def copy_item(self, copy_index: QModelIndex) -> None:
         assert copy_index.isValid(), copy_index
-        copy_row = copy_index.row()
-
-        assert 0 <= copy_row < self.rowCount(), f"{copy_row}"
-
-        old_item = self.get_item(copy_index)
-
-        self.beginInsertRows(QModelIndex(), self.rowCount(), self.rowCount())
-        row = self.rowCount()
-        new_item = self._data.copy_item(old_item)
-        self._row_to_id_map[row] = new_item.identifier
+        assert 0 <= copy_index.row() < self.rowCount(), f"{copy_index.row()}"
+        self.copy_items([copy_index])
+
+    def copy_items(self, copy_indexes: Iterable[QModelIndex]) -> None:
+        """Copies the items at the indexes, e.g. of the selected rows. The copies are added as one range of rows."""
+        rows = sorted({index.row() for index in copy_indexes if index.isValid()})
+        if not rows:
+            return
+        old_items = [self._data[self._rows.identifier(row)] for row in rows]
+
+        first_row = self.rowCount()
+        last_row = first_row + len(old_items) - 1
+        self.beginInsertRows(QModelIndex(), first_row, last_row)
+        for new_item in self._data.copy_items(old_items):
+            self._rows.append(new_item.identifier)
         self.endInsertRows()
 
-        # Set selection to copied item
-        top_left = self.index(row, 0)
-        bottom_right = self.index(row, 0)
+        # Set selection to first copied item
+        top_left = self.index(first_row, 0)
+        bottom_right = self.index(last_row, 0)
         self.dataChanged.emit(top_left, bottom_right, [Qt.ItemDataRole.DisplayRole])
 
-        deselected_index = self.createIndex(copy_row, 0)
+        deselected_index = self.index(self._current_row, 0)  # invalid if nothing is selected
         deselected = QItemSelection(deselected_index, deselected_index)
-        selected_index = self.createIndex(row, 0)
+        selected_index = self.createIndex(first_row, 0)
         selected = QItemSelection(selected_index, selected_index)
         self.change_selection(selected=selected, deselected=deselected)
 
+    def refresh(self, identifiers: Optional[set[int]] = None) -> None:
+        """
+        Lets views know that items were changed outside the model, e.g. by undoing.
+        :param identifiers: identifiers of the updated items, None if items were created or deleted
+        """
+        if identifiers is None:
+            self._set_current_project_data(project=self._projects_model.current_project)
+        elif self.rowCount() > 0:
+            self.dataChanged.emit(self.index(0, 0), self.index(self.rowCount() - 1, 0))
+        self.current_item_changed.emit(self.current_item)
+
     @property
     def current_item(self) -> Optional[Any]:
         return self.get_item(self.index(self._current_row, 0))
@@ -177,7 +243,7 @@ class TaggedItemsListModel(QAbstractListModel):
         if not index.isValid():
             return None
 
-        return self._data[self._row_to_id_map[index.row()]]
+        return self._data[self._rows.identifier(index.row())]
 
 
 class TaggedItemsOverviewTableModel(QAbstractTableModel):
@@ -203,25 +269,67 @@ class TaggedItemsOverviewTableModel(QAbstractTableModel):
         self._projects_model.current_project_changed.connect(self._set_current_project_data)
 
     def _set_current_project_data(self, project: Optional["Project"]):
-        """Set new data based on current project"""
+        """
+        Set new data based on current project.
+        Only the first batch of rows is added right away, views add the other rows with fetchMore while scrolling.
+        """
         self.beginResetModel()
+        self._rows = RowIndex()
         if project:
             self._data = self._get_project_data(project)
-            self._row_to_id_map = {}  # type: dict[int, int]
-            row = 0
-            for item in self._data.values():
-                self._row_to_id_map[row] = item.identifier
-                row += 1
+            # Identifiers of the rows that are not added yet, keys only, items of lazily loaded projects stay unloaded
+            self._unfetched = list(self._data.keys())  # type: list[int]
+            self._newest_first = self._settings.general[GeneralSettingKeys.TABLE_NEWEST_FIRST].value
+            if self._newest_first:
+                self._unfetched.reverse()
+            self._fetch_position = 0
+            for identifier in self._next_batch():
+                self._rows.append(identifier)
         else:
             self._data = None  # Use None to reset the view
-            self._row_to_id_map = {}  # type: dict[int, int]
+            self._newest_first = False
+            self._unfetched = []
+            self._fetch_position = 0
         self.endResetModel()
 
+    def _next_batch(self, batch_size: Optional[int] = None) -> list[int]:
+        """Returns the identifiers of the next batch of rows to add, of the batch size setting if batch_size is None"""
+        if batch_size is None:
+            batch_size = self._settings.general[GeneralSettingKeys.TABLE_BATCH_SIZE].value
+        batch = self._unfetched[self._fetch_position:self._fetch_position + batch_size]
+        self._fetch_position += batch_size
+        if self._fetch_position >= len(self._unfetched):
+            self._unfetched, self._fetch_position = [], 0
+
+        # Items may have been deleted, e.g. through another view, before their rows were added
+        return [identifier for identifier in batch if identifier in self._data and identifier not in self._rows]
+
     def _get_project_data(self, project: "Project") -> TaggedItemsType:
         raise NotImplementedError
 
     def rowCount(self, parent=QModelIndex()) -> int:
-        return len(self._data) if self._data is not None else 0
+        return len(self._rows)
+
+    def canFetchMore(self, parent=QModelIndex()) -> bool:
+        return not parent.isValid() and self._fetch_position < len(self._unfetched)
+
+    def fetchMore(self, parent=QModelIndex()) -> None:
+        if not self.canFetchMore(parent):
+            return
+        self._append_rows(self._next_batch())
+
+    def _fetch_all(self) -> None:
+        """Adds all rows that are not added yet, as one range"""
+        self._append_rows(self._next_batch(batch_size=len(self._unfetched)))
+
+    def _append_rows(self, batch: list[int]) -> None:
+        if not batch:
+            return
+        first_row = self.rowCount()
+        self.beginInsertRows(QModelIndex(), first_row, first_row + len(batch) - 1)
+        for identifier in batch:
+            self._rows.append(identifier)
+        self.endInsertRows()
 
     def columnCount(self, parent=...) -> int:
         return len(self.cols)
@@ -254,48 +362,90 @@ class TaggedItemsOverviewTableModel(QAbstractTableModel):
     ) -> TaggedItemType:
 
         # Add to data
-        self.beginInsertRows(QModelIndex(), self.rowCount(), self.rowCount())
-        row = self.rowCount()
         new_item = self._data.create_new_item(
             identifier=identifier, json_dict=json_dict
         )
-        self._row_to_id_map[row] = new_item.identifier
-        self.endInsertRows()
+        self._insert_new_rows([new_item.identifier])
 
-        # set selection to new item
-        if self._current_row:
-            deselected_index = self.createIndex(self._current_row, 0)
-            deselected = QItemSelection(deselected_index, deselected_index)
-        else:
-            deselected = QItemSelection(QModelIndex(), QModelIndex())
+        return new_item
 
-        selected_index = self.createIndex(row, 0)
+    def create_new_items(self, json_dicts: list[dict[str, Any]]) -> list[TaggedItemType]:
+        """Creates an item for every json dict, added as one range of rows, and selects the first of them"""
+        if not json_dicts:
+            return []
+
+        new_items = self._data.bulk_create(json_dicts)
+        self._insert_new_rows([new_item.identifier for new_item in new_items])
+
+        return new_items
+
+    def _insert_new_rows(self, identifiers: list[int]) -> tuple[int, int]:
+        """
+        Adds the rows of new items as one range and selects the first of them. Returns the first and last row.
+        New items come first when the newest items are shown first. Otherwise they come after the last row, the rows
+        that are not fetched yet are added first so that the new rows can be shown and stay in order.
+        """
+        if self._newest_first:
+            first_row, last_row = 0, len(identifiers) - 1
+            self.beginInsertRows(QModelIndex(), first_row, last_row)
+            for identifier in identifiers:
+                self._rows.prepend(identifier)
+            self.endInsertRows()
+            if self._current_row >= 0:
+                self._current_row += len(identifiers)
+            selected_row = first_row
+        else:
+            self._fetch_all()
+            first_row, last_row = self.rowCount(), self.rowCount() + len(identifiers) - 1
+            self.beginInsertRows(QModelIndex(), first_row, last_row)
+            for identifier in identifiers:
+                self._rows.append(identifier)
+            self.endInsertRows()
+            selected_row = first_row
+
+        deselected_index = self.index(self._current_row, 0)  # invalid if nothing is selected
+        deselected = QItemSelection(deselected_index, deselected_index)
+        selected_index = self.createIndex(selected_row, 0)
         selected = QItemSelection(selected_index, selected_index)
         self.change_selection(selected=selected, deselected=deselected)
+        return first_row, last_row
 
-        return new_item
-
-    def delete_item(self, delete_index: QModelIndex) -> None:
+    def delete_item(self, delete_index: QModelIndex, replacement: Optional[TaggedItemType] = None) -> None:
+        """
+        Deletes an item. Transactions that refer to it are made to refer to replacement, or to nothing if None.
+        """
         assert delete_index.isValid(), f"{delete_index}"
-        delete_row = delete_index.row()
-        delete_item = self.get_item(delete_index)
-
-        self.beginRemoveRows(QModelIndex(), delete_row, delete_row)
-        self._data.delete_item(delete_item)
-        _ = self._row_to_id_map.pop(delete_row)
-        self.endRemoveRows()
-
-        new_row_to_id_mapper = {}  # type: dict[int, int]
-        row = 0
-        for item in self._data.values():
-            new_row_to_id_mapper[row] = item.identifier
-            row += 1
-        self._row_to_id_map = new_row_to_id_mapper
+        self.delete_items([delete_index], replacement=replacement)
+
+    def delete_items(self, delete_indexes: Iterable[QModelIndex], replacement: Optional[TaggedItemType] = None) -> None:
+        """
+        Deletes the items at the indexes, e.g. of the selected rows, with one removal per range of consecutive rows.
+        Transactions that refer to them are made to refer to replacement, or to nothing if None.
+        """
+        rows = sorted({index.row() for index in delete_indexes if index.isValid()})
+        if not rows:
+            return
+        delete_items = [self._data[self._rows.identifier(row)] for row in rows]
+
+        with self._data.undo_log.group():  # the cascades are undone together with the deletion
+            for delete_item in delete_items:
+                self._projects_model.transactions_model.replace_references(delete_item, replacement)
+
+            # Remove the last range first, so that the rows of the other ranges stay valid
+            end = len(delete_items)
+            for first_row, last_row in reversed(_row_ranges(rows)):
+                start = end - (last_row - first_row + 1)
+                self.beginRemoveRows(QModelIndex(), first_row, last_row)
+                self._data.delete_items(delete_items[start:end])
+                for delete_item in delete_items[start:end]:
+                    self._rows.remove(delete_item.identifier)
+                self.endRemoveRows()
+                end = start
 
         # set selection to new project
         deselected = QItemSelection(QModelIndex(), QModelIndex())
 
-        if len(self._data) > 0:
+        if self.rowCount() > 0:
             selected_index = self.createIndex(0, 0)
             selected = QItemSelection(selected_index, selected_index)
         else:
@@ -303,30 +453,40 @@ class TaggedItemsOverviewTableModel(QAbstractTableModel):
 
         self.change_selection(selected=selected, deselected=deselected)
 
+    def merge_items(self, source_index: QModelIndex, target_index: QModelIndex) -> None:
+        """Merges the item at source_index into the item at target_index: references are moved, the source deleted"""
+        assert source_index.isValid() and target_index.isValid(), f"{source_index}, {target_index}"
+        assert source_index.row() != target_index.row(), "an item cannot be merged into itself"
+        self.delete_item(source_index, replacement=self.get_item(target_index))
+
     def copy_item(self, copy_index: QModelIndex) -> None:
         assert copy_index.isValid(), copy_index
-        copy_row = copy_index.row()
-
-        assert 0 <= copy_row < self.rowCount(), f"{copy_row}"
-
-        old_item = self.get_item(copy_index)
-
-        self.beginInsertRows(QModelIndex(), self.rowCount(), self.rowCount())
-        row = self.rowCount()
-        new_item = self._data.copy_item(old_item)
-        self._row_to_id_map[row] = new_item.identifier
-        self.endInsertRows()
-
-        # Set selection to copied item
-        top_left = self.index(row, 0)
-        bottom_right = self.index(row, 0)
-        self.dataChanged.emit(top_left, bottom_right, [Qt.ItemDataRole.DisplayRole])
-
-        deselected_index = self.createIndex(copy_row, 0)
-        deselected = QItemSelection(deselected_index, deselected_index)
-        selected_index = self.createIndex(row, 0)
-        selected = QItemSelection(selected_index, selected_index)
-        self.change_selection(selected=selected, deselected=deselected)
+        assert 0 <= copy_index.row() < self.rowCount(), f"{copy_index.row()}"
+        self.copy_items([copy_index])
+
+    def copy_items(self, copy_indexes: Iterable[QModelIndex]) -> None:
+        """Copies the items at the indexes, e.g. of the selected rows. The copies are added as one range of rows."""
+        rows = sorted({index.row() for index in copy_indexes if index.isValid()})
+        if not rows:
+            return
+        old_items = [self._data[self._rows.identifier(row)] for row in rows]
+
+        new_items = self._data.copy_items(old_items)
+        first_row, last_row = self._insert_new_rows([new_item.identifier for new_item in new_items])
+        self.dataChanged.emit(self.index(first_row, 0), self.index(last_row, 0), [Qt.ItemDataRole.DisplayRole])
+
+    def refresh(self, identifiers: Optional[set[int]] = None) -> None:
+        """
+        Lets views know that items were changed outside the model, e.g. by undoing.
+        :param identifiers: identifiers of the updated items, None if items were created or deleted
+        """
+        if identifiers is None:
+            self._set_current_project_data(project=self._projects_model.current_project)
+        elif identifiers:
+            rows = [self._rows.row(identifier) for identifier in identifiers if identifier in self._rows]
+            if rows:
+                self.dataChanged.emit(self.index(min(rows), 0), self.index(max(rows), self.columnCount() - 1))
+        self.current_item_changed.emit(self.current_item)
 
     @property
     def current_item(self) -> Optional[Any]:
@@ -336,4 +496,4 @@ class TaggedItemsOverviewTableModel(QAbstractTableModel):
         if not index.isValid():
             return None
 
-        return self._data[self._row_to_id_map[index.row()]]
+        return self._data[self._rows.identifier(index.row())]
@@ -92,27 +92,27 @@ class TransactionCSVReadersOverviewModel(TaggedItemsOverviewTableModel):
 
         if role == Qt.ItemDataRole.EditRole:
             if column == self.cols.NAME:
-                item.name = value
+                self._data.update_item(item, name=value)
                 self.dataChanged.emit(index, index, Qt.ItemDataRole.DisplayRole | Qt.ItemDataRole.EditRole)
                 return True
             elif column == self.cols.DATE_COLUMN:
-                item.column_map[TransactionCSVColumns.DATE] = int(value)
+                self._data.update_item(item, column_map=item.column_map | {TransactionCSVColumns.DATE: int(value)})
                 self.dataChanged.emit(index, index, Qt.ItemDataRole.DisplayRole | Qt.ItemDataRole.EditRole)
                 return True
             elif column == self.cols.AMOUNT_COLUMN:
-                item.column_map[TransactionCSVColumns.AMOUNT] = int(value)
+                self._data.update_item(item, column_map=item.column_map | {TransactionCSVColumns.AMOUNT: int(value)})
                 self.dataChanged.emit(index, index, Qt.ItemDataRole.DisplayRole | Qt.ItemDataRole.EditRole)
                 return True
             elif column == self.cols.COUNTERPART_COLUMN:
-                item.column_map[TransactionCSVColumns.COUNTERPART] = int(value)
+                self._data.update_item(item, column_map=item.column_map | {TransactionCSVColumns.COUNTERPART: int(value)})
                 self.dataChanged.emit(index, index, Qt.ItemDataRole.DisplayRole | Qt.ItemDataRole.EditRole)
                 return True
             elif column == self.cols.ACCOUNT_COLUMN:
-                item.column_map[TransactionCSVColumns.ACCOUNT] = int(value)
+                self._data.update_item(item, column_map=item.column_map | {TransactionCSVColumns.ACCOUNT: int(value)})
                 self.dataChanged.emit(index, index, Qt.ItemDataRole.DisplayRole | Qt.ItemDataRole.EditRole)
                 return True
             elif column == self.cols.NOTE_COLUMN:
-                item.column_map[TransactionCSVColumns.NOTE] = int(value)
+                self._data.update_item(item, column_map=item.column_map | {TransactionCSVColumns.NOTE: int(value)})
                 self.dataChanged.emit(index, index, Qt.ItemDataRole.DisplayRole | Qt.ItemDataRole.EditRole)
                 return True
             else:
@@ -71,11 +71,11 @@ class TransactionCategoriesOverviewModel(TaggedItemsOverviewTableModel):
 
         if role == Qt.ItemDataRole.EditRole:
             if column == self.cols.NAME:
-                item.name = value
+                self._data.update_item(item, name=value)
                 self.dataChanged.emit(index, index, Qt.ItemDataRole.DisplayRole)
                 return True
             elif column == self.cols.NOTE:
-                item.note = value
+                self._data.update_item(item, note=value)
                 self.dataChanged.emit(index, index, Qt.ItemDataRole.DisplayRole)
                 return True
             else:
@@ -1,7 +1,7 @@
 from typing import Optional, TYPE_CHECKING, Any
 
 from src.data.Currencies import Currencies
-from src.data.TaggedItems import TaggedItemsType
+from src.data.TaggedItems import TaggedItem, TaggedItemsType
 from src.data.settings.AppSettings import AppSettings
 from src.data.settings.GeneralSettings import GeneralSettingKeys
 from src.models.TaggedItems import TaggedItemsOverviewTableModel
@@ -34,6 +34,12 @@ class TransactionsOverviewTableModel(TaggedItemsOverviewTableModel):
                         Columns.ACCOUNT,)
 
     comboBoxOptionsRole = Qt.ItemDataRole.UserRole
+    # Column showing each attribute of a transaction that refers to another item
+    reference_columns = {
+        "account": Columns.ACCOUNT,
+        "category": Columns.CATEGORY,
+        "counterpart": Columns.COUNTERPART,
+    }
 
     def __init__(self,
                  projects_model: "ProjectsModel",
@@ -69,41 +75,51 @@ class TransactionsOverviewTableModel(TaggedItemsOverviewTableModel):
             return None
 
         column = index.column()
-        transaction = self.get_item(index)  # type: Transaction
+        identifier = self._rows.identifier(index.row())
+        transactions = self._data  # type: Transactions
+        # Values are read from the columns of the transaction store, no Transaction view is created per cell
 
         if role == Qt.ItemDataRole.DisplayRole:
             if column == self.cols.IDENTIFIER:
-                return f"{transaction.identifier}"
+                return f"{identifier}"
             elif column == self.cols.DATE:
-                qdate = QDate(transaction.date.year, transaction.date.month, transaction.date.day)
+                date = transactions.field(identifier, "date")
+                qdate = QDate(date.year, date.month, date.day)
                 return qdate
 
             elif column == self.cols.AMOUNT:
-                return f"{transaction.amount}"
+                return f"{transactions.field(identifier, 'amount')}"
             elif column == self.cols.COUNTERPART:
-                return f"{transaction.counterpart.name if transaction.counterpart is not None else ''}"
+                counterpart = transactions.field(identifier, "counterpart")
+                return f"{counterpart.name if counterpart is not None else ''}"
             elif column == self.cols.CATEGORY:
-                return f"{transaction.category.name if transaction.category is not None else ''}"
+                category = transactions.field(identifier, "category")
+                return f"{category.name if category is not None else ''}"
             elif column == self.cols.ACCOUNT:
-                return f"{transaction.account.name if transaction.account is not None else ''}"
+                account = transactions.field(identifier, "account")
+                return f"{account.name if account is not None else ''}"
             elif column == self.cols.NOTE:
-                return transaction.note
+                return transactions.field(identifier, "note")
             else:
                 raise NotImplementedError(f"DisplayRole for column {column} is not implemented."
                                           f"Accepted columns: {self.cols}")
 
         elif role == Qt.ItemDataRole.EditRole:
             if column == self.cols.DATE:
-                qdate = QDate(transaction.date.year, transaction.date.month, transaction.date.day)
+                date = transactions.field(identifier, "date")
+                qdate = QDate(date.year, date.month, date.day)
                 return qdate
             elif column == self.cols.AMOUNT:
-                return f"{transaction.amount}"
+                return f"{transactions.field(identifier, 'amount')}"
             elif column == self.cols.COUNTERPART:
-                return transaction.counterpart.identifier if transaction.counterpart is not None else None
+                counterpart = transactions.field(identifier, "counterpart")
+                return counterpart.identifier if counterpart is not None else None
             elif column == self.cols.CATEGORY:
-                return transaction.category.identifier if transaction.category is not None else None
+                category = transactions.field(identifier, "category")
+                return category.identifier if category is not None else None
             elif column == self.cols.ACCOUNT:
-                return transaction.account.identifier if transaction.account is not None else None
+                account = transactions.field(identifier, "account")
+                return account.identifier if account is not None else None
 
         elif role == self.comboBoxOptionsRole:
             if column == self.cols.ACCOUNT:
@@ -132,14 +148,14 @@ class TransactionsOverviewTableModel(TaggedItemsOverviewTableModel):
             if column == self.cols.DATE:
                 qdate: QDate = value
                 new_date = datetime.date(qdate.year(), qdate.month(), qdate.day())
-                transaction.date = new_date
+                self._data.update_item(transaction, date=new_date)
                 self.dataChanged.emit(index, index, Qt.ItemDataRole.DisplayRole | Qt.ItemDataRole.EditRole)
                 return True
 
             elif column == self.cols.AMOUNT:
                 amount = convert_string_to_amount(value)
                 if amount is not None:
-                    transaction.amount = amount
+                    self._data.update_item(transaction, amount=amount)
                     self.dataChanged.emit(index, index, Qt.ItemDataRole.DisplayRole | Qt.ItemDataRole.EditRole)
                     return True
                 return False
@@ -147,13 +163,13 @@ class TransactionsOverviewTableModel(TaggedItemsOverviewTableModel):
             elif column == self.cols.COUNTERPART:
                 identifier = value
                 if identifier is None or type(identifier) is not int:  # No valid selection, set to None
-                    transaction.counterpart = None
+                    self._data.update_item(transaction, counterpart=None)
                     self.dataChanged.emit(index, index, Qt.ItemDataRole.DisplayRole | Qt.ItemDataRole.EditRole)
                     return True
 
                 counterparts = self._projects_model.current_project.counterparts
                 if identifier in counterparts:
-                    transaction.counterpart = counterparts[identifier]
+                    self._data.update_item(transaction, counterpart=counterparts[identifier])
                     self.dataChanged.emit(index, index, Qt.ItemDataRole.DisplayRole | Qt.ItemDataRole.EditRole)
                     return True
                 return False
@@ -161,13 +177,13 @@ class TransactionsOverviewTableModel(TaggedItemsOverviewTableModel):
             elif column == self.cols.CATEGORY:
                 identifier = value
                 if identifier is None or type(identifier) is not int:  # No valid selection, set to None
-                    transaction.category = None
+                    self._data.update_item(transaction, category=None)
                     self.dataChanged.emit(index, index, Qt.ItemDataRole.DisplayRole | Qt.ItemDataRole.EditRole)
                     return True
 
                 categories = self._projects_model.current_project.transaction_categories
                 if identifier in categories:
-                    transaction.category = categories[identifier]
+                    self._data.update_item(transaction, category=categories[identifier])
                     self.dataChanged.emit(index, index, Qt.ItemDataRole.DisplayRole | Qt.ItemDataRole.EditRole)
                     return True
                 return False
@@ -175,13 +191,13 @@ class TransactionsOverviewTableModel(TaggedItemsOverviewTableModel):
             elif column == self.cols.ACCOUNT:
                 identifier = value
                 if identifier is None or type(identifier) is not int:  # No valid selection, set to None
-                    transaction.account = None
+                    self._data.update_item(transaction, account=None)
                     self.dataChanged.emit(index, index, Qt.ItemDataRole.DisplayRole | Qt.ItemDataRole.EditRole)
                     return True
 
                 accounts = self._projects_model.current_project.bank_accounts
                 if identifier in accounts:
-                    transaction.account = accounts[identifier]
+                    self._data.update_item(transaction, account=accounts[identifier])
                     self.dataChanged.emit(index, index, Qt.ItemDataRole.DisplayRole | Qt.ItemDataRole.EditRole)
                     return True
                 return False
@@ -191,6 +207,25 @@ class TransactionsOverviewTableModel(TaggedItemsOverviewTableModel):
 
         return False
 
+    def replace_references(self, item: TaggedItem, replacement: Optional[TaggedItem] = None) -> None:
+        """
+        Makes the transactions that refer to item refer to replacement instead, or to nothing if replacement is None.
+        Views are notified of all changed transactions at once.
+        """
+        if self._data is None:
+            return
+
+        identifiers = self._data.replace_references(item, replacement)
+        if not identifiers:
+            return
+
+        column = self.reference_columns[Transactions.reference_names[type(item)]]
+        rows = [self._rows.row(identifier) for identifier in identifiers if identifier in self._rows]
+        if not rows:
+            return  # only transactions in rows that are not fetched yet
+        self.dataChanged.emit(self.index(min(rows), column), self.index(max(rows), column),
+                              [Qt.ItemDataRole.DisplayRole, Qt.ItemDataRole.EditRole])
+
     def headerData(self, section, orientation, role=Qt.ItemDataRole.DisplayRole) -> Any:
         if orientation == Qt.Orientation.Vertical:
             return None
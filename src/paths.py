@@ -8,6 +8,7 @@ ROOT_DIR = _this_file_dir.parent
 
 # Define other important paths relative to the root
 LOGS_DIR = ROOT_DIR / "logs"
+CACHE_DIR = ROOT_DIR / "cache"
 RESOURCES_DIR = ROOT_DIR / "resources"
 TESTS_DIR = ROOT_DIR / "tests"
 SOURCE_DIR = ROOT_DIR / "src"
@@ -1,7 +1,7 @@
 from optparse import Option
-from typing import Optional
+from typing import Optional, TYPE_CHECKING
 
-from PySide6.QtWidgets import QMainWindow, QMenuBar, QSplitter, QToolBar, QWidget
+from PySide6.QtWidgets import QMainWindow, QMenuBar, QMessageBox, QSplitter, QToolBar, QWidget
 
 from src.data.settings.AppSettings import AppSettings
 from src.models.Projects import ProjectsModel
@@ -9,6 +9,9 @@ from src.ui.SideBar import SideBar
 from src.ui.WelcomePage import WelcomePage
 from src.ui.menus.MainMenuBar import MainMenuBar
 
+if TYPE_CHECKING:
+    from src.data.Projects import Project
+
 
 class MainWindow(QMainWindow):
     def __init__(self, projects_model: ProjectsModel, settings: AppSettings) -> None:
@@ -20,6 +23,7 @@ class MainWindow(QMainWindow):
         self._current_page = None  # type: Optional[QWidget]
 
         self._setup_ui()
+        self._setup_connections()
 
         self.showMaximized()
 
@@ -29,6 +33,20 @@ class MainWindow(QMainWindow):
         self._create_central_widget()
         self._create_menu_bar()
 
+    def _setup_connections(self) -> None:
+        self._projects_model.project_saved.connect(self._show_project_saved)
+        self._projects_model.project_save_failed.connect(self._show_project_save_failed)
+        self._projects_model.project_open_failed.connect(self._show_project_open_failed)
+
+    def _show_project_saved(self, project: "Project") -> None:
+        self.statusBar().showMessage(f"Saved {project.folder_name}", 5000)
+
+    def _show_project_save_failed(self, project: "Project", error: str) -> None:
+        QMessageBox.critical(self, "Save Failed", f"Failed to save {project.project_dir}:\n{error}")
+
+    def _show_project_open_failed(self, project_directory: str, error: str) -> None:
+        QMessageBox.critical(self, "Open Failed", f"Failed to open {project_directory}:\n{error}")
+
     def _create_central_widget(self):
         """Creates a placeholder widget for the main window."""
 
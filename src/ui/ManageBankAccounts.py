@@ -18,6 +18,7 @@ from PySide6.QtWidgets import (
 from src.data.settings.AppSettings import AppSettings
 from src.models.BankAccounts import BankAccountsOverviewListModel, BankAccountDataModel
 from src.models.Projects import ProjectsModel
+from src.ui.menus.MergeMenu import MergeMenu
 
 
 class BankAccountsListView(QListView):
@@ -42,6 +43,9 @@ class BankAccountsListView(QListView):
             delete_action.triggered.connect(lambda: model.delete_item(index))
             menu.addAction(delete_action)
 
+            # Merging moves the transactions of this bank account to another one and deletes this bank account
+            menu.addMenu(MergeMenu(model=model, index=index, parent=menu))
+
             # Show the menu at the cursor position
             menu.exec(self.viewport().mapToGlobal(position))
 
@@ -120,4 +124,4 @@ class ManageBankAccountsDialog(QDialog):
         self._account_selection_model.selectionChanged.connect(
             self._accounts_model.change_selection
         )
-        self._new_account_button.clicked.connect(self._accounts_model.create_new_item)
+        self._new_account_button.clicked.connect(lambda: self._accounts_model.create_new_item())
@@ -18,6 +18,7 @@ from PySide6.QtWidgets import (
 from src.data.settings.AppSettings import AppSettings
 from src.models.CounterParts import CounterPartsOverviewListModel, CounterPartDataModel
 from src.models.Projects import ProjectsModel
+from src.ui.menus.MergeMenu import MergeMenu
 
 
 class CounterPartsListView(QListView):
@@ -42,6 +43,9 @@ class CounterPartsListView(QListView):
             delete_action.triggered.connect(lambda: model.delete_item(index))
             menu.addAction(delete_action)
 
+            # Merging moves the transactions of this counter part to another one and deletes this counter part
+            menu.addMenu(MergeMenu(model=model, index=index, parent=menu))
+
             # Show the menu at the cursor position
             menu.exec(self.viewport().mapToGlobal(position))
 
@@ -120,4 +124,4 @@ class ManageCounterPartsDialog(QDialog):
         self._counterpart_selection_model.selectionChanged.connect(
             self._counterparts_model.change_selection
         )
-        self._new_counterpart_button.clicked.connect(self._counterparts_model.create_new_item)
+        self._new_counterpart_button.clicked.connect(lambda: self._counterparts_model.create_new_item())
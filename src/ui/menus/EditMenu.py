@@ -0,0 +1,42 @@
+from PySide6.QtGui import QAction, QKeySequence
+from PySide6.QtWidgets import QMenu
+from typing import TYPE_CHECKING, Any
+
+from src.data.settings.AppSettings import AppSettings
+from src.models.Projects import ProjectsModel
+
+if TYPE_CHECKING:
+    from src.ui.MainWindow import MainWindow
+
+
+class EditMenu(QMenu):
+
+    def __init__(self, projects_model: ProjectsModel, settings: AppSettings, parent: "MainWindow") -> None:
+        super().__init__(title="Edit", parent=parent)
+
+        self._projects_model = projects_model
+        self._settings = settings
+        self._main_window = parent
+
+        # Undo Action
+        self._undo_action = QAction("Undo", self)
+        self._undo_action.setShortcut(QKeySequence.StandardKey.Undo)
+        self._undo_action.triggered.connect(self._projects_model.undo)
+        self.addAction(self._undo_action)
+
+        # Redo Action
+        self._redo_action = QAction("Redo", self)
+        self._redo_action.setShortcut(QKeySequence.StandardKey.Redo)
+        self._redo_action.triggered.connect(self._projects_model.redo)
+        self.addAction(self._redo_action)
+
+        self._setup_connections()
+        self._update_actions()
+
+    def _setup_connections(self) -> None:
+        self._projects_model.current_project_changed.connect(self._update_actions)
+        self._projects_model.undo_state_changed.connect(self._update_actions)
+
+    def _update_actions(self, *_: Any) -> None:
+        self._undo_action.setEnabled(self._projects_model.can_undo)
+        self._redo_action.setEnabled(self._projects_model.can_redo)
@@ -1,9 +1,11 @@
 
-from PySide6.QtWidgets import QMenu, QDialog, QFileDialog
+from PySide6.QtCore import Qt
+from PySide6.QtWidgets import QMenu, QDialog, QFileDialog, QProgressDialog
 from PySide6.QtGui import QAction
 from typing import TYPE_CHECKING
 
 from src.data.settings.AppSettings import AppSettings
+from src.data.storage.SQLiteProjectStore import SQLiteProjectStore
 from src.models.Projects import ProjectsModel
 from src.ui.file.NewProjectDialog import NewProjectDialog
 from src.ui.settings.SettingsDialog import SettingsDialog
@@ -34,6 +36,12 @@ class FileMenu(QMenu):
         open_project_action.triggered.connect(self._open_project)
         self.addAction(open_project_action)
 
+        # Open Projects in Folder Action
+        open_projects_action = QAction("Open Projects in Folder", self)
+        open_projects_action.setStatusTip("Open all projects in the subdirectories of a folder")
+        open_projects_action.triggered.connect(self._open_projects_in_folder)
+        self.addAction(open_projects_action)
+
         # Add separator
         self.addSeparator()
 
@@ -55,6 +63,12 @@ class FileMenu(QMenu):
         save_all_action.triggered.connect(self._save_all_projects)
         self.addAction(save_all_action)
 
+        # Export Action
+        export_action = QAction("Export as JSON", self)
+        export_action.setStatusTip("Writes the active project to a single, readable JSON file")
+        export_action.triggered.connect(self._export_current_project)
+        self.addAction(export_action)
+
         # Add separator
         self.addSeparator()
 
@@ -99,7 +113,32 @@ class FileMenu(QMenu):
         )
 
         if os.path.isdir(directory_path):
-            self._projects_model.open_project(project_directory=directory_path)
+            # Modal progress dialog, updating its value processes events so the UI keeps painting while loading
+            progress_dialog = QProgressDialog("Opening project...", None, 0, 100, self._main_window)
+            progress_dialog.setWindowModality(Qt.WindowModality.WindowModal)
+            progress_dialog.setMinimumDuration(500)
+            self._projects_model.load_progress_changed.connect(progress_dialog.setValue)
+            try:
+                self._projects_model.open_project(project_directory=directory_path)
+            finally:
+                self._projects_model.load_progress_changed.disconnect(progress_dialog.setValue)
+                progress_dialog.close()
+
+    def _open_projects_in_folder(self):
+        directory_path = str(
+            QFileDialog.getExistingDirectory(self, "Select Folder Containing Projects")
+        )
+        if not os.path.isdir(directory_path):
+            return
+
+        project_directories = []
+        for entry in sorted(os.scandir(directory_path), key=lambda entry: entry.name):
+            if entry.is_dir() and any(os.path.isfile(os.path.join(entry.path, filename))
+                                      for filename in ("project.json", SQLiteProjectStore.filename)):
+                project_directories.append(entry.path)
+
+        if project_directories:
+            self._projects_model.open_projects(project_directories=project_directories)
 
     def _save_current_project(self):
         self._projects_model.save_current_project()
@@ -113,6 +152,15 @@ class FileMenu(QMenu):
     def _save_all_projects(self):
         self._projects_model.save_all_projects()
 
+    def _export_current_project(self) -> None:
+        project = self._projects_model.current_project
+        if project is None:
+            return
+
+        filename, _ = QFileDialog.getSaveFileName(self, "Export Project", f"{project.folder_name}.json", "JSON (*.json)")
+        if filename:
+            project.export_json(filename)
+
     def _close_current_project(self) -> None:
         self._projects_model.close_current_project()
 
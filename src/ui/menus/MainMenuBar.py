@@ -4,6 +4,7 @@ from src.data.settings.AppSettings import AppSettings
 from src.models.Projects import ProjectsModel
 from typing import TYPE_CHECKING
 
+from src.ui.menus.EditMenu import EditMenu
 from src.ui.menus.FileMenu import FileMenu
 from src.ui.menus.TransactionsMenu import TransactionsMenu
 
@@ -26,9 +27,11 @@ class MainMenuBar(QMenuBar):
 
     def _create_menus(self) -> None:
         self._file_menu = FileMenu(projects_model=self._projects_model, settings=self._settings, parent=self._main_window)
+        self._edit_menu = EditMenu(projects_model=self._projects_model, settings=self._settings, parent=self._main_window)
         self._transactions_menu = TransactionsMenu(projects_model=self._projects_model, settings=self._settings, parent=self._main_window)
 
         self.addMenu(self._file_menu)
+        self.addMenu(self._edit_menu)
         self.addMenu(self._transactions_menu)
 
     def _toggle_menus(self) -> None:
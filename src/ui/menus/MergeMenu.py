@@ -0,0 +1,30 @@
+from typing import Union
+
+from PySide6.QtCore import QModelIndex, Qt
+from PySide6.QtGui import QAction
+from PySide6.QtWidgets import QMenu, QWidget
+
+from src.models.TaggedItems import TaggedItemsListModel, TaggedItemsOverviewTableModel
+
+
+class MergeMenu(QMenu):
+    """
+    "Merge into" submenu of the context menu of the item at index, listing the other items of the model.
+    Merging moves the transactions of that item to the chosen one and deletes the item
+    """
+
+    def __init__(self,
+                 model: Union[TaggedItemsListModel, TaggedItemsOverviewTableModel],
+                 index: QModelIndex,
+                 parent: QWidget) -> None:
+        super().__init__(title="Merge into", parent=parent)
+
+        for row in range(model.rowCount()):
+            if row != index.row():
+                target_index = model.index(row, 0)
+                merge_action = QAction(model.data(target_index, Qt.ItemDataRole.DisplayRole), self)
+                merge_action.triggered.connect(
+                    lambda checked=False, target=target_index: model.merge_items(index, target)
+                )
+                self.addAction(merge_action)
+        self.setEnabled(model.rowCount() > 1)
@@ -131,7 +131,27 @@ class TransactionsTableView(QTableView):
         index = self.indexAt(position)  # type: QModelIndex
 
         if index.isValid():
-            pass
+            model: TransactionsOverviewTableModel = index.model()
+
+            # Acts on all selected rows, or on the clicked row if it is not selected
+            indexes = self.selectedIndexes()
+            if index not in indexes:
+                indexes = [index]
+            n_rows = len({selected_index.row() for selected_index in indexes})
+            suffix = "transaction" if n_rows == 1 else f"{n_rows} transactions"
+
+            menu = QMenu(self)
+
+            duplicate_action = QAction(f"Duplicate {suffix}", self)
+            duplicate_action.triggered.connect(lambda checked=False: model.copy_items(indexes))
+            menu.addAction(duplicate_action)
+
+            delete_action = QAction(f"Delete {suffix}", self)
+            delete_action.triggered.connect(lambda checked=False: model.delete_items(indexes))
+            menu.addAction(delete_action)
+
+            # Show the menu at the cursor position
+            menu.exec(self.viewport().mapToGlobal(position))
 
 
 class EditTransactionsPage(QWidget):
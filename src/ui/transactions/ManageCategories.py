@@ -18,6 +18,7 @@ from src.data.settings.AppSettings import AppSettings
 if TYPE_CHECKING:
     from src.models.Projects import ProjectsModel
 from src.models.TransactionCategories import TransactionCategoriesOverviewModel
+from src.ui.menus.MergeMenu import MergeMenu
 
 
 class CategoriesTableView(QTableView):
@@ -42,6 +43,9 @@ class CategoriesTableView(QTableView):
             delete_action.triggered.connect(lambda: model.delete_item(index))
             menu.addAction(delete_action)
 
+            # Merging moves the transactions of this category to another one and deletes this category
+            menu.addMenu(MergeMenu(model=model, index=index, parent=menu))
+
             # Show the menu at the cursor position
             menu.exec(self.viewport().mapToGlobal(position))
 
@@ -101,4 +105,4 @@ class CategoriesDialog(QDialog):
             self._categories_model.change_selection
         )
 
-        self._new_category_button.clicked.connect(self._categories_model.create_new_item)
\ No newline at end of file
+        self._new_category_button.clicked.connect(lambda: self._categories_model.create_new_item())
\ No newline at end of file
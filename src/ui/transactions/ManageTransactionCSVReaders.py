@@ -113,4 +113,4 @@ class ReadersDialog(QDialog):
             self._readers_model.change_selection
         )
 
-        self._new_reader_button.clicked.connect(self._readers_model.create_new_item)
\ No newline at end of file
+        self._new_reader_button.clicked.connect(lambda: self._readers_model.create_new_item())
\ No newline at end of file
@@ -1,6 +1,8 @@
-from decimal import Decimal, InvalidOperation, ROUND_HALF_UP
+from decimal import Decimal
 from typing import Optional
 
+from src.data.Money import Money
+
 
 def convert_string_to_amount(input_string: str) -> Optional[Decimal]:
     """
@@ -19,24 +21,7 @@ def convert_string_to_amount(input_string: str) -> Optional[Decimal]:
         return None
 
     try:
-        # Attempt to convert the string to a Decimal
-        d = Decimal(input_string)
-
-        # First, ensure it's not NaN or Infinity, which can be valid Decimal objects
-        if d.is_nan() or d.is_infinite():
-            return None
-
-        # Define the precision for two decimal places
-        # This creates a Decimal '0.01' which is used to set the precision context.
-        two_places = Decimal('0.01')
-
-        # Quantize the Decimal to two decimal places, rounding if necessary.
-        # ROUND_HALF_UP is a common rounding strategy (rounds .5 up).
-        return d.quantize(two_places, rounding=ROUND_HALF_UP)
-
-    except InvalidOperation:
-        # This exception is raised if the string cannot be converted to a Decimal
+        # Parsed as whole cents, rounding half up (away from zero) if necessary, see Money.from_string
+        return Money.from_string(input_string).to_decimal()
+    except ValueError:
         return None
-    except TypeError:
-        # This might be raised if the input 'input_string' is not a string
-        return None
\ No newline at end of file
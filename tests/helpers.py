@@ -0,0 +1,81 @@
+import datetime
+import tempfile
+import unittest
+from typing import Any, Optional
+
+from PySide6.QtCore import QCoreApplication
+
+from src.data.Projects import Project, Projects
+from src.data.settings.AppSettings import AppSettings
+from src.data.settings.GeneralSettings import GeneralSettingKeys
+from src.models.Projects import ProjectsModel
+
+
+def transaction_dicts(n: int,
+                      first_date: datetime.date = datetime.date(2024, 3, 1),
+                      daily: bool = False,
+                      cents: int = 0,
+                      account: Optional[int] = None,
+                      category: Optional[int] = None,
+                      note: str = "",
+                      ) -> list[dict[str, Any]]:
+    """
+    Returns the json dicts of n transactions with amounts 0, 1, 2, ... plus cents.
+    :param daily: whether the transactions are on consecutive days from first_date instead of all on first_date
+    """
+    return [{"date": (first_date + datetime.timedelta(days=i if daily else 0)).isoformat(),
+             "counterpart": None,
+             "amount": f"{i}.{cents:02d}",
+             "account": account,
+             "category": category,
+             "note": note,
+             } for i in range(n)]
+
+
+class ProjectTestCase(unittest.TestCase):
+    """
+    Test case with settings and a temporary project directory.
+    The project cache is off, so that tests neither read nor write the cache of the user.
+    """
+
+    # Settings of the test case, applied on top of the defaults
+    general_settings = {}  # type: dict[GeneralSettingKeys, Any]
+
+    def setUp(self):
+        self._tmp_dir = tempfile.TemporaryDirectory()
+        self.project_dir = self._tmp_dir.name
+        self.settings = AppSettings()
+        self.settings.general[GeneralSettingKeys.PROJECT_CACHE].value = False
+        for key, value in self.general_settings.items():
+            self.settings.general[key].value = value
+
+    def tearDown(self):
+        self._tmp_dir.cleanup()
+
+    def new_project(self, project_dir: Optional[str] = None) -> Project:
+        """Returns a new project in project_dir, in the project directory of the test case if None"""
+        return Project(identifier=0, project_directory=project_dir or self.project_dir, settings=self.settings)
+
+    def open_project(self, project_dir: Optional[str] = None) -> Project:
+        """Loads the project from project_dir, from the project directory of the test case if None"""
+        return Project(identifier=0, project_directory=project_dir or self.project_dir, settings=self.settings,
+                       load_from_dir=True)
+
+
+class ProjectsModelTestCase(ProjectTestCase):
+    """
+    Test case with a projects model whose current project is a new project in the temporary project directory.
+    """
+
+    general_settings = {GeneralSettingKeys.AUTOSAVE_ENABLED: False}
+
+    def setUp(self):
+        super().setUp()
+        self._app = QCoreApplication.instance() or QCoreApplication([])
+        self.projects_model = ProjectsModel(projects=Projects(settings=self.settings), settings=self.settings, parent=None)
+        self.projects_model.create_new_project(project_directory=self.project_dir)
+        self.project = self.projects_model.current_project
+
+    def tearDown(self):
+        self.project.wait_for_background_tasks()
+        super().tearDown()
@@ -0,0 +1,61 @@
+from src.data.settings.GeneralSettings import GeneralSettingKeys
+from tests.helpers import ProjectsModelTestCase
+
+
+class TestAutosave(ProjectsModelTestCase):
+    """
+    Tests scheduling automatic saves after edits.
+    """
+
+    general_settings = ProjectsModelTestCase.general_settings | {
+        GeneralSettingKeys.AUTOSAVE_ENABLED: True,
+        GeneralSettingKeys.AUTOSAVE_DELAY: 3,
+        GeneralSettingKeys.AUTOSAVE_MIN_INTERVAL: 30,
+    }
+
+    def setUp(self):
+        super().setUp()
+        self.autosave = self.projects_model.autosave
+
+    def test_edits_are_coalesced(self):
+        """
+        A burst of model edits schedules a single save after the delay, which is written when flushed.
+        """
+        for _ in range(5):
+            self.projects_model.transaction_categories_model.create_new_item()
+
+        self.assertTrue(self.autosave.has_pending_saves)
+        self.assertEqual(len(self.autosave._timers), 1)
+        timer = self.autosave._timers[self.project.identifier]
+        self.assertTrue(timer.isActive())
+        self.assertLessEqual(timer.interval(), 3000)
+
+        self.autosave.flush()
+        self.project.wait_for_background_tasks()
+        self.assertFalse(self.autosave.has_pending_saves)
+        self.assertFalse(self.project.is_dirty)
+
+    def test_minimum_interval(self):
+        """
+        Edits right after an autosave are saved no earlier than the minimum interval after it.
+        """
+        self.projects_model.transaction_categories_model.create_new_item()
+        self.autosave.flush()
+        self.project.wait_for_background_tasks()
+
+        self.projects_model.transaction_categories_model.create_new_item()
+        remaining = self.autosave._timers[self.project.identifier].interval()
+        self.assertGreater(remaining, 25000)
+
+    def test_clean_project_is_not_scheduled(self):
+        """
+        Change signals that don't modify the project, like selection changes, don't schedule a save.
+        """
+        self.project.save_project()
+        self.project.wait_for_background_tasks()
+
+        self.projects_model.transaction_categories_model.dataChanged.emit(
+            self.projects_model.transaction_categories_model.index(0, 0),
+            self.projects_model.transaction_categories_model.index(0, 0),
+        )
+        self.assertFalse(self.autosave.has_pending_saves)
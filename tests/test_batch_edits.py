@@ -0,0 +1,57 @@
+import unittest
+
+from PySide6.QtCore import Qt
+
+from src.models.Transactions import Columns
+from tests.helpers import ProjectsModelTestCase, transaction_dicts
+
+
+class TestBatchEdits(ProjectsModelTestCase):
+    """
+    Tests creating, deleting and copying many rows at once through the models.
+    """
+
+    def setUp(self):
+        super().setUp()
+        self.model = self.projects_model.transactions_model
+        self.model.create_new_items([json_dict | {"note": str(i)}
+                                     for i, json_dict in enumerate(transaction_dicts(1000))])
+
+        self.removed = []
+        self.inserted = []
+        self.model.rowsRemoved.connect(lambda parent, first, last: self.removed.append((first, last)))
+        self.model.rowsInserted.connect(lambda parent, first, last: self.inserted.append((first, last)))
+
+    def _notes(self) -> list[str]:
+        return [self.model.data(self.model.index(row, Columns.NOTE), Qt.ItemDataRole.DisplayRole)
+                for row in range(self.model.rowCount())]
+
+    def test_delete_items(self):
+        """
+        Deleting a selection removes every range of consecutive rows at once, undoing restores all rows.
+        """
+        rows = list(range(10, 500)) + list(range(600, 1000))
+        self.model.delete_items([self.model.index(row, column) for row in rows for column in (0, Columns.NOTE)])
+
+        self.assertEqual(self.removed, [(600, 999), (10, 499)])
+        self.assertEqual(self._notes(), [str(i) for i in list(range(10)) + list(range(500, 600))])
+        self.assertEqual(len(self.project.transactions), 110)
+        self.assertEqual(self.model.current_item.note, "0")
+
+        self.projects_model.undo()
+        self.assertEqual(sorted(self._notes(), key=int), [str(i) for i in range(1000)])
+
+    def test_copy_items(self):
+        """
+        Copies of a selection are added as one range of rows, the first copy is selected.
+        """
+        self.model.copy_items([self.model.index(row, 0) for row in (5, 3, 7, 3)])
+
+        self.assertEqual(self.inserted, [(1000, 1002)])
+        self.assertEqual(self._notes()[1000:], ["3", "5", "7"])
+        self.assertEqual(self.model.current_item.note, "3")
+        self.assertEqual(self.project.transactions[1000].amount, self.project.transactions[3].amount)
+
+
+if __name__ == "__main__":
+    unittest.main()
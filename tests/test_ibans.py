@@ -0,0 +1,48 @@
+import tempfile
+import unittest
+
+from src.data.Ibans import _parse_normalized, get_iban, parse_iban, validate_ibans
+from src.data.Projects import Project
+from src.data.settings.AppSettings import AppSettings
+
+
+class TestIbans(unittest.TestCase):
+    """
+    Tests parsing IBANs through the shared cache and looking up counterparts by IBAN.
+    """
+
+    def test_parse_once(self):
+        """
+        Every distinct IBAN is parsed once, regardless of spacing and case.
+        """
+        _parse_normalized.cache_clear()
+        ibans = validate_ibans(["NL91 ABNA 0417 1643 00", "nl91abna0417164300", "NL00ABNA0417164300", "abc"] * 100)
+
+        self.assertEqual(len(ibans), 4)
+        self.assertIs(ibans["NL91 ABNA 0417 1643 00"], ibans["nl91abna0417164300"])
+        self.assertEqual(str(parse_iban("NL91ABNA0417164300")), "NL91ABNA0417164300")
+        self.assertIsNone(ibans["NL00ABNA0417164300"])
+        self.assertIsNone(ibans["abc"])
+        self.assertEqual(_parse_normalized.cache_info().misses, 3)
+        with self.assertRaises(ValueError):
+            get_iban("NL00ABNA0417164300")
+
+    def test_find_counterpart(self):
+        """
+        Counterparts are found by IBAN as they are created, edited and deleted.
+        """
+        with tempfile.TemporaryDirectory() as project_dir:
+            counterparts = Project(identifier=0, project_directory=project_dir, settings=AppSettings()).counterparts
+            first = counterparts.create_new_item(json_dict={"name": "A", "iban": "NL91ABNA0417164300", "note": ""})
+            self.assertEqual(counterparts.find_by_iban("nl91 abna 0417 1643 00").identifier, first.identifier)
+
+            second = counterparts.create_new_item(json_dict={"name": "B", "iban": "DE89370400440532013000", "note": ""})
+            duplicate = counterparts.create_new_item(json_dict={"name": "C", "iban": "NL91ABNA0417164300", "note": ""})
+            self.assertEqual(counterparts.find_by_iban("DE89370400440532013000").identifier, second.identifier)
+
+            counterparts.update_item(second, iban=get_iban("GB82WEST12345698765432"))
+            self.assertIsNone(counterparts.find_by_iban("DE89370400440532013000"))
+            self.assertEqual(counterparts.find_by_iban("GB82WEST12345698765432").identifier, second.identifier)
+
+            counterparts.delete_item(first)
+            self.assertEqual(counterparts.find_by_iban("NL91ABNA0417164300").identifier, duplicate.identifier)
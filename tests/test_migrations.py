@@ -0,0 +1,64 @@
+import json
+import os
+
+from src.data.settings.ComboBoxChoices import ProjectStorages
+from src.data.settings.GeneralSettings import GeneralSettingKeys
+from src.data.storage.Migrations import FORMAT_VERSION, FORMAT_VERSION_KEY, MISSING, migrate_collection, to_columns
+from src.data.storage.SQLiteProjectStore import SQLiteProjectStore
+from tests.helpers import ProjectTestCase
+
+
+class TestMigrations(ProjectTestCase):
+    """
+    Tests upgrading projects written in older formats.
+    """
+
+    def _write_project_json(self, json_dict: dict) -> None:
+        with open(os.path.join(self.project_dir, "project.json"), "w") as write_file:
+            json.dump(json_dict, write_file, indent=4)
+
+    def test_migrate_collection(self):
+        """
+        Collections are upgraded column by column, fields that are not migrated are kept as they are.
+        """
+        items = {"0": {"identifier": 0, "name": "Rent"}, "1": {"identifier": 1, "name": "Food", "note": "weekly"}}
+        self.assertEqual(to_columns(items), {"identifier": [0, 1], "name": ["Rent", "Food"], "note": [MISSING, "weekly"]})
+
+        migrated = migrate_collection("transaction_categories", items, version=0)
+        self.assertEqual(migrated, {"0": {"identifier": 0, "name": "Rent", "note": ""},
+                                    "1": {"identifier": 1, "name": "Food", "note": "weekly"}})
+        self.assertIs(migrate_collection("transaction_categories", items, version=FORMAT_VERSION), items)
+
+    def test_unversioned_project_is_upgraded(self):
+        """
+        A project without format version is migrated while loading and saved in the current format and storage.
+        """
+        self._write_project_json({
+            "transaction_categories": {"0": {"identifier": 0, "name": "Rent"}},
+            "transactions": {"0": {"identifier": 0, "date": "2024-01-01", "amount": "-950.00", "account": None}},
+        })
+
+        project = self.open_project()
+        self.assertEqual(project.transactions[0].note, "")
+        self.assertIsNone(project.transactions[0].category)
+        self.assertTrue(project.is_dirty)
+
+        self.settings.general[GeneralSettingKeys.PROJECT_STORAGE].value = ProjectStorages.SQLITE
+        project.save_project()
+        project.wait_for_background_tasks()
+        self.assertFalse(project.is_dirty)
+
+        store = SQLiteProjectStore(self.project_dir)
+        self.assertEqual(store.format_version, FORMAT_VERSION)
+        store.close()
+        reopened = self.open_project()
+        self.assertEqual(reopened.transaction_categories[0].name, "Rent")
+        self.assertFalse(reopened.is_dirty)
+
+    def test_newer_version_is_refused(self):
+        """
+        Projects written by a newer version of the application are not loaded.
+        """
+        self._write_project_json({FORMAT_VERSION_KEY: FORMAT_VERSION + 1, "transaction_categories": {}})
+        with self.assertRaises(ValueError):
+            self.open_project()
@@ -0,0 +1,52 @@
+import unittest
+from decimal import ROUND_HALF_UP, Decimal
+
+from src.data.Currencies import Currencies
+from src.data.Money import Money
+from src.utils.input_processing import convert_string_to_amount
+
+
+class TestMoney(unittest.TestCase):
+    """
+    Tests the integer cents Money type.
+    """
+
+    def test_from_string_matches_decimal(self):
+        """
+        Parsing with integer arithmetic rounds like Decimal.quantize with ROUND_HALF_UP.
+        """
+        for text in ("0", "1", "-1", "12.3", "12.34", "12.345", "-12.345", "12.3449", "-0.005", "+7.", ".5", "-.999",
+                     "1e3", " 4.20 ", "1_000.5", "123456789012345.6789", "0.0050000000000000000000000000001"):
+            expected = Decimal(text).quantize(Decimal("0.01"), rounding=ROUND_HALF_UP)
+            self.assertEqual(Money.from_string(text).to_decimal(), expected, text)
+            self.assertEqual(str(Money.from_string(text)), str(expected).replace("-0.00", "0.00"), text)
+
+        for text in ("", " ", ".", "-", "1.2.3", "abc", "NaN", "Infinity"):
+            with self.assertRaises(ValueError):
+                Money.from_string(text)
+
+    def test_from_string_out_of_range(self):
+        """
+        Amounts that do not fit in int64 cents are rejected instead of overflowing where they are stored.
+        """
+        self.assertEqual(Money.from_string("92233720368547758.07").cents, 2 ** 63 - 1)
+        self.assertEqual(Money.from_string("-92233720368547758.08").cents, -2 ** 63)
+
+        for text in ("92233720368547758.08", "-92233720368547758.09", "99999999999999999999", "1e30",
+                     "111111111111111111111111111111"):
+            with self.assertRaises(ValueError):
+                Money.from_string(text)
+            self.assertIsNone(convert_string_to_amount(text), text)
+
+    def test_arithmetic(self):
+        """
+        Money is added, subtracted and compared exactly, only within a currency.
+        """
+        amounts = [Money.from_string("0.10", Currencies.EUR)] * 10
+        self.assertEqual(sum(amounts), Money(100, Currencies.EUR))
+        self.assertEqual(amounts[0] * 3 - Money(5, Currencies.EUR), Money(25, Currencies.EUR))
+        self.assertLess(-amounts[0], amounts[0])
+        self.assertFalse(Money(0))
+
+        with self.assertRaises(ValueError):
+            _ = amounts[0] + Money(10, Currencies.USD)
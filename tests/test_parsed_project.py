@@ -0,0 +1,52 @@
+import os
+
+from src.data.Projects import Projects
+from tests.helpers import ProjectTestCase
+
+
+class TestParsedProject(ProjectTestCase):
+    """
+    Tests opening several projects that were read in parallel worker processes.
+    """
+
+    def setUp(self):
+        super().setUp()
+        self.project_dirs = []
+        for i in range(3):
+            project_dir = os.path.join(self.project_dir, f"project_{i}")
+            os.makedirs(project_dir)
+            project = self.new_project(project_dir)
+            category = project.transaction_categories.create_new_item()
+            for _ in range(i + 1):
+                project.transactions.create_new_item(json_dict={"date": "2024-01-31",
+                                                                "counterpart": None,
+                                                                "amount": f"{i}.50",
+                                                                "account": None,
+                                                                "category": category.identifier,
+                                                                "note": "",
+                                                                })
+            project.save_project()
+            project.wait_for_background_tasks()
+
+            # A journaled change on top of the snapshot
+            project.transactions.update_item(project.transactions[0], note=f"project {i}")
+            project.save_project()
+            project.wait_for_background_tasks()
+            self.project_dirs.append(project_dir)
+
+    def test_parse_projects(self):
+        """
+        Projects attached from parsed data equal projects loaded from their directory.
+        """
+        projects = Projects(settings=self.settings)
+        futures = projects.parse_projects(self.project_dirs)
+
+        for project_dir, future in zip(self.project_dirs, futures):
+            parsed = future.result(timeout=60)
+            project = projects.create_new_project(project_directory=project_dir, load_from_dir=True, parsed=parsed)
+            loaded = self.open_project(project_dir)
+
+            self.assertEqual(project.json_dict(), loaded.json_dict())
+            self.assertFalse(project.is_dirty)
+        self.assertEqual(projects.n_projects, 3)
+        self.assertEqual(projects[2].transactions[0].note, "project 2")
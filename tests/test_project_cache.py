@@ -0,0 +1,90 @@
+import datetime
+import os
+from unittest.mock import patch
+
+from src.data.settings.GeneralSettings import GeneralSettingKeys
+from src.data.storage.ParsedProject import parse_project
+from src.data.storage.ProjectCache import ProjectCache
+from src.data.storage.ProjectJsonReader import ProjectJsonReader
+from src.data.storage.TransactionTable import TransactionTable
+from tests.helpers import ProjectTestCase, transaction_dicts
+
+
+class TestProjectCache(ProjectTestCase):
+    """
+    Tests caching parsed projects between openings.
+    """
+
+    def setUp(self):
+        super().setUp()
+        self.cache = ProjectCache(cache_dir=os.path.join(self.project_dir, "cache"), max_entries=2)
+
+        self.project_dirs = []
+        for i in range(3):
+            project_dir = os.path.join(self.project_dir, f"project_{i}")
+            os.makedirs(project_dir)
+            project = self.new_project(project_dir)
+            project.transaction_categories.create_new_item()
+            project.save_project()
+            project.wait_for_background_tasks()
+            self.project_dirs.append(project_dir)
+
+    def test_entry_is_invalidated_by_changes(self):
+        """
+        A cached project is returned until project.json or the journal changes.
+        """
+        project_dir = self.project_dirs[0]
+        self.assertIsNone(self.cache.get(project_dir))
+
+        self.cache.put(parse_project(project_dir))
+        cached = self.cache.get(project_dir)
+        self.assertIsNotNone(cached)
+        self.assertEqual(cached.entries, parse_project(project_dir).entries)
+
+        project = self.open_project(project_dir)
+        project.transaction_categories.create_new_item()
+        project.save_project()
+        project.wait_for_background_tasks()
+        self.assertIsNone(self.cache.get(project_dir))
+
+    def test_least_recently_used_entries_are_evicted(self):
+        """
+        Only the most recently used entries are kept.
+        """
+        self.cache.put(parse_project(self.project_dirs[0]))
+        self.cache.put(parse_project(self.project_dirs[1]))
+        # Make sure the modification times differ, regardless of the file system's timestamp resolution
+        os.utime(self.cache._entry_path(self.project_dirs[1]), ns=(1, 1))
+        self.assertIsNotNone(self.cache.get(self.project_dirs[0]))
+
+        self.cache.put(parse_project(self.project_dirs[2]))
+        self.assertIsNotNone(self.cache.get(self.project_dirs[0]))
+        self.assertIsNone(self.cache.get(self.project_dirs[1]))
+        self.assertIsNotNone(self.cache.get(self.project_dirs[2]))
+
+    def test_loaded_project_is_cached(self):
+        """
+        A project is read incrementally and cached once loaded, reopening it reads neither project.json nor the journal.
+        """
+        project_dir = self.project_dirs[0]
+        project = self.open_project(project_dir)
+        project.transactions.bulk_create(transaction_dicts(3, first_date=datetime.date(2024, 1, 31), cents=25, category=0))
+        project.save_project()
+        project.wait_for_background_tasks()
+        project.transactions.delete_item(project.transactions[2])
+        project.save_project()  # journaled
+        project.wait_for_background_tasks()
+
+        self.settings.general[GeneralSettingKeys.PROJECT_CACHE].value = True
+        with patch("src.data.storage.ProjectCache.CACHE_DIR", self.cache.cache_dir):
+            with patch("src.data.Projects.parse_project") as parse:
+                opened = self.open_project(project_dir)
+                parse.assert_not_called()  # streamed, not read at once
+            opened.wait_for_background_tasks()  # cached on the worker thread
+            cached = self.cache.get(project_dir)
+            self.assertIn((TransactionTable.project_json_key, "amount", [25, 125]), cached.entries)
+
+            with patch.object(ProjectJsonReader, "__iter__", side_effect=AssertionError("project.json was read")):
+                reopened = self.open_project(project_dir)
+        self.assertEqual(reopened.json_dict(), opened.json_dict())
+        self.assertEqual(reopened.transactions.next_identifier, 3)
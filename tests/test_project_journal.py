@@ -0,0 +1,154 @@
+import json
+import os
+from decimal import Decimal
+from unittest.mock import patch
+
+from PySide6.QtCore import QCoreApplication
+
+from src.data.Projects import Project
+from src.data.storage.ProjectJournal import ProjectJournal
+from src.data.storage.TransactionTable import TransactionTable
+from tests.helpers import ProjectTestCase
+
+
+class TestProjectJournal(ProjectTestCase):
+    """
+    Tests saving a project as a project.json snapshot plus an append-only journal of changes.
+    """
+
+    def _create_project(self) -> Project:
+        project = self.new_project()
+        category = project.transaction_categories.create_new_item()
+        project.transactions.create_new_item(json_dict={"date": "2024-01-31",
+                                                        "counterpart": None,
+                                                        "amount": "12.50",
+                                                        "account": None,
+                                                        "category": category.identifier,
+                                                        "note": "groceries",
+                                                        })
+        project.save_project()
+        project.wait_for_background_tasks()
+        return project
+
+    def test_first_save_writes_snapshot(self):
+        """
+        A project that was never saved to its directory is written as a complete snapshot.
+        """
+        self._create_project()
+
+        self.assertTrue(os.path.isfile(os.path.join(self.project_dir, "project.json")))
+        self.assertFalse(os.path.isfile(os.path.join(self.project_dir, ProjectJournal.filename)))
+
+    def test_changes_are_journaled_and_replayed(self):
+        """
+        Later saves only append the changed items to the journal, which is replayed when loading.
+        """
+        project = self._create_project()
+        with open(os.path.join(self.project_dir, "project.json"), "r") as read_file:
+            snapshot = read_file.read()
+
+        transaction = project.transactions[0]
+        project.transactions.update_item(transaction, amount=Decimal("20.00"))
+        new_transaction = project.transactions.copy_item(transaction)
+        project.transaction_categories.update_item(project.transaction_categories[0], name="Food")
+        project.save_project()
+        project.wait_for_background_tasks()
+
+        with open(os.path.join(self.project_dir, "project.json"), "r") as read_file:
+            self.assertEqual(read_file.read(), snapshot)
+        with open(os.path.join(self.project_dir, ProjectJournal.filename), "r") as read_file:
+            # The modified transaction and category, the new transaction and the next transaction identifier
+            self.assertEqual(len(read_file.readlines()), 4)
+
+        project.transactions.delete_item(transaction)
+        project.save_project()
+        project.wait_for_background_tasks()
+
+        reopened = self.open_project()
+        self.assertEqual(list(reopened.transactions.keys()), [new_transaction.identifier])
+        self.assertEqual(reopened.transactions[new_transaction.identifier].amount, Decimal("20.00"))
+        self.assertEqual(reopened.transactions[new_transaction.identifier].category.name, "Food")
+        self.assertFalse(reopened.transactions.has_changes)
+
+    def test_incomplete_last_entry_is_ignored(self):
+        """
+        A journal entry that was only partially written (e.g. after a crash) does not prevent loading.
+        """
+        project = self._create_project()
+        project.transactions.update_item(project.transactions[0], note="changed")
+        project.save_project()
+        project.wait_for_background_tasks()
+
+        with open(os.path.join(self.project_dir, ProjectJournal.filename), "a") as write_file:
+            write_file.write('{"collection": "transactions", "operation": "ups')
+
+        reopened = self.open_project()
+        self.assertEqual(reopened.transactions[0].note, "changed")
+
+    def test_compaction(self):
+        """
+        Once the journal exceeds the compaction threshold, the next save writes a fresh snapshot instead.
+        """
+        project = self._create_project()
+        with patch("src.data.Projects.COMPACTION_THRESHOLD", 0):
+            project.transactions.update_item(project.transactions[0], note="journaled")
+            project.save_project()
+            project.wait_for_background_tasks()
+            self.assertTrue(os.path.isfile(os.path.join(self.project_dir, ProjectJournal.filename)))
+
+            project.transactions.update_item(project.transactions[0], note="compacted")
+            project.save_project()
+            project.wait_for_background_tasks()
+
+        self.assertFalse(os.path.isfile(os.path.join(self.project_dir, ProjectJournal.filename)))
+        with open(os.path.join(self.project_dir, "project.json"), "r") as read_file:
+            self.assertEqual(json.load(read_file)[TransactionTable.project_json_key]["note"][0], "compacted")
+
+    def test_failed_save(self):
+        """
+        A failed background save is reported and makes the next save write a complete snapshot.
+        """
+        _ = QCoreApplication.instance() or QCoreApplication([])
+        project = self._create_project()
+        failures = []
+        project.save_failed.connect(lambda _project, error: failures.append(error))
+
+        with patch.object(ProjectJournal, "write_changes", side_effect=OSError("disk full")):
+            project.transactions.update_item(project.transactions[0], note="not lost")
+            project.save_project()
+            project.wait_for_background_tasks()
+        QCoreApplication.processEvents()  # signals emitted by the worker thread are queued
+
+        self.assertEqual(failures, ["disk full"])
+
+        project.save_project()
+        project.wait_for_background_tasks()
+        reopened = self.open_project()
+        self.assertEqual(reopened.transactions[0].note, "not lost")
+
+    def test_dirty_tracking(self):
+        """
+        A project is dirty until it is saved, and unchanged items are not serialized again.
+        """
+        project = self.new_project()
+        self.assertTrue(project.is_dirty)
+
+        project = self._create_project()
+        self.assertFalse(project.is_dirty)
+
+        categories_json = project.transaction_categories.json_dict()
+        transactions_json = project.transactions.json_dict()
+        transaction_json = transactions_json[0]
+        self.assertIs(project.transaction_categories.json_dict(), categories_json)
+
+        project.transactions.update_item(project.transactions[0], note="edited")
+        project.transactions.create_new_item()
+        self.assertTrue(project.is_dirty)
+        self.assertIs(project.transaction_categories.json_dict(), categories_json)
+        self.assertIsNot(project.transactions.json_dict(), transactions_json)
+        self.assertIsNot(project.transactions.json_dict()[0], transaction_json)
+        self.assertEqual(project.transactions.json_dict()[0]["note"], "edited")
+
+        project.save_project()
+        project.wait_for_background_tasks()
+        self.assertFalse(project.is_dirty)
@@ -0,0 +1,70 @@
+import json
+import os
+import tempfile
+import unittest
+
+from src.data.storage.ProjectJsonReader import ProjectJsonReader
+
+
+class TestProjectJsonReader(unittest.TestCase):
+    """
+    Tests reading project.json incrementally, item by item.
+    """
+
+    def setUp(self):
+        self._tmp_dir = tempfile.TemporaryDirectory()
+        self.filename = os.path.join(self._tmp_dir.name, "project.json")
+
+    def tearDown(self):
+        self._tmp_dir.cleanup()
+
+    def _write(self, json_dict: dict, indent=4) -> None:
+        with open(self.filename, "w") as write_file:
+            json.dump(json_dict, write_file, indent=indent)
+
+    def test_items_across_chunk_boundaries(self):
+        """
+        Items are decoded correctly regardless of where chunks are cut, including multibyte characters.
+        """
+        project_dict = {
+            "transaction_categories": {"0": {"identifier": 0, "name": "Café €", "note": ""}},
+            "bank_accounts": {},
+            "transactions": {
+                str(i): {"identifier": i, "amount": f"{i}.50", "note": "ünïcødé" * i} for i in range(20)
+            },
+            "format_version": 123456,
+        }
+        for indent in (None, 4):
+            self._write(project_dict, indent=indent)
+            for chunk_size in (1, 3, 7, 64, 1024 * 1024):
+                items = list(ProjectJsonReader(self.filename, chunk_size=chunk_size))
+
+                self.assertEqual(len(items), 22)
+                self.assertEqual(items[0], ("transaction_categories", "0", project_dict["transaction_categories"]["0"]))
+                self.assertEqual(items[20], ("transactions", "19", project_dict["transactions"]["19"]))
+                self.assertEqual(items[21], ("format_version", None, 123456))
+
+    def test_progress(self):
+        """
+        Progress is reported while reading, ending at the file size.
+        """
+        self._write({"transactions": {str(i): {"identifier": i} for i in range(100)}})
+        progress = []
+
+        _ = list(ProjectJsonReader(self.filename,
+                                   progress_callback=lambda read, total: progress.append((read, total)),
+                                   chunk_size=256))
+
+        file_size = os.path.getsize(self.filename)
+        self.assertGreater(len(progress), 1)
+        self.assertEqual(progress[-1], (file_size, file_size))
+
+    def test_invalid_file(self):
+        """
+        Truncated files raise a json decode error.
+        """
+        with open(self.filename, "w") as write_file:
+            write_file.write('{"transactions": {"0": {"identifier": 0}')
+
+        with self.assertRaises(json.JSONDecodeError):
+            _ = list(ProjectJsonReader(self.filename, chunk_size=4))
@@ -0,0 +1,56 @@
+from src.models.Transactions import Columns
+from tests.helpers import ProjectsModelTestCase
+
+
+class TestReferenceCascades(ProjectsModelTestCase):
+    """
+    Tests updating the transactions that refer to deleted or merged items.
+    """
+
+    def setUp(self):
+        super().setUp()
+        self.categories_model = self.projects_model.transaction_categories_model
+        self.groceries = self.categories_model.create_new_item(json_dict={"name": "Groceries", "note": ""})
+        self.food = self.categories_model.create_new_item(json_dict={"name": "Food", "note": ""})
+        for day in range(1, 11):
+            self.projects_model.transactions_model.create_new_item(json_dict={
+                "date": f"2024-03-{day:02d}",
+                "counterpart": None,
+                "amount": "1.00",
+                "account": None,
+                "category": self.groceries.identifier if day in (3, 5, 8) else self.food.identifier,
+                "note": "",
+            })
+        self.project.transactions.clear_changes()
+
+        # Changed ranges of transactions, except for the refreshes of complete combo box columns
+        self.changes = []
+        self.projects_model.transactions_model.dataChanged.connect(
+            lambda top_left, bottom_right, roles: self.changes.append((top_left.row(), bottom_right.row(),
+                                                                       top_left.column(), bottom_right.column()))
+            if bottom_right.isValid() else None
+        )
+
+    def _categories(self) -> list:
+        return [transaction.category for transaction in self.project.transactions.values()]
+
+    def test_delete_clears_references(self):
+        """
+        Deleting a category clears it from its transactions, views are notified once.
+        """
+        self.categories_model.delete_item(self.categories_model.index(0, 0))
+
+        self.assertEqual(self._categories(), [self.food, self.food, None, self.food, None,
+                                              self.food, self.food, None, self.food, self.food])
+        self.assertEqual(self.changes, [(2, 7, Columns.CATEGORY, Columns.CATEGORY)])
+        self.assertEqual(self.project.transactions.take_changes()[0].keys(), {2, 4, 7})
+
+    def test_merge(self):
+        """
+        Merging a category moves its transactions to the other category and deletes it.
+        """
+        self.categories_model.merge_items(self.categories_model.index(0, 0), self.categories_model.index(1, 0))
+
+        self.assertEqual(self._categories(), [self.food] * 10)
+        self.assertEqual(list(self.project.transaction_categories.keys()), [self.food.identifier])
+        self.assertEqual(self.changes, [(2, 7, Columns.CATEGORY, Columns.CATEGORY)])
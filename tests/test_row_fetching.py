@@ -0,0 +1,94 @@
+import unittest
+
+from PySide6.QtCore import Qt
+
+from src.data.settings.GeneralSettings import GeneralSettingKeys
+from src.models.Transactions import Columns
+from tests.helpers import ProjectsModelTestCase, transaction_dicts
+
+
+class TestRowFetching(ProjectsModelTestCase):
+    """
+    Tests adding the rows of the transactions table in batches, as views scroll.
+    """
+
+    general_settings = ProjectsModelTestCase.general_settings | {
+        GeneralSettingKeys.TABLE_BATCH_SIZE: 100,
+    }
+
+    def setUp(self):
+        super().setUp()
+        self.model = self.projects_model.transactions_model
+        self.project.transactions.bulk_create([json_dict | {"note": str(i)}
+                                               for i, json_dict in enumerate(transaction_dicts(250))])
+
+    def _note(self, row: int) -> str:
+        return self.model.data(self.model.index(row, Columns.NOTE), Qt.ItemDataRole.DisplayRole)
+
+    def test_fetch_in_batches(self):
+        """
+        Only the first batch of rows is added on a reset, the others one batch per fetchMore.
+        """
+        self.model.refresh()
+        self.assertEqual(self.model.rowCount(), 100)
+
+        inserted = []
+        self.model.rowsInserted.connect(lambda parent, first, last: inserted.append((first, last)))
+        self.project.transactions.delete_item(self.project.transactions[150])  # not fetched yet
+        while self.model.canFetchMore():
+            self.model.fetchMore()
+
+        self.assertEqual(inserted, [(100, 198), (199, 248)])
+        self.assertEqual(self._note(149), "149")
+        self.assertEqual(self._note(150), "151")
+
+    def test_newest_first(self):
+        """
+        The most recently added items are shown first if set so.
+        """
+        self.settings.general[GeneralSettingKeys.TABLE_NEWEST_FIRST].value = True
+        self.model.refresh()
+        self.assertEqual(self._note(0), "249")
+
+        self.model.fetchMore()
+        self.assertEqual(self.model.rowCount(), 200)
+        self.assertEqual(self._note(199), "50")
+
+    def test_new_rows_newest_first(self):
+        """
+        New items are added before the first row when the newest items are shown first.
+        """
+        self.settings.general[GeneralSettingKeys.TABLE_NEWEST_FIRST].value = True
+        self.model.refresh()
+        self.model.create_new_items([self.project.transactions[0].json_dict() | {"note": f"new {i}"} for i in range(2)])
+
+        self.assertEqual([self._note(row) for row in range(3)], ["new 1", "new 0", "249"])
+        self.assertEqual(self.model.current_item.note, "new 1")
+        while self.model.canFetchMore():
+            self.model.fetchMore()
+        self.assertEqual(self._note(self.model.rowCount() - 1), "0")
+
+    def test_new_rows_while_rows_are_unfetched(self):
+        """
+        New items are shown and selected right away. The rows that are not fetched yet are added before them, so the
+        rows stay in order and fetchMore does not add the new rows again.
+        """
+        self.model.refresh()
+        self.model.copy_items([self.model.index(5, 0)])
+        self.assertEqual(self.model.rowCount(), 251)
+        self.assertFalse(self.model.canFetchMore())
+        self.assertEqual([self._note(row) for row in range(248, 251)], ["248", "249", "5"])
+        self.assertEqual(self.model.current_item.identifier, self.model.get_item(self.model.index(250, 0)).identifier)
+
+        self.model.refresh()
+        self.model.create_new_item(json_dict=self.project.transactions[0].json_dict() | {"note": "new"})
+        self.assertEqual(self.model.rowCount(), 252)
+        self.assertEqual(self._note(251), "new")
+        self.assertEqual(self.model.current_item.note, "new")
+        self.model.fetchMore()
+        self.assertEqual(self.model.rowCount(), 252)
+
+
+
+if __name__ == "__main__":
+    unittest.main()
@@ -0,0 +1,75 @@
+import random
+import tempfile
+import unittest
+
+from PySide6.QtCore import QCoreApplication, Qt
+
+from src.data.Projects import Projects
+from src.data.settings.AppSettings import AppSettings
+from src.data.settings.GeneralSettings import GeneralSettingKeys
+from src.models.Projects import ProjectsModel
+from src.models.RowIndex import RowIndex
+from src.models.Transactions import Columns
+
+
+class TestRowIndex(unittest.TestCase):
+    """
+    Tests mapping rows to identifiers and back while rows are added and removed.
+    """
+
+    def test_matches_list(self):
+        """
+        The rows of a row index are the positions of the identifiers in a plain list, prepended to and appended to.
+        """
+        rng = random.Random(23)
+        expected = list(range(100))
+        rows = RowIndex(expected)
+        next_identifier = 100
+        for _ in range(3000):
+            action = rng.random()
+            if expected and action < 0.45:
+                identifier = rng.choice(expected)
+                self.assertEqual(rows.remove(identifier), expected.index(identifier))
+                expected.remove(identifier)
+            elif action < 0.7:
+                rows.prepend(next_identifier)
+                expected.insert(0, next_identifier)
+                next_identifier += 1
+            else:
+                self.assertEqual(rows.append(next_identifier), len(expected))
+                expected.append(next_identifier)
+                next_identifier += 1
+
+            self.assertEqual(len(rows), len(expected))
+            if expected:
+                row = rng.randrange(len(expected))
+                self.assertEqual(rows.identifier(row), expected[row])
+                self.assertEqual(rows.row(expected[row]), row)
+        self.assertEqual(list(rows), expected)
+        self.assertRaises(IndexError, rows.identifier, len(expected))
+        self.assertRaises(KeyError, rows.row, -1)
+
+    def test_delete_through_model(self):
+        """
+        Deleting transactions through the model keeps the remaining rows in order.
+        """
+        _app = QCoreApplication.instance() or QCoreApplication([])
+        with tempfile.TemporaryDirectory() as tmp_dir:
+            settings = AppSettings()
+            settings.general[GeneralSettingKeys.AUTOSAVE_ENABLED].value = False
+            projects_model = ProjectsModel(projects=Projects(settings=settings), settings=settings, parent=None)
+            projects_model.create_new_project(project_directory=tmp_dir)
+            model = projects_model.transactions_model
+            for i in range(200):
+                model.create_new_item(json_dict={"date": "2024-03-01", "counterpart": None, "amount": f"{i}.00",
+                                                 "account": None, "category": None, "note": str(i)})
+
+            for row in range(150, 0, -3):
+                model.delete_item(model.index(row, 0))
+            notes = [model.data(model.index(row, Columns.NOTE), Qt.ItemDataRole.DisplayRole) for row in range(model.rowCount())]
+            self.assertEqual(notes, [str(i) for i in range(200) if not (i <= 150 and i % 3 == 0) or i == 0])
+            projects_model.current_project.wait_for_background_tasks()
+
+
+if __name__ == "__main__":
+    unittest.main()
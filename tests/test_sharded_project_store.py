@@ -0,0 +1,79 @@
+import datetime
+import os
+
+from src.data.Projects import Project
+from src.data.settings.ComboBoxChoices import ProjectStorages
+from src.data.settings.GeneralSettings import GeneralSettingKeys
+from src.data.storage.ShardedProjectStore import ShardedProjectStore
+from tests.helpers import ProjectTestCase
+
+
+class TestShardedProjectStore(ProjectTestCase):
+    """
+    Tests storing the transactions of a project in one file per year.
+    """
+
+    general_settings = {
+        GeneralSettingKeys.PROJECT_STORAGE: ProjectStorages.JSON_SHARDED,
+    }
+
+    def setUp(self):
+        super().setUp()
+        project = self.new_project()
+        account = project.bank_accounts.create_new_item()
+        for year in (2022, 2023, 2024):
+            for month in range(1, 5):
+                project.transactions.create_new_item(json_dict={"date": f"{year}-{month:02d}-01",
+                                                                "counterpart": None,
+                                                                "amount": f"{month}.00",
+                                                                "account": account.identifier,
+                                                                "category": None,
+                                                                "note": "",
+                                                                })
+        project.save_project()
+        project.wait_for_background_tasks()
+
+    def _shard_path(self, year: int) -> str:
+        return os.path.join(self.project_dir, ShardedProjectStore.directory_name, f"{year}.json")
+
+    def _loaded_years(self, project: Project) -> set[int]:
+        return {item.date.year for item in project.transactions._data.values() if item is not None}
+
+    def test_years_are_loaded_when_accessed(self):
+        """
+        Opening a project reads no transactions, accessing a transaction or a date range only loads those years.
+        """
+        project = self.open_project()
+        self.assertEqual(len(project.transactions), 12)
+        self.assertEqual(self._loaded_years(project), set())
+
+        self.assertEqual(project.transactions[5].date, datetime.date(2023, 2, 1))
+        self.assertEqual(self._loaded_years(project), {2023})
+
+        transactions = project.transactions.between(datetime.date(2024, 2, 1), datetime.date(2024, 3, 31))
+        self.assertEqual([transaction.identifier for transaction in transactions], [9, 10])
+        self.assertEqual(self._loaded_years(project), {2023, 2024})
+
+    def test_only_changed_years_are_written(self):
+        """
+        Saving rewrites the files of the years with changes, transactions that changed year move to another file.
+        """
+        inode_2022 = os.stat(self._shard_path(2022)).st_ino
+        inode_2023 = os.stat(self._shard_path(2023)).st_ino
+
+        project = self.open_project()
+        project.transactions.update_item(project.transactions[8], date=datetime.date(2025, 1, 1))
+        project.transactions.delete_item(project.transactions[9])
+        project.transactions.update_item(project.transactions[10], note="edited")
+        project.save_project()
+        project.wait_for_background_tasks()
+
+        self.assertEqual(os.stat(self._shard_path(2022)).st_ino, inode_2022)
+        self.assertEqual(os.stat(self._shard_path(2023)).st_ino, inode_2023)
+        self.assertTrue(os.path.isfile(self._shard_path(2025)))
+        self.assertEqual(self._loaded_years(project), {2024, 2025})
+
+        reopened = self.open_project()
+        self.assertEqual(list(reopened.transactions.keys()), [0, 1, 2, 3, 4, 5, 6, 7, 10, 11, 8])
+        self.assertEqual(reopened.transactions[10].note, "edited")
+        self.assertEqual(reopened.transactions[8].date, datetime.date(2025, 1, 1))
@@ -0,0 +1,78 @@
+import datetime
+import threading
+from decimal import Decimal
+
+from tests.helpers import ProjectTestCase, transaction_dicts
+
+
+class TestSnapshots(ProjectTestCase):
+    """
+    Tests reading copy-on-write snapshots of a project while it is being edited.
+    """
+
+    def setUp(self):
+        super().setUp()
+        self.project = self.new_project()
+        self.account = self.project.bank_accounts.create_new_item()
+        self.category = self.project.transaction_categories.create_new_item(json_dict={"name": "Rent", "note": ""})
+        self.transactions = self.project.transactions
+        self.transactions.bulk_create(transaction_dicts(1000, first_date=datetime.date(2024, 1, 1), daily=True, cents=50,
+                                                        account=self.account.identifier,
+                                                        category=self.category.identifier))
+
+    def _edit(self) -> None:
+        transactions = self.transactions
+        transactions.update_item(transactions[10], amount=Decimal("-1"), note="edited")
+        transactions.delete_item(transactions[20])
+        transactions.copy_item(transactions[30])
+        transactions.replace_references(self.category)
+        self.project.transaction_categories.delete_item(self.category)
+        self.project.transaction_categories.create_new_item(json_dict={"name": "Food", "note": ""})
+
+    def test_snapshot_keeps_project(self):
+        """
+        A snapshot shows the project as it was, only the changed items are copied.
+        """
+        expected = self.project.json_dict()
+        with self.project.snapshot() as snapshot:
+            self._edit()
+
+            self.assertEqual(snapshot.json_dict(), expected)
+            self.assertEqual(snapshot["transactions"][10]["amount"], "10.50")
+            self.assertNotIn(1000, snapshot["transactions"])
+            self.assertEqual(len(snapshot["transactions"]), 1000)
+            self.assertEqual(len(snapshot["transactions"]._preserved), 1000)  # all referred to the category
+            self.assertEqual(len(snapshot["transaction_categories"]._preserved), 1)
+
+        self.assertEqual(self.transactions._snapshots, [])
+        self.assertNotEqual(self.project.json_dict(), expected)
+
+    def test_snapshot_without_changes(self):
+        """
+        A snapshot of an unchanged collection copies nothing, new items are left out.
+        """
+        snapshot = self.project.snapshot()
+        self.transactions.create_new_item(json_dict=self.transactions[0].json_dict())
+        self.assertEqual(list(snapshot["transactions"].keys()), list(range(1000)))
+        self.assertEqual(snapshot["transactions"]._preserved, {})
+        snapshot.release()
+
+    def test_read_on_worker_thread(self):
+        """
+        A snapshot read on another thread is consistent while the project is edited.
+        """
+        expected = self.project.json_dict()["transactions"]
+        results = []
+        with self.project.snapshot() as snapshot:
+            reader = threading.Thread(target=lambda: results.extend(snapshot["transactions"].json_dict()
+                                                                    for _ in range(5)))
+            reader.start()
+            for identifier in range(0, 1000, 2):
+                self.transactions.update_item(self.transactions[identifier], note=str(identifier))
+                if identifier % 10 == 0:
+                    self.transactions.delete_item(self.transactions[identifier + 1])
+            reader.join()
+
+        self.assertEqual(len(results), 5)
+        for result in results:
+            self.assertEqual(result, expected)
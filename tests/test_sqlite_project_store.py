@@ -0,0 +1,71 @@
+import os
+from decimal import Decimal
+
+from src.data.settings.ComboBoxChoices import ProjectStorages
+from src.data.settings.GeneralSettings import GeneralSettingKeys
+from src.data.storage.SQLiteProjectStore import SQLiteProjectStore
+from tests.helpers import ProjectTestCase
+
+
+class TestSQLiteProjectStore(ProjectTestCase):
+    """
+    Tests storing a project in project.sqlite.
+    """
+
+    general_settings = {
+        GeneralSettingKeys.PROJECT_STORAGE: ProjectStorages.SQLITE,
+    }
+
+    def setUp(self):
+        super().setUp()
+        project = self.new_project()
+        account = project.bank_accounts.create_new_item()
+        for day in range(1, 11):
+            project.transactions.create_new_item(json_dict={"date": f"2024-03-{day:02d}",
+                                                            "counterpart": None,
+                                                            "amount": f"{day}.00",
+                                                            "account": account.identifier,
+                                                            "category": None,
+                                                            "note": "",
+                                                            })
+        project.save_project()
+        project.wait_for_background_tasks()
+
+    def test_items_are_loaded_lazily(self):
+        """
+        Opening a project only reads identifiers, items are built when accessed.
+        """
+        project = self.open_project()
+
+        self.assertTrue(os.path.isfile(os.path.join(self.project_dir, SQLiteProjectStore.filename)))
+        self.assertFalse(os.path.isfile(os.path.join(self.project_dir, "project.json")))
+        self.assertEqual(list(project.transactions.keys()), list(range(10)))
+        self.assertTrue(all(item is None for item in project.transactions._data.values()))
+
+        self.assertEqual(project.transactions[4].amount, Decimal("5.00"))
+        self.assertEqual(sum(item is not None for item in project.transactions._data.values()), 1)
+
+        self.assertEqual(len(list(project.transactions.values())), 10)
+        self.assertTrue(all(item is not None for item in project.transactions._data.values()))
+
+    def test_only_changed_rows_are_written(self):
+        """
+        Saving updates, inserts and deletes single rows and keeps the item order.
+        """
+        project = self.open_project()
+        project.transactions.update_item(project.transactions[2], note="edited")
+        project.transactions.delete_item(project.transactions[3])
+        project.transactions.create_new_item(json_dict={"date": "2024-04-01",
+                                                        "counterpart": None,
+                                                        "amount": "1.00",
+                                                        "account": None,
+                                                        "category": None,
+                                                        "note": "",
+                                                        })
+        project.save_project()
+        project.wait_for_background_tasks()
+
+        reopened = self.open_project()
+        self.assertEqual(list(reopened.transactions.keys()), [0, 1, 2, 4, 5, 6, 7, 8, 9, 10])
+        self.assertEqual(reopened.transactions[2].note, "edited")
+        self.assertEqual(reopened.transactions[2].account.identifier, 0)
@@ -0,0 +1,118 @@
+from src.data.settings.ComboBoxChoices import ProjectStorages
+from src.data.settings.GeneralSettings import GeneralSettingKeys
+from src.data.TaggedItems import CHANGE_LOG_SIZE, ChangeKinds
+from tests.helpers import ProjectTestCase, transaction_dicts
+
+
+class TestTaggedItems(ProjectTestCase):
+    """
+    Tests identifier allocation, bulk creation, the layout and the change feed of tagged items.
+    """
+
+    def setUp(self):
+        super().setUp()
+        self.project = self.new_project()
+
+    def test_identifier_zero(self):
+        """
+        An item can be created with identifier 0 explicitly.
+        """
+        categories = self.project.transaction_categories
+        categories.create_new_item(identifier=5)
+        category = categories.create_new_item(identifier=0, json_dict={"name": "Zero", "note": ""})
+
+        self.assertEqual(category.identifier, 0)
+        self.assertEqual(categories.create_new_item().identifier, 6)
+
+    def test_identifiers_are_not_reused(self):
+        """
+        Identifiers of deleted items are not handed out again, also after saving and reopening the project.
+        """
+        transactions = self.project.transactions
+        created = transactions.bulk_create(transaction_dicts(3))
+        self.assertEqual([transaction.identifier for transaction in created], [0, 1, 2])
+        self.assertEqual(transactions[2].note, "")
+        self.project.save_project()
+        self.project.wait_for_background_tasks()
+
+        transactions.delete_item(transactions[2])
+        transactions.delete_item(transactions.create_new_item())  # identifier 3, only known from the journal
+        self.project.save_project()
+        self.project.wait_for_background_tasks()
+
+        reopened = self.open_project()
+        self.assertEqual(list(reopened.transactions.keys()), [0, 1])
+        self.assertEqual(reopened.transactions.create_new_item().identifier, 4)
+
+    def test_bulk_create_is_saved(self):
+        """
+        Items created in bulk are recorded as changes like any other new item.
+        """
+        self.project.save_project()
+        self.project.wait_for_background_tasks()
+
+        self.project.transactions.bulk_create(transaction_dicts(1000))
+        upserts, deletes, next_identifier = self.project.transactions.take_changes()
+        self.assertEqual(len(upserts), 1000)
+        self.assertEqual(deletes, [])
+        self.assertEqual(next_identifier, 1000)
+
+    def test_items_are_compact(self):
+        """
+        Items only hold their declared attributes, unknown fields are rejected on update.
+        """
+        transaction = self.project.transactions.create_new_item()
+
+        self.assertFalse(hasattr(transaction, "__dict__"))
+        with self.assertRaises(AttributeError):
+            self.project.transactions.update_item(transaction, amont="1.00")
+
+    def test_change_feed(self):
+        """
+        Changes are published with increasing sequence numbers and can be polled for as long as they are kept.
+        """
+        categories = self.project.transaction_categories
+        published = []
+        categories.subscribe(published.append)
+
+        category = categories.create_new_item()
+        start = categories.sequence
+        categories.update_item(category, name="Rent", note="monthly")
+        categories.copy_item(category)
+        categories.delete_item(category)
+
+        changes = categories.changes_since(start)
+        self.assertEqual([(change.kind, change.identifiers, change.fields) for change in changes],
+                         [(ChangeKinds.UPDATED, (0,), ("name", "note")),
+                          (ChangeKinds.INSERTED, (1,), ()),
+                          (ChangeKinds.DELETED, (0,), ())])
+        self.assertEqual([change.sequence for change in published], [start, start + 1, start + 2, start + 3])
+        self.assertEqual(categories.changes_since(categories.sequence), [])
+
+        self.project.transactions.bulk_create(transaction_dicts(CHANGE_LOG_SIZE + 1))
+        for transaction in list(self.project.transactions.values())[:CHANGE_LOG_SIZE]:
+            self.project.transactions.update_item(transaction, note="edited")
+        self.assertIsNone(self.project.transactions.changes_since(0))
+        self.assertEqual(len(self.project.transactions.changes_since(1)), CHANGE_LOG_SIZE)
+
+    def test_loading_publishes_nothing(self):
+        """
+        Opening a project is not a change: the feeds of the loaded collections start at sequence 0.
+        """
+        for storage_format in (ProjectStorages.JSON, ProjectStorages.JSON_NUMPY):
+            with self.subTest(storage_format=storage_format):
+                self.settings.general[GeneralSettingKeys.PROJECT_STORAGE].value = storage_format
+                project = self.new_project()
+                project.transaction_categories.create_new_item()
+                project.transactions.bulk_create(transaction_dicts(3))
+                project.save_project()
+                project.wait_for_background_tasks()
+                project.transaction_categories.create_new_item()  # journaled
+                project.save_project()
+                project.wait_for_background_tasks()
+
+                opened = self.open_project()
+                self.assertEqual((len(opened.transaction_categories), len(opened.transactions)), (2, 3))
+                for items in (opened.transaction_categories, opened.transactions):
+                    self.assertEqual(items.sequence, 0)
+                    self.assertEqual(items.changes_since(0), [])
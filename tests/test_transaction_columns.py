@@ -0,0 +1,84 @@
+import json
+import os
+from decimal import Decimal
+
+import numpy as np
+
+from src.data.settings.ComboBoxChoices import ProjectStorages
+from src.data.settings.GeneralSettings import GeneralSettingKeys
+from src.data.storage.TransactionColumns import TransactionColumns
+from src.data.storage.TransactionTable import TransactionTable
+from tests.helpers import ProjectTestCase
+
+
+class TestTransactionColumns(ProjectTestCase):
+    """
+    Tests storing transactions as memory-mapped binary columns next to project.json.
+    """
+
+    general_settings = {
+        GeneralSettingKeys.PROJECT_STORAGE: ProjectStorages.JSON_NUMPY,
+    }
+
+    def setUp(self):
+        super().setUp()
+        project = self.new_project()
+        account = project.bank_accounts.create_new_item()
+        category = project.transaction_categories.create_new_item()
+        for day in range(1, 11):
+            project.transactions.create_new_item(json_dict={"date": f"2024-03-{day:02d}",
+                                                            "counterpart": None,
+                                                            "amount": f"-{day}.05",
+                                                            "account": account.identifier,
+                                                            "category": category.identifier if day % 2 else None,
+                                                            "note": "café" * day,
+                                                            })
+        project.save_project()
+        project.wait_for_background_tasks()
+        self.transaction_dicts = project.transactions.json_dict()
+
+    def _read_project_json(self) -> dict:
+        with open(os.path.join(self.project_dir, "project.json")) as read_file:
+            return json.load(read_file)
+
+    def test_round_trip(self):
+        """
+        Transactions are stored as memory-mapped columns instead of in project.json and load unchanged.
+        """
+        project_json = self._read_project_json()
+        self.assertNotIn("transactions", project_json)
+
+        columns = TransactionColumns.load(self.project_dir, project_json[TransactionColumns.project_json_key])
+        self.assertEqual(len(columns), 10)
+        self.assertIsInstance(columns.columns["amount"], np.memmap)
+
+        project = self.open_project()
+        self.assertEqual(project.transactions.json_dict(), self.transaction_dicts)
+        self.assertEqual(project.transactions[2].amount, Decimal("-3.05"))
+        self.assertIsNone(project.transactions[1].category)
+
+    def test_journal_on_top_of_columns(self):
+        """
+        Changes saved after the columnar snapshot are applied while loading, and compacting writes new columns.
+        """
+        project = self.open_project()
+        project.transactions.update_item(project.transactions[2], note="edited")
+        project.transactions.delete_item(project.transactions[3])
+        project.save_project()
+        project.wait_for_background_tasks()
+
+        reopened = self.open_project()
+        self.assertEqual(list(reopened.transactions.keys()), [0, 1, 2, 4, 5, 6, 7, 8, 9])
+        self.assertEqual(reopened.transactions[2].note, "edited")
+
+        # Saving to another storage type replaces the columns
+        self.settings.general[GeneralSettingKeys.PROJECT_STORAGE].value = ProjectStorages.JSON
+        reopened.project_dir = os.path.join(self.project_dir, "copy")
+        os.makedirs(reopened.project_dir)
+        reopened.save_project()
+        reopened.wait_for_background_tasks()
+
+        with open(os.path.join(reopened.project_dir, "project.json")) as read_file:
+            self.assertEqual(len(json.load(read_file)[TransactionTable.project_json_key]["identifier"]), 9)
+        self.assertFalse(any(name.startswith(TransactionColumns.directory_prefix)
+                             for name in os.listdir(reopened.project_dir)))
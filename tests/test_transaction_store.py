@@ -0,0 +1,131 @@
+import datetime
+from decimal import Decimal
+
+from src.data.Money import Money
+from src.data.Projects import Project
+from src.data.Transactions import Transaction
+from tests.helpers import ProjectTestCase, transaction_dicts
+
+
+class TestTransactionStore(ProjectTestCase):
+    """
+    Tests keeping transactions as rows of columns, with Transaction views on them.
+    """
+
+    def setUp(self):
+        super().setUp()
+        self.project = self.new_project()
+        self.account = self.project.bank_accounts.create_new_item()
+        self.transactions = self.project.transactions
+
+    def _transaction_dicts(self, n: int, note: str = "") -> list[dict]:
+        return transaction_dicts(n, first_date=datetime.date(2024, 1, 1), daily=True, cents=25,
+                                 account=self.account.identifier, note=note)
+
+    def test_views(self):
+        """
+        Added transactions become views on their row, edits through any view end up in the columns.
+        """
+        transaction = Transaction(project=self.project, identifier=0, amount=Decimal("1.005"), note="new")
+        self.assertTrue(transaction.is_detached)
+
+        self.transactions[0] = transaction
+        self.assertFalse(transaction.is_detached)
+        self.assertEqual(transaction.amount, Decimal("1.01"))
+        self.assertEqual(transaction.account, self.account)
+
+        view = self.transactions[0]
+        self.assertIsNot(view, transaction)
+        self.assertEqual(view, transaction)
+        self.transactions.update_item(view, note="edited", account=None)
+        self.assertEqual(transaction.note, "edited")
+        self.assertIsNone(transaction.account)
+        self.assertEqual(self.transactions.json_dict()[0]["note"], "edited")
+
+    def test_growth_and_compaction(self):
+        """
+        The columns grow when needed, rows of deleted transactions are dropped without changing the order.
+        """
+        self.transactions.bulk_create(self._transaction_dicts(5000, note="same"))
+        for identifier in range(0, 5000, 3):
+            self.transactions.delete_item(self.transactions[identifier])
+        for identifier in range(1, 5000, 3):
+            self.transactions.delete_item(self.transactions[identifier])
+
+        expected = list(range(2, 5000, 3))
+        self.assertEqual(list(self.transactions.keys()), expected)
+        self.assertLess(self.transactions._data._size, 5000)
+        self.assertEqual([transaction.identifier for transaction in self.transactions.values()], expected)
+        self.assertEqual(self.transactions[4997].amount, Decimal("4997.25"))
+        self.assertEqual(self.transactions[4997].note, "same")
+
+    def test_between(self):
+        """
+        Date ranges are selected from the date column, deleted transactions are skipped.
+        """
+        self.transactions.bulk_create(self._transaction_dicts(60))
+        self.transactions.delete_item(self.transactions[40])
+
+        selected = self.transactions.between(datetime.date(2024, 2, 1), datetime.date(2024, 2, 15))
+        self.assertEqual([transaction.identifier for transaction in selected], [31, 32, 33, 34, 35, 36, 37, 38, 39,
+                                                                                41, 42, 43, 44, 45])
+
+    def test_columns_round_trip(self):
+        """
+        Columns taken from one project can be loaded in another.
+        """
+        self.transactions.bulk_create(self._transaction_dicts(10, note="ünïcødé"))
+        other = Project(identifier=1, project_directory=self.project_dir, settings=self.settings)
+        other.bank_accounts.create_new_item()
+
+        other.transactions.load_columns(self.transactions.columns())
+        self.assertEqual(other.transactions.json_dict(), self.transactions.json_dict())
+        self.assertEqual(other.transactions.create_new_item().identifier, 10)
+
+    def test_indexes_follow_changes(self):
+        """
+        Queries on date and references match a full scan after transactions are created, edited, copied and deleted.
+        """
+        other_account = self.project.bank_accounts.create_new_item()
+        category = self.project.transaction_categories.create_new_item()
+        self.transactions.bulk_create(self._transaction_dicts(100))
+        march = (datetime.date(2024, 3, 1), datetime.date(2024, 3, 31))
+
+        def scan(account, category=None) -> list[int]:
+            return [transaction.identifier for transaction in self.transactions.values()
+                    if march[0] <= transaction.date <= march[1] and transaction.account == account
+                    and (category is None or transaction.category == category)]
+
+        def find(account, category=None) -> list[int]:
+            return [transaction.identifier for transaction in self.transactions.find(*march, account=account,
+                                                                                     category=category)]
+
+        self.assertEqual(find(self.account), scan(self.account))  # builds the indexes
+        for identifier in range(60, 80, 2):
+            self.transactions.update_item(self.transactions[identifier], account=other_account, category=category)
+        self.transactions.update_item(self.transactions[61], date=datetime.date(2024, 6, 1))
+        self.transactions.update_item(self.transactions[10], date=datetime.date(2024, 3, 15))
+        self.transactions.delete_item(self.transactions[62])
+        self.transactions.copy_item(self.transactions[64])
+        self.transactions.create_new_item(json_dict=self._transaction_dicts(75)[-1])
+
+        self.assertEqual(find(self.account), scan(self.account))
+        self.assertEqual(find(other_account), scan(other_account))
+        self.assertEqual(find(other_account, category), scan(other_account, category))
+        self.assertIn(10, find(self.account))
+        self.assertNotIn(61, find(self.account))
+
+    def test_totals(self):
+        """
+        Totals are summed from the amount column, exactly.
+        """
+        other_account = self.project.bank_accounts.create_new_item()
+        self.transactions.bulk_create(self._transaction_dicts(100))
+        for identifier in range(0, 100, 10):
+            self.transactions.update_item(self.transactions[identifier], account=other_account)
+        self.transactions.delete_item(self.transactions[99])
+
+        self.assertEqual(self.transactions.total(), Money(sum(range(99)) * 100 + 99 * 25, self.transactions.currency))
+        self.assertEqual(self.transactions.total(datetime.date(2024, 1, 1), datetime.date(2024, 1, 3)).cents, 375)
+        self.assertEqual(self.transactions.balance(other_account).cents, sum(range(0, 100, 10)) * 100 + 10 * 25)
+        self.assertEqual(self.transactions.balance(other_account, datetime.date(2024, 1, 11)).cents, 1050)
@@ -0,0 +1,90 @@
+import json
+import os
+import shutil
+from unittest.mock import patch
+
+from src.data.settings.ComboBoxChoices import ProjectStorages
+from src.data.settings.GeneralSettings import GeneralSettingKeys
+from src.data.storage.TransactionTable import TransactionTable
+from tests.helpers import ProjectTestCase
+
+
+class TestTransactionTable(ProjectTestCase):
+    """
+    Tests writing the transactions of project.json as a table of columns.
+    """
+
+    general_settings = {
+        GeneralSettingKeys.PROJECT_STORAGE: ProjectStorages.JSON,
+    }
+
+    def setUp(self):
+        super().setUp()
+        self.project = self.new_project()
+        account = self.project.bank_accounts.create_new_item()
+        category = self.project.transaction_categories.create_new_item()
+        self.project.transactions.bulk_create([{"date": f"{1950 + day % 100}-03-{day % 28 + 1:02d}",
+                                                "counterpart": None,
+                                                "amount": f"-{day}.05",
+                                                "account": account.identifier,
+                                                "category": category.identifier if day % 2 else None,
+                                                "note": "café \"quoted\"\n" * (day % 3),
+                                                } for day in range(250)])
+        self.project.transactions.delete_item(self.project.transactions[7])
+
+    def test_round_trip(self):
+        """
+        Transactions written in chunks as a table load unchanged, with later journaled changes on top.
+        """
+        with patch.object(TransactionTable, "chunk_size", 100):
+            self.project.save_project()
+            self.project.wait_for_background_tasks()
+
+        with open(os.path.join(self.project_dir, "project.json")) as read_file:
+            project_json = json.load(read_file)
+        self.assertNotIn("transactions", project_json)
+        table = project_json[TransactionTable.project_json_key]
+        self.assertEqual(len(table["identifier"]), 249)
+        self.assertEqual((table["date"][0], table["amount"][1], table["category"][0]), ("1950-03-01", -105, None))
+
+        self.project.transactions.update_item(self.project.transactions[3], note="journaled")
+        self.project.save_project()
+        self.project.wait_for_background_tasks()
+
+        reopened = self.open_project()
+        expected = self.project.transactions.json_dict()
+        self.assertEqual(reopened.transactions.json_dict(), expected)
+        self.assertEqual(reopened.transactions[3].note, "journaled")
+        self.assertFalse(reopened.is_dirty)
+
+    def test_export(self):
+        """
+        Exported projects hold one object per transaction and can be opened as a project.
+        """
+        export_dir = os.path.join(self.project_dir, "export")
+        os.makedirs(export_dir)
+        self.project.export_json(os.path.join(export_dir, "export.json"))
+
+        with open(os.path.join(export_dir, "export.json")) as read_file:
+            self.assertEqual(json.load(read_file)["transactions"]["3"]["amount"], "-3.05")
+        shutil.move(os.path.join(export_dir, "export.json"), os.path.join(export_dir, "project.json"))
+        self.assertEqual(self.open_project(export_dir).json_dict(), self.project.json_dict())
+
+    def test_next_identifier_after_deleting_last(self):
+        """
+        Identifiers of deleted transactions are not reused after reopening, in every storage format.
+        """
+        last = self.project.transactions[249]
+        self.project.transactions.delete_item(last)
+        for storage_format in ProjectStorages:
+            with self.subTest(storage_format=storage_format):
+                project_dir = os.path.join(self.project_dir, storage_format)
+                os.makedirs(project_dir)
+                self.settings.general[GeneralSettingKeys.PROJECT_STORAGE].value = storage_format
+                self.project.project_dir = project_dir
+                self.project.save_project()
+                self.project.wait_for_background_tasks()
+
+                reopened = self.open_project(project_dir)
+                self.assertEqual(reopened.transactions.next_identifier, 250)
+                self.assertNotIn(249, reopened.transactions)
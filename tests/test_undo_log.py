@@ -0,0 +1,124 @@
+from decimal import Decimal
+
+from PySide6.QtCore import Qt
+
+from src.data.settings.GeneralSettings import GeneralSettingKeys
+from src.models.Transactions import Columns
+from tests.helpers import ProjectsModelTestCase, transaction_dicts
+
+
+class TestUndoLog(ProjectsModelTestCase):
+    """
+    Tests undoing and redoing edits made through the models.
+    """
+
+    def setUp(self):
+        super().setUp()
+        self.transactions_model = self.projects_model.transactions_model
+
+    def test_edits_of_a_cell_are_merged(self):
+        """
+        Consecutive edits of the same cell are undone at once, edits of other cells separately.
+        """
+        self.transactions_model.create_new_item(json_dict=transaction_dicts(1)[0])
+        amount_index = self.transactions_model.index(0, Columns.AMOUNT)
+        for amount in ("1", "12", "123"):
+            self.transactions_model.setData(amount_index, amount, Qt.ItemDataRole.EditRole)
+        self.transactions_model.setData(self.transactions_model.index(0, Columns.CATEGORY), None,
+                                        Qt.ItemDataRole.EditRole)
+
+        transaction = self.project.transactions[0]
+        self.projects_model.undo()  # category
+        self.assertEqual(transaction.amount, Decimal("123.00"))
+        self.projects_model.undo()  # all amount edits
+        self.assertEqual(transaction.amount, Decimal("0.00"))
+        self.projects_model.redo()
+        self.assertEqual(transaction.amount, Decimal("123.00"))
+
+        self.projects_model.undo()
+        self.projects_model.undo()  # creation
+        self.assertEqual(self.transactions_model.rowCount(), 0)
+        self.assertFalse(self.projects_model.can_undo)
+
+    def test_cascading_delete_is_one_entry(self):
+        """
+        Deleting a category and clearing it from its transactions is undone at once, with a single reset of the views.
+        """
+        categories_model = self.projects_model.transaction_categories_model
+        category = categories_model.create_new_item(json_dict={"name": "Rent", "note": ""})
+        self.project.transactions.bulk_create(transaction_dicts(3000, category=category.identifier))
+        self.transactions_model.refresh()
+        self.project.undo_log.clear()
+
+        categories_model.delete_item(categories_model.index(0, 0))
+        self.assertTrue(all(transaction.category is None for transaction in self.project.transactions.values()))
+
+        resets = []
+        self.transactions_model.modelReset.connect(lambda: resets.append("transactions"))
+        changes = []
+        self.transactions_model.dataChanged.connect(lambda *args: changes.append(args))
+        self.projects_model.undo()
+
+        self.assertFalse(self.projects_model.can_undo)
+        restored = self.project.transaction_categories[category.identifier]
+        self.assertEqual(restored.name, "Rent")
+        self.assertTrue(all(transaction.category == restored for transaction in self.project.transactions.values()))
+        self.assertEqual(categories_model.rowCount(), 1)
+        self.assertEqual(resets, [])
+        self.assertEqual(len(changes), 1)
+
+        self.projects_model.redo()
+        self.assertEqual(len(self.project.transaction_categories), 0)
+        self.assertEqual(len(self.project.transactions.find(category=restored)), 0)
+
+    def test_bulk_create_is_one_entry(self):
+        """
+        Items created in bulk are removed and created again at once.
+        """
+        self.project.transactions.bulk_create(transaction_dicts(5000))
+        self.transactions_model.refresh()
+
+        self.projects_model.undo()
+        self.assertEqual(len(self.project.transactions), 0)
+        self.assertEqual(self.transactions_model.rowCount(), 0)
+
+        self.projects_model.redo()
+        self.assertEqual(len(self.project.transactions), 5000)
+        while self.transactions_model.canFetchMore():
+            self.transactions_model.fetchMore()
+        self.assertEqual(self.transactions_model.rowCount(), 5000)
+        self.assertEqual(self.project.transactions[4999].amount, Decimal("4999.00"))
+
+    def test_undo_state_follows_the_log(self):
+        """
+        The undo state changes with every recorded edit, also of edits made outside the overview models.
+        """
+        account = self.project.bank_accounts.create_new_item()
+        emitted = []
+        self.projects_model.undo_state_changed.connect(lambda: emitted.append(self.projects_model.can_undo))
+
+        self.project.bank_accounts.update_item(account, note="savings")  # e.g. through BankAccountDataModel
+        self.assertEqual(emitted, [True])
+        self.projects_model.undo()
+        self.assertEqual(emitted, [True, True])  # the creation can still be undone
+        self.assertEqual(account.note, "")
+        self.project.undo_log.clear()
+        self.assertEqual(emitted, [True, True, False])
+
+    def test_memory_limit(self):
+        """
+        The oldest entries are dropped once the entries use more memory than allowed.
+        """
+        self.settings.general[GeneralSettingKeys.UNDO_MEMORY_LIMIT].value = 1
+        transactions = self.project.transactions
+        transactions.bulk_create(transaction_dicts(5000))
+        for transaction in list(transactions.values()):
+            transactions.update_item(transaction, note="x" * 100)
+            transactions.delete_item(transaction)
+
+        undo_log = self.project.undo_log
+        self.assertLessEqual(undo_log.size, 1024 * 1024)
+        while undo_log.can_undo:
+            undo_log.undo()
+        self.assertGreater(len(transactions), 0)
+        self.assertLess(len(transactions), 5000)